@@ -2,7 +2,6 @@ from ctypes import *
 
 import os
 import re
-import subprocess
 
 from . import Adapter_Generic
 import config
@@ -40,7 +39,75 @@ dvo_options = {
     "random": 7,
 }
 
+# node_table: initial number of nodes, cache_size: entries of the operator
+# caches, min_free: minimum percentage of free nodes after a garbage collection
+# before the table is grown, max_increase: maximum growth of the node table
+sizing_default = {
+    "node_table": 1000000,
+    "cache_size": 100000,
+    "min_free": 33,
+    "max_increase": 1000000
+}
+
+# sizeof(BddNode) + unique table entry, roughly
+node_bytes = 24
+
+def auto_sizing(n_vars, n_literals, memory):
+    """Sizes the node table and caches after the CNF, bounded by half of memory (bytes)."""
+
+    nodes = min(max(n_literals * 64, 1 << 16), int(memory * 0.5) // node_bytes)
+
+    return {
+        "node_table": nodes,
+        "cache_size": max(nodes // 8, 1 << 12),
+        "min_free": 33,
+        "max_increase": max(nodes // 4, 100000)
+    }
+
+#---- CDLL Companion Classes --------------------------------------------------#
+
+class bddStat(Structure):
+    _fields_ = [
+        ('produced', c_long),
+        ('nodenum', c_int),
+        ('maxnodenum', c_int),
+        ('freenodes', c_int),
+        ('minfreenodes', c_int),
+        ('varnum', c_int),
+        ('cachesize', c_int),
+        ('gbcnum', c_int)
+    ]
+
+# only counted if BuDDy is built with CACHESTATS
+class bddCacheStat(Structure):
+    _fields_ = [
+        ('uniqueAccess', c_ulong),
+        ('uniqueChain', c_ulong),
+        ('uniqueHit', c_ulong),
+        ('uniqueMiss', c_ulong),
+        ('opHit', c_ulong),
+        ('opMiss', c_ulong),
+        ('swapCount', c_ulong)
+    ]
+
+class bddGbcStat(Structure):
+    _fields_ = [
+        ('nodes', c_int),
+        ('freenodes', c_int),
+        ('time', c_long),
+        ('sumtime', c_long),
+        ('num', c_int)
+    ]
+
+# bddinthandler, bddgbchandler
+ReorderHandler = CFUNCTYPE(None, c_int)
+GbcHandler = CFUNCTYPE(None, c_int, POINTER(bddGbcStat))
+
+#------------------------------------------------------------------------------#
+
 def configure():
+    import subprocess
+
     subprocess.run(['./configure', configure_settings], cwd = sources_dir, stdout=subprocess.PIPE).stdout.decode('utf-8')
 
 def format2file(filename, meta = {}):        
@@ -92,15 +159,20 @@ class Manager(Adapter_Generic.Adapter_Generic):
 
 #---- Initialization, Setup, Destruction---------------------------------------#
 
-    def init(self):
+    def init(self, sizing = None):
         buddy = self.load_lib(shared_lib, hint_install)
 
-        buddy.bdd_init(1000000, 100000)
-        buddy.bdd_setminfreenodes(33)
-        buddy.bdd_setmaxincrease(c_int(1000000))
+        self.sizing = dict(sizing_default, **(sizing if sizing else {}))
+
+        buddy.bdd_init(self.sizing["node_table"], self.sizing["cache_size"])
+        buddy.bdd_setminfreenodes(self.sizing["min_free"])
+        buddy.bdd_setmaxincrease(c_int(self.sizing["max_increase"]))
 
         self.buddy = buddy
 
+        # BuDDy does not track it, see track_peak_
+        self.peak_nodes = 0
+
         
     def exit(self):
         self.buddy.bdd_done()
@@ -109,6 +181,17 @@ class Manager(Adapter_Generic.Adapter_Generic):
     def set_no_variables(self, no_variables):
         self.buddy.bdd_setvarnum(no_variables)
 
+        # BuDDy only reorders variable blocks, every variable becomes one
+        # (groups added by add_var_block enclose them)
+        if not getattr(self, "blocks_all", False):
+            self.buddy.bdd_varblockall()
+            self.blocks_all = True
+
+    def set_limits(self, max_nodes = None, time_limit = None, max_memory = None):
+        # BuDDy's error handler exits the process when bdd_setmaxnodenum is
+        # exceeded, hence budgets are only checked between clauses (see BDD).
+        pass
+
 #---- Constants ---------------------------------------------------------------#
 
     def zero_(self):
@@ -128,13 +211,14 @@ class Manager(Adapter_Generic.Adapter_Generic):
 #---- Unary Operators ---------------------------------------------------------#
 
     def not_(self, obj):
-        return self.buddy.bdd_not(obj)
+        return self.buddy.bdd_addref(self.buddy.bdd_not(obj))
 
 #---- Binary Operators --------------------------------------------------------#
     
     def and_(self, lhs, rhs, free_factors = True):
 
         out = self.buddy.bdd_addref(self.buddy.bdd_and(lhs, rhs))
+        self.track_peak_()
 
         if free_factors:
             self.delref_(lhs)
@@ -144,6 +228,7 @@ class Manager(Adapter_Generic.Adapter_Generic):
 
     def or_(self, lhs, rhs, free_factors = True):
         out = self.buddy.bdd_addref(self.buddy.bdd_or(lhs, rhs))
+        self.track_peak_()
 
         if free_factors:
             self.delref_(lhs)
@@ -153,6 +238,7 @@ class Manager(Adapter_Generic.Adapter_Generic):
 
     def xor_(self, lhs, rhs, free_factors = True):
         out = self.buddy.bdd_addref(self.buddy.bdd_xor(lhs, rhs))
+        self.track_peak_()
 
         if free_factors:
             self.delref_(lhs)
@@ -160,6 +246,121 @@ class Manager(Adapter_Generic.Adapter_Generic):
 
         return out
 
+#---- Statistics --------------------------------------------------------------#
+
+    def live_nodes_(self):
+        return self.buddy.bdd_getnodenum()
+
+    def track_peak_(self):
+        """Samples the nodes in use (including garbage, which only garbage collections free) after every binary operation."""
+        self.peak_nodes = max(self.peak_nodes, self.buddy.bdd_getnodenum())
+
+    def size_(self, obj):
+        return self.buddy.bdd_nodecount(obj)
+
+    def stats(self):
+        # BuDDy neither times garbage collections nor counts reorderings
+
+        stat = bddStat()
+        self.buddy.bdd_stats(byref(stat))
+
+        cachestat = bddCacheStat()
+        self.buddy.bdd_cachestats(byref(cachestat))
+
+        return {
+            "cache-lookups": cachestat.opHit + cachestat.opMiss,
+            "cache-hits": cachestat.opHit,
+            "gc-count": stat.gbcnum,
+            "peak-nodes": max(self.peak_nodes, self.live_nodes_()),
+            "live-nodes": self.live_nodes_(),
+            "nodes-produced": stat.produced,
+            # node table only, roughly
+            "memory": stat.nodenum * node_bytes
+        }
+
+#---- Hooks -------------------------------------------------------------------#
+
+    def set_hooks(self, on_event):
+
+        self.on_event = on_event
+
+        buddy = self.buddy
+        buddy.bdd_reorder_hook.restype = c_void_p
+        buddy.bdd_gbc_hook.restype = c_void_p
+
+        hooks = getattr(self, "hooks", None)
+
+        if on_event is None:
+            if hooks:
+                # restores the default handlers
+                buddy.bdd_reorder_hook(c_void_p(self.hooks_default[0]))
+                buddy.bdd_gbc_hook(c_void_p(self.hooks_default[1]))
+
+            self.hooks = None
+        elif not hooks:
+            # the callbacks have to outlive their registration, replacing the
+            # default garbage collection handler also silences its output
+            self.hooks = (
+                ReorderHandler(lambda prestate: self.hook_("reorder", prestate == 1)),
+                GbcHandler(lambda pre, stat: self.hook_("gc", pre == 1))
+            )
+
+            self.hooks_default = (buddy.bdd_reorder_hook(self.hooks[0]), buddy.bdd_gbc_hook(self.hooks[1]))
+
+#---- Node Access -------------------------------------------------------------#
+
+    def ref_(self, obj):
+        return obj
+
+    def terminal_(self, ref):
+        if ref == 0:
+            return False
+        elif ref == 1:
+            return True
+        else:
+            return None
+
+    def var_(self, ref):
+        return self.buddy.bdd_var(ref)
+
+    def low_(self, ref):
+        return self.buddy.bdd_low(ref)
+
+    def high_(self, ref):
+        return self.buddy.bdd_high(ref)
+
+    def var2level_(self, varid):
+        return self.buddy.bdd_var2level(varid)
+
+#---- Quantification ----------------------------------------------------------#
+
+    def exist_(self, obj, varids, free_factors = True):
+        arr = (c_int * len(varids))(*varids)
+        varset = self.buddy.bdd_addref(self.buddy.bdd_makeset(arr, len(varids)))
+
+        out = self.buddy.bdd_addref(self.buddy.bdd_exist(obj, varset))
+
+        self.delref_(varset)
+
+        if free_factors:
+            self.delref_(obj)
+
+        return out
+
+    def restrict_(self, obj, varid, value, free_factors = True):
+
+        if value:
+            literal = self.ithvar_(varid)
+        else:
+            literal = self.nithvar_(varid)
+
+        out = self.buddy.bdd_addref(self.buddy.bdd_restrict(obj, literal))
+
+        if free_factors:
+            self.delref_(obj)
+
+        return out
+
 #---- Variable Ordering -------------------------------------------------------#
 
     def enable_dvo(self, dvo_id = "lib-default"):
@@ -182,6 +383,17 @@ class Manager(Adapter_Generic.Adapter_Generic):
         self.buddy.bdd_setvarorder(arr)
         self.say(f"Set variable order to {order}")
 
+    def add_var_block(self, varids, fixed = False):
+
+        # BuDDy's blocks are ranges of variable indizes
+        first = min(varids)
+        last = max(varids)
+
+        if last - first + 1 != len(varids):
+            return False
+
+        return self.buddy.bdd_intaddvarblock(first, last, int(fixed)) >= 0
+
     def dvo_once(self, dvo_id = None):
 
         if dvo_id:
@@ -195,7 +407,7 @@ class Manager(Adapter_Generic.Adapter_Generic):
 #---- Utility -----------------------------------------------------------------#
 
     def addref_(self, obj):
-        pass
+        self.buddy.bdd_addref(obj)
 
     def delref_(self, obj):
         self.buddy.bdd_delref(obj)
@@ -204,6 +416,18 @@ class Manager(Adapter_Generic.Adapter_Generic):
         self.buddy.bdd_fnsave(c_char_p(filename.encode("utf-8")), bdd)
         format2file(filename, meta = meta)
 
+    def save_(self, obj, filename):
+        return self.buddy.bdd_fnsave(c_char_p(filename.encode("utf-8")), obj) == 0
+
+    def load_(self, filename):
+        root = c_int()
+
+        if self.buddy.bdd_fnload(c_char_p(filename.encode("utf-8")), byref(root)) != 0:
+            return None
+
+        # bdd_load references the root
+        return root.value
+
     def dump_dot(self, bdd):
         self.buddy.bdd_fnprintdot(c_char_p("/tmp/bdd.dot".encode("utf-8")), bdd)
         with open("/tmp/bdd.dot") as file:
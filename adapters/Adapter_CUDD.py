@@ -1,17 +1,17 @@
-from ctypes import CDLL, Structure, POINTER, c_uint, c_double, c_ulong, byref, c_int
+from ctypes import CDLL, CFUNCTYPE, Structure, POINTER, c_uint, c_double, c_ulong, c_long, c_size_t, byref, c_int, c_void_p, c_char_p, cast
 
 from io import StringIO
 
 import os
 import re
 
-import subprocess
+from datetime import timedelta
 
 from . import Adapter_Generic
 import config
 
 import utils.Logging as Logging
-from utils.IO import STDOUT_Recorder
+from utils.IO import STDOUT_Recorder, format_runtime
 
 name        = "CUDD 3.0.0"
 stub        = "cudd"
@@ -47,6 +47,7 @@ dvo_options = {
     "win4-conv": 13,
     #
     "sift-group": 14,
+    "sift-group-conv": 15,
     "sift-group-conf": 15,
     #
     "annealing": 16,
@@ -62,7 +63,49 @@ dvo_options = {
 has_zero_based_indizes = True
 requires_variable_advertisement = True
 
+# Cudd_ErrorType
+error_codes = {
+    1: "memory-out",
+    2: "max-nodes",
+    3: "max-memory",
+    4: "time-limit",
+    5: "termination"
+}
+
+# Cudd_HookType
+hook_types = {
+    ("gc", True): 0,
+    ("gc", False): 1,
+    ("reorder", True): 2,
+    ("reorder", False): 3
+}
+
+# node_table: initial slots of the unique subtable of every variable,
+# cache_size: initial entries of the computed table, max_memory: target
+# maximum memory (bytes) used to bound the growth of the cache (0: automatic)
+sizing_default = {
+    "node_table": 256,
+    "cache_size": 262144,
+    "max_memory": 0
+}
+
+# sizeof(DdNode) on 64-bit platforms
+node_bytes = 32
+
+def auto_sizing(n_vars, n_literals, memory):
+    """Sizes the unique table and cache after the CNF, bounded by half of memory (bytes)."""
+
+    nodes = min(max(n_literals * 64, 1 << 16), int(memory * 0.5) // node_bytes)
+
+    return {
+        "node_table": min(max(Adapter_Generic.power_of_two(nodes / max(n_vars, 1)), 256), 1 << 20),
+        "cache_size": min(max(Adapter_Generic.power_of_two(nodes / 4), 1 << 12), 1 << 24),
+        "max_memory": int(memory * 0.75)
+    }
+
 def configure():
+    import subprocess
+
     subprocess.run(['./configure', configure_settings], cwd = sources_dir, stdout=subprocess.PIPE).stdout.decode('utf-8')
 
 def declare(f, argtypes, restype = None):
@@ -163,14 +206,20 @@ class DdManager(Structure):
         ('cachedeletions', c_double)
     ]
 
+# DD_HFP
+DdHook = CFUNCTYPE(c_int, POINTER(DdManager), c_char_p, c_void_p)
+
 #---- Initialization, Setup, Destruction---------------------------------------#
 
 class Manager(Adapter_Generic.Adapter_Generic):
 
-    def init(self):
+    def init(self, sizing = None):
         self.cudd = self.load_lib(shared_lib, hint_install)
-        self._init = declare(self.cudd.Cudd_Init, [c_uint, c_uint, c_uint, c_uint, c_ulong], POINTER(DdManager))
-        self.mgr = self._init(0, 0, 256, 262144, 0)
+
+        self.sizing = dict(sizing_default, **(sizing if sizing else {}))
+
+        self._init = declare(self.cudd.Cudd_Init, [c_uint, c_uint, c_uint, c_uint, c_size_t], POINTER(DdManager))
+        self.mgr = self._init(0, 0, self.sizing["node_table"], self.sizing["cache_size"], self.sizing["max_memory"])
 
         return self
 
@@ -181,6 +230,19 @@ class Manager(Adapter_Generic.Adapter_Generic):
         self._exit(self.mgr)
         self.say_bye()
 
+    def set_limits(self, max_nodes = None, time_limit = None, max_memory = None):
+        """Operations exceeding a limit return NULL, which is raised as BudgetExceeded (see check_)."""
+
+        if max_nodes:
+            declare(self.cudd.Cudd_SetMaxLive, [POINTER(DdManager), c_uint])(self.mgr, max_nodes)
+
+        if max_memory:
+            declare(self.cudd.Cudd_SetMaxMemory, [POINTER(DdManager), c_size_t])(self.mgr, max_memory)
+
+        if time_limit:
+            declare(self.cudd.Cudd_SetTimeLimit, [POINTER(DdManager), c_ulong], c_ulong)(self.mgr, int(time_limit * 1000))
+            declare(self.cudd.Cudd_ResetStartTime, [POINTER(DdManager)])(self.mgr)
+
     def set_no_variables(self, no_variables):
 
         if not hasattr(self, "_newvar"):
@@ -225,12 +287,17 @@ class Manager(Adapter_Generic.Adapter_Generic):
         return out
 
     def nithvar_(self, varid):
-        return self.not_(self.ithvar_(varid))
+        var = self.ithvar_(varid)
+        out = self.not_(var)
+        self.delref_(var)
+
+        return out
 
 #---- Unary Operators ---------------------------------------------------------#
 
     def not_(self, obj):
-        out = byref(obj.contents, 1)
+        # complemented edges are marked in the least significant bit
+        out = cast(c_void_p(cast(obj, c_void_p).value ^ 1), POINTER(DdNode))
         self.addref_(out)
 
         return out
@@ -243,13 +310,15 @@ class Manager(Adapter_Generic.Adapter_Generic):
             self._and = declare(self.cudd.Cudd_bddAnd, [POINTER(DdManager), POINTER(DdNode), POINTER(DdNode)], POINTER(DdNode))
 
         out = self._and(self.mgr, lhs, rhs)
-        self.addref_(out)
+
+        if out:
+            self.addref_(out)
 
         if free_factors:
             self.delref_(lhs)
             self.delref_(rhs)
 
-        return out
+        return self.check_(out)
 
     def or_(self, lhs, rhs, free_factors = True):
 
@@ -257,13 +326,15 @@ class Manager(Adapter_Generic.Adapter_Generic):
             self._or = declare(self.cudd.Cudd_bddOr, [POINTER(DdManager), POINTER(DdNode), POINTER(DdNode)], POINTER(DdNode))
 
         out = self._or(self.mgr, lhs, rhs)
-        self.addref_(out)
+
+        if out:
+            self.addref_(out)
 
         if free_factors:
             self.delref_(lhs)
             self.delref_(rhs)
 
-        return out
+        return self.check_(out)
 
     def xor_(self, lhs, rhs, free_factors = True):
 
@@ -271,15 +342,330 @@ class Manager(Adapter_Generic.Adapter_Generic):
             self._xor = declare(self.cudd.Cudd_bddXor, [POINTER(DdManager), POINTER(DdNode), POINTER(DdNode)], POINTER(DdNode))
 
         out = self._xor(self.mgr, lhs, rhs)
-        self.addref_(out)
+
+        if out:
+            self.addref_(out)
 
         if free_factors:
             self.delref_(lhs)
             self.delref_(rhs)
 
+        return self.check_(out)
+
+#---- Quantification ----------------------------------------------------------#
+
+    def exist_(self, obj, varids, free_factors = True):
+
+        if not hasattr(self, "_exist"):
+            self._indices2cube = declare(self.cudd.Cudd_IndicesToCube, [POINTER(DdManager), POINTER(c_int), c_int], POINTER(DdNode))
+            self._exist = declare(self.cudd.Cudd_bddExistAbstract, [POINTER(DdManager), POINTER(DdNode), POINTER(DdNode)], POINTER(DdNode))
+
+        arr = (c_int * len(varids))(*varids)
+        cube = self._indices2cube(self.mgr, arr, len(varids))
+
+        if not cube:
+            if free_factors:
+                self.delref_(obj)
+
+            return self.check_(cube)
+
+        self.addref_(cube)
+
+        out = self._exist(self.mgr, obj, cube)
+
+        if out:
+            self.addref_(out)
+
+        self.delref_(cube)
+
+        if free_factors:
+            self.delref_(obj)
+
+        return self.check_(out)
+
+    def restrict_(self, obj, varid, value, free_factors = True):
+
+        if not hasattr(self, "_cofactor"):
+            self._cofactor = declare(self.cudd.Cudd_Cofactor, [POINTER(DdManager), POINTER(DdNode), POINTER(DdNode)], POINTER(DdNode))
+
+        var = self.ithvar_(varid)
+
+        if value:
+            literal = var
+        else:
+            literal = byref(var.contents, 1)
+
+        out = self._cofactor(self.mgr, obj, literal)
+
+        if out:
+            self.addref_(out)
+
+        self.delref_(var)
+
+        if free_factors:
+            self.delref_(obj)
+
+        return self.check_(out)
+
+#---- ZDD ---------------------------------------------------------------------#
+
+    supports_zdd = True
+
+    def zdd_init_(self, no_variables):
+        """Creates one ZDD variable per BDD variable, has to precede all ZDD operations."""
+
+        if not hasattr(self, "_zdd_vars"):
+            self._zdd_vars = declare(self.cudd.Cudd_zddVarsFromBddVars, [POINTER(DdManager), c_int], c_int)
+
+        return self._zdd_vars(self.mgr, 1) == 1
+
+    def zdd_one_(self):
+        """The family of all subsets of the variables, i.e., the constant true function."""
+
+        if not hasattr(self, "_zdd_one"):
+            self._zdd_one = declare(self.cudd.Cudd_ReadZddOne, [POINTER(DdManager), c_int], POINTER(DdNode))
+
+        out = self._zdd_one(self.mgr, 0)
+        self.addref_(out)
+
         return out
 
+    def zdd_zero_(self):
+
+        if not hasattr(self, "_zdd_zero"):
+            self._zdd_zero = declare(self.cudd.Cudd_ReadZero, [POINTER(DdManager)], POINTER(DdNode))
+
+        out = self._zdd_zero(self.mgr)
+        self.addref_(out)
+
+        return out
+
+    def zdd_ithvar_(self, varid):
+
+        if not hasattr(self, "_zdd_ithvar"):
+            self._zdd_ithvar = declare(self.cudd.Cudd_zddIthVar, [POINTER(DdManager), c_int], POINTER(DdNode))
+
+        out = self.check_(self._zdd_ithvar(self.mgr, varid))
+        self.addref_(out)
+
+        return out
+
+    def zdd_nithvar_(self, varid):
+        return self.zdd_diff_(self.zdd_one_(), self.zdd_ithvar_(varid))
+
+    def zdd_apply_(self, name, f, lhs, rhs, free_factors):
+
+        if not hasattr(self, name):
+            setattr(self, name, declare(f, [POINTER(DdManager), POINTER(DdNode), POINTER(DdNode)], POINTER(DdNode)))
+
+        out = getattr(self, name)(self.mgr, lhs, rhs)
+
+        if out:
+            self.addref_(out)
+
+        if free_factors:
+            self.zdd_delref_(lhs)
+            self.zdd_delref_(rhs)
+
+        return self.check_(out)
+
+    def zdd_union_(self, lhs, rhs, free_factors = True):
+        return self.zdd_apply_("_zdd_union", self.cudd.Cudd_zddUnion, lhs, rhs, free_factors)
+
+    def zdd_intersect_(self, lhs, rhs, free_factors = True):
+        return self.zdd_apply_("_zdd_intersect", self.cudd.Cudd_zddIntersect, lhs, rhs, free_factors)
+
+    def zdd_diff_(self, lhs, rhs, free_factors = True):
+        return self.zdd_apply_("_zdd_diff", self.cudd.Cudd_zddDiff, lhs, rhs, free_factors)
+
+    def zdd_delref_(self, obj):
+
+        if not hasattr(self, "_zdd_delref"):
+            self._zdd_delref = declare(self.cudd.Cudd_RecursiveDerefZdd, [POINTER(DdManager), POINTER(DdNode)])
+
+        self._zdd_delref(self.mgr, obj)
+
+    def zdd_size_(self, obj):
+
+        if not hasattr(self, "_zdd_size"):
+            self._zdd_size = declare(self.cudd.Cudd_zddDagSize, [POINTER(DdNode)], c_int)
+
+        return self._zdd_size(obj)
+
+    def zdd_terminal_(self, ref):
+        """As terminal_, ZDDs have no complemented edges but two constants."""
+
+        if not hasattr(self, "_zdd_one_ref"):
+            self._zdd_one_ref = cast(declare(self.cudd.Cudd_ReadOne, [POINTER(DdManager)], POINTER(DdNode))(self.mgr), c_void_p).value
+            self._is_constant_zdd = declare(self.cudd.Cudd_IsConstant, [c_void_p], c_int)
+
+        if self._is_constant_zdd(ref):
+            return ref == self._zdd_one_ref
+
+        return None
+
+    def zdd_set_order(self, order):
+
+        if not hasattr(self, "_zdd_setorder"):
+            self._zdd_setorder = declare(self.cudd.Cudd_zddShuffleHeap, [POINTER(DdManager), POINTER(c_int)], c_int)
+
+        order_min = min(order)
+        order = [x - order_min for x in order]
+
+        arr = (c_int * len(order))(*order)
+        self._zdd_setorder(self.mgr, arr)
+
+    def zdd_enable_dvo(self, dvo_id):
+
+        if not hasattr(self, "_zdd_enable_dynorder"):
+            self._zdd_enable_dynorder = declare(self.cudd.Cudd_AutodynEnableZdd, [POINTER(DdManager), c_int])
+
+        self._zdd_enable_dynorder(self.mgr, dvo_id)
+
+#---- Statistics --------------------------------------------------------------#
+
+    def live_nodes_(self):
+
+        if not hasattr(self, "_node_count"):
+            self._node_count = declare(self.cudd.Cudd_ReadNodeCount, [POINTER(DdManager)], c_long)
+
+        return self._node_count(self.mgr)
+
+    def size_(self, obj):
+
+        if not hasattr(self, "_dag_size"):
+            self._dag_size = declare(self.cudd.Cudd_DagSize, [POINTER(DdNode)], c_int)
+
+        return self._dag_size(obj)
+
+    def stats(self):
+        # the cache counters of DdManager are only maintained with DD_STATS, hence the accessors
+
+        if not hasattr(self, "_stats"):
+            self._stats = {
+                "cache-lookups": declare(self.cudd.Cudd_ReadCacheLookUps, [POINTER(DdManager)], c_double),
+                "cache-hits": declare(self.cudd.Cudd_ReadCacheHits, [POINTER(DdManager)], c_double),
+                "gc-count": declare(self.cudd.Cudd_ReadGarbageCollections, [POINTER(DdManager)], c_int),
+                "gc-time": declare(self.cudd.Cudd_ReadGarbageCollectionTime, [POINTER(DdManager)], c_long),
+                "reorder-count": declare(self.cudd.Cudd_ReadReorderings, [POINTER(DdManager)], c_uint),
+                "reorder-time": declare(self.cudd.Cudd_ReadReorderingTime, [POINTER(DdManager)], c_long),
+                "peak-nodes": declare(self.cudd.Cudd_ReadPeakNodeCount, [POINTER(DdManager)], c_long),
+                "memory": declare(self.cudd.Cudd_ReadMemoryInUse, [POINTER(DdManager)], c_size_t)
+            }
+
+        out = {k: f(self.mgr) for k, f in self._stats.items()}
+
+        out["cache-lookups"] = int(out["cache-lookups"])
+        out["cache-hits"] = int(out["cache-hits"])
+
+        # milliseconds
+        out["gc-time"] = format_runtime(timedelta(milliseconds = out["gc-time"]))
+        out["reorder-time"] = format_runtime(timedelta(milliseconds = out["reorder-time"]))
+
+        out["live-nodes"] = self.live_nodes_()
+
+        return out
+
+#---- Hooks -------------------------------------------------------------------#
+
+    def set_hooks(self, on_event):
+
+        if not hasattr(self, "_add_hook"):
+            self._add_hook = declare(self.cudd.Cudd_AddHook, [POINTER(DdManager), DdHook, c_int], c_int)
+            self._remove_hook = declare(self.cudd.Cudd_RemoveHook, [POINTER(DdManager), DdHook, c_int], c_int)
+
+        self.on_event = on_event
+
+        hooks = getattr(self, "hooks", None)
+
+        if on_event is None:
+            if hooks:
+                for key, hook in hooks.items():
+                    self._remove_hook(self.mgr, hook, hook_types[key])
+
+            self.hooks = None
+        elif not hooks:
+            def make_hook(event, pre):
+                def hook(mgr, stub, data):
+                    self.hook_(event, pre)
+                    return 1
+
+                return DdHook(hook)
+
+            # the callbacks have to outlive their registration
+            self.hooks = {}
+
+            for (event, pre), hook_type in hook_types.items():
+                self.hooks[(event, pre)] = make_hook(event, pre)
+                self._add_hook(self.mgr, self.hooks[(event, pre)], hook_type)
+
+    def hook_nodes_(self):
+        # includes dead nodes, which are what garbage collections free
+
+        if not hasattr(self, "_read_keys"):
+            self._read_keys = declare(self.cudd.Cudd_ReadKeys, [POINTER(DdManager)], c_uint)
+
+        return self._read_keys(self.mgr)
+
+#---- Node Access -------------------------------------------------------------#
+
+# Nodes are handled as raw addresses, the least significant bit marks complemented edges.
+
+    def ref_(self, obj):
+        return cast(obj, c_void_p).value
+
+    def terminal_(self, ref):
+
+        if not hasattr(self, "_is_constant"):
+            self._is_constant = declare(self.cudd.Cudd_IsConstant, [c_void_p], c_int)
+
+        if self._is_constant(ref & ~1):
+            return not (ref & 1)
+        else:
+            return None
+
+    def var_(self, ref):
+
+        if not hasattr(self, "_node_index"):
+            self._node_index = declare(self.cudd.Cudd_NodeReadIndex, [c_void_p], c_uint)
+
+        return self._node_index(ref & ~1)
+
+    def low_(self, ref):
+
+        if not hasattr(self, "_else"):
+            self._else = declare(self.cudd.Cudd_E, [c_void_p], c_void_p)
+
+        return self._else(ref & ~1) ^ (ref & 1)
+
+    def high_(self, ref):
+
+        if not hasattr(self, "_then"):
+            self._then = declare(self.cudd.Cudd_T, [c_void_p], c_void_p)
+
+        return self._then(ref & ~1) | (ref & 1)
+
+    def var2level_(self, varid):
+
+        if not hasattr(self, "_read_perm"):
+            self._read_perm = declare(self.cudd.Cudd_ReadPerm, [POINTER(DdManager), c_int])
+
+        return self._read_perm(self.mgr, varid)
+
 #---- Utility -----------------------------------------------------------------#
+
+    def check_(self, out):
+        """Raises BudgetExceeded if an operation returned NULL, e.g., due to a limit set with set_limits."""
+
+        if out:
+            return out
+
+        if not hasattr(self, "_read_error_code"):
+            self._read_error_code = declare(self.cudd.Cudd_ReadErrorCode, [POINTER(DdManager)], c_int)
+
+        code = self._read_error_code(self.mgr)
+
+        raise Adapter_Generic.BudgetExceeded(error_codes.get(code, f"error code {code}"))
     
     def addref_(self, obj):
 
@@ -307,6 +693,24 @@ class Manager(Adapter_Generic.Adapter_Generic):
 
         format2file(filename, meta = meta, order = order)
 
+    def save_(self, obj, filename):
+
+        if not hasattr(self, "_store"):
+            self._store = declare(self.cudd.Dddmp_cuddBddStore, [POINTER(DdManager), c_char_p, POINTER(DdNode), c_void_p, c_void_p, c_int, c_int, c_char_p, c_void_p], c_int)
+
+        # binary mode (DDDMP_MODE_BINARY), variables by their ids (DDDMP_VARIDS)
+        return self._store(self.mgr, None, obj, None, None, ord("B"), 0, filename.encode("utf-8"), None) == 1
+
+    def load_(self, filename):
+
+        if not hasattr(self, "_load"):
+            self._load = declare(self.cudd.Dddmp_cuddBddLoad, [POINTER(DdManager), c_int, c_void_p, c_void_p, c_void_p, c_int, c_char_p, c_void_p], POINTER(DdNode))
+
+        # match variables by ids (DDDMP_VAR_MATCHIDS), mode from the header (DDDMP_MODE_DEFAULT), the root is returned referenced
+        out = self._load(self.mgr, 0, None, None, None, ord("D"), filename.encode("utf-8"), None)
+
+        return out if out else None
+
     def get_order(self, bdd):
 
         if not hasattr(self, "_read_perm"):
@@ -347,6 +751,7 @@ class Manager(Adapter_Generic.Adapter_Generic):
         if not hasattr(self, "_enable_dynorder"):
             self._enable_dynorder = declare(self.cudd.Cudd_AutodynEnable, [POINTER(DdManager), c_int])
 
+        self.dvo_id = dvo_id
         self._enable_dynorder(self.mgr, dvo_id)
 
     def disable_dvo(self):
@@ -354,8 +759,33 @@ class Manager(Adapter_Generic.Adapter_Generic):
         if not hasattr(self, "_disable_dynorder"):
             self._disable_dynorder = declare(self.cudd.Cudd_AutodynDisable, [POINTER(DdManager)])
 
+        self.dvo_id = None
         self._disable_dynorder(self.mgr)
         self.say("DVO disabled")
 
+    def dvo_once(self, dvo_id = None):
+
+        if not hasattr(self, "_reduce_heap"):
+            self._reduce_heap = declare(self.cudd.Cudd_ReduceHeap, [POINTER(DdManager), c_int, c_int], c_int)
+
+        if dvo_id:
+            pass
+        elif getattr(self, "dvo_id", None):
+            dvo_id = self.dvo_id
+        else:
+            dvo_id = dvo_options["lib-default"]
+
+        self._reduce_heap(self.mgr, dvo_id, 0)
+
+    def add_var_block(self, varids, fixed = False):
+
+        if not hasattr(self, "_make_tree_node"):
+            self._make_tree_node = declare(self.cudd.Cudd_MakeTreeNode, [POINTER(DdManager), c_uint, c_uint, c_uint], c_void_p)
+
+        # the group starts at the level of low (MTR_DEFAULT = 0, MTR_FIXED = 4)
+        low = min(varids, key = self.var2level_)
+
+        return self._make_tree_node(self.mgr, low, len(varids), 4 if fixed else 0) is not None
+
     def get_name(self):
         return name
\ No newline at end of file
@@ -1,13 +1,27 @@
 from ctypes import CDLL
+from datetime import datetime
 from os import path
 
 import utils.Logging as Logging
 
+from .NodeTable import NodeTable
+
+class BudgetExceeded(Exception):
+    """Raised when a compilation exceeds its node, time, or memory budget."""
+    pass
+
+def power_of_two(x):
+    """Smallest power of two >= x."""
+    return 1 << max(0, (int(x) - 1).bit_length())
+
 class Adapter_Generic:
 
 #---- Initialization, Setup, Destruction---------------------------------------#
 
-    def init(self):
+# sizing: dict of manager options (see sizing_default of the adapters), merged
+# with the adapter's defaults.
+
+    def init(self, sizing = None):
         raise NotImplementedError()
 
     def exit(self):
@@ -16,6 +30,9 @@ class Adapter_Generic:
     def set_no_variables(self, no_variables):
         raise NotImplementedError()
 
+    def set_limits(self, max_nodes = None, time_limit = None, max_memory = None):
+        raise NotImplementedError()
+
 #---- Constants ---------------------------------------------------------------#
 
     def zero_(self):
@@ -48,6 +65,60 @@ class Adapter_Generic:
     def xor_(self, lhs, rhs, free_factors = True):
         raise NotImplementedError()
 
+#---- Quantification ----------------------------------------------------------#
+
+    def exist_(self, obj, varids, free_factors = True):
+        raise NotImplementedError()
+
+    def restrict_(self, obj, varid, value, free_factors = True):
+        raise NotImplementedError()
+
+#---- ZDD ---------------------------------------------------------------------#
+
+# Zero-suppressed DDs over the same variables (see ZDD), only some libraries
+# support them. As for BDDs, operations return referenced ZDDs.
+
+    supports_zdd = False
+
+    def zdd_init_(self, no_variables):
+        raise NotImplementedError()
+
+    def zdd_one_(self):
+        raise NotImplementedError()
+
+    def zdd_zero_(self):
+        raise NotImplementedError()
+
+    def zdd_ithvar_(self, varid):
+        raise NotImplementedError()
+
+    def zdd_nithvar_(self, varid):
+        raise NotImplementedError()
+
+    def zdd_union_(self, lhs, rhs, free_factors = True):
+        raise NotImplementedError()
+
+    def zdd_intersect_(self, lhs, rhs, free_factors = True):
+        raise NotImplementedError()
+
+    def zdd_diff_(self, lhs, rhs, free_factors = True):
+        raise NotImplementedError()
+
+    def zdd_delref_(self, obj):
+        raise NotImplementedError()
+
+    def zdd_size_(self, obj):
+        raise NotImplementedError()
+
+    def zdd_terminal_(self, ref):
+        raise NotImplementedError()
+
+    def zdd_set_order(self, order):
+        raise NotImplementedError()
+
+    def zdd_enable_dvo(self, dvo_id):
+        raise NotImplementedError()
+
 #---- Utility -----------------------------------------------------------------#
     
     def addref_(self, obj):
@@ -64,11 +135,119 @@ class Adapter_Generic:
 
     def dump(self, bdd, filename):
         raise NotImplementedError()
+
+    def save_(self, obj, filename):
+        """Stores obj in the library's own format (for checkpoints), returns whether it succeeded."""
+        raise NotImplementedError()
+
+    def load_(self, filename):
+        """Loads a BDD written by save_ as referenced BDD, None if it failed."""
+        raise NotImplementedError()
    
     def dump_dot(self, bdd, filename):
         raise NotImplementedError()
    
    
+#---- Statistics --------------------------------------------------------------#
+
+    def live_nodes_(self):
+        raise NotImplementedError()
+
+    def size_(self, obj):
+        """Number of nodes of obj."""
+        raise NotImplementedError()
+
+    def stats(self):
+        """Counters of the manager as dict, a subset of: cache-lookups, cache-hits,
+        gc-count, gc-time, reorder-count, reorder-time, peak-nodes, live-nodes, memory."""
+        raise NotImplementedError()
+
+#---- Hooks -------------------------------------------------------------------#
+
+# Garbage collections ("gc") and reorderings ("reorder") are reported to
+# on_event(event, duration, nodes_before, nodes_after) once they finished.
+
+    def set_hooks(self, on_event):
+        raise NotImplementedError()
+
+    def hook_nodes_(self):
+        """Node count reported before and after an event."""
+        return self.live_nodes_()
+
+    def hook_(self, event, pre):
+        """Pairs the library's pre and post calls of an event."""
+
+        if not hasattr(self, "hook_starts"):
+            self.hook_starts = {}
+
+        if pre:
+            self.hook_starts[event] = (datetime.now(), self.hook_nodes_())
+        elif event in self.hook_starts:
+            time_start, nodes_before = self.hook_starts.pop(event)
+            self.on_event(event, datetime.now() - time_start, nodes_before, self.hook_nodes_())
+
+#---- Node Access -------------------------------------------------------------#
+
+    def ref_(self, obj):
+        raise NotImplementedError()
+
+    def terminal_(self, ref):
+        raise NotImplementedError()
+
+    def var_(self, ref):
+        raise NotImplementedError()
+
+    def low_(self, ref):
+        raise NotImplementedError()
+
+    def high_(self, ref):
+        raise NotImplementedError()
+
+    def var2level_(self, varid):
+        raise NotImplementedError()
+
+    def node_table(self, bdd, no_variables):
+        """Copies the nodes reachable from bdd into a NodeTable (iterative post-order DFS)."""
+
+        table = NodeTable(no_variables, [self.var2level_(x) for x in range(0, no_variables)])
+
+        root = self.ref_(bdd)
+
+        index = {}
+        childs = {}
+        stack = [root]
+
+        while stack:
+            ref = stack[-1]
+
+            if ref in index:
+                stack.pop()
+                continue
+
+            value = self.terminal_(ref)
+            if value is not None:
+                index[ref] = 1 if value else 0
+                stack.pop()
+                continue
+
+            if ref not in childs:
+                childs[ref] = (self.low_(ref), self.high_(ref))
+
+            low, high = childs[ref]
+            pending = [x for x in (low, high) if x not in index]
+
+            if pending:
+                stack.extend(pending)
+                continue
+
+            stack.pop()
+            del childs[ref]
+            index[ref] = table.add(self.var_(ref), index[low], index[high])
+
+        table.root = index[root]
+
+        return table
+
 #---- Variable Ordering -------------------------------------------------------#
 
     def enable_dvo(self, dvo_id):        
@@ -77,8 +256,16 @@ class Adapter_Generic:
     def disable_dvo(self, dvo_id):        
         raise NotImplementedError()
 
-    def dvo_once(self, dvo_id = "lib-default"):
-        raise NotImplementedError()   
+    def dvo_once(self, dvo_id = None):
+        """Reorders once with dvo_id, the enabled DVO, or the library's default."""
+        raise NotImplementedError()
+
+    def add_var_block(self, varids, fixed = False):
+        """Groups the variables varids, which are contiguous in the current order, for reordering.
+
+        Returns whether the block was created.
+        """
+        raise NotImplementedError()
 
     def set_order(self, order):
         raise NotImplementedError()     
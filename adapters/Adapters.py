@@ -5,28 +5,74 @@ from os import path
 
 import re
 
-import subprocess
-
-from utils.IO import  download, untar, verify_hash, format
+from utils.IO import  download, untar, verify_hash, format, bulk_format
 import utils.Logging as Logging
 
 from . import BUDDY
 from . import CUDD
 from . import BDD
+from . import ZDD
 
 
-def get_lib(stub):
+def get_lib(stub, mode = "bdd"):
 
     stub = stub.lower()
 
+    t = ZDD if mode == "zdd" else BDD
+
     if stub == "buddy":
-        return (BDD, BUDDY)
+        return (t, BUDDY)
     elif stub == "cudd":
-        return (BDD, CUDD)
+        return (t, CUDD)
     else:
         raise NotImplementedError(f"Library with stub \"{stub}\" is not hooked in.")
 
 
+def list_dvo_options(lib):
+    """As BDD.list_available_dvo_options, without initializing a manager."""
+
+    ls = [x for x, _ in lib.dvo_options.items()]
+
+    Logging.info(f"Available DVO options for {lib.name}:", bulk_format(Logging.highlight(", ".join(ls)), color = "blue"))
+
+def available_memory():
+    """Available memory in bytes (MemAvailable), the physical memory if unknown."""
+
+    try:
+        with open("/proc/meminfo") as file:
+            for line in file.readlines():
+                if line.startswith("MemAvailable:"):
+                    return int(re.split(r"\s+", line)[1]) * 1024
+    except OSError:
+        pass
+
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+def make_sizing(lib, expr, sizing = None):
+    """Resolves the manager sizing: sizing["auto"] (number of parallel jobs sharing the memory) enables auto-tuning
+    from expr and the available memory, all other (not None) entries override single options of lib."""
+
+    if not sizing:
+        return None
+
+    out = {}
+
+    if sizing.get("auto"):
+        out = lib.auto_sizing(expr.get_no_variables(), expr.get_no_literals(), available_memory() // sizing["auto"])
+
+    for k, v in sizing.items():
+        if k == "auto" or v is None:
+            continue
+
+        # e.g., min_free and max_increase are BuDDy only
+        if k not in lib.sizing_default:
+            Logging.warning("Ignoring", Logging.highlight(k), f"(not an option of {lib.name})")
+            continue
+
+        out[k] = v
+
+    return out
+
 def install(lib, clean = False):
 
     if clean:
@@ -59,6 +105,8 @@ def install(lib, clean = False):
         lib.configure()
 
         Logging.log("Building...")
+
+        import subprocess
         subprocess.run(['make', lib.stub, '-j4'], stdout=subprocess.PIPE).stdout.decode('utf-8')
     
     if path.exists(lib.shared_lib):
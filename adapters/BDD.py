@@ -1,13 +1,28 @@
 from datetime import datetime
 
+import os
+from os import path
+import re
+import resource
+
 from utils.IO import basename, timestamp, format_runtime, bulk_format
 
 import utils.Caching as Caching
 import utils.Logging as Logging
 
+from analysis import Counting, Enumeration, Propagation
+
+from .Adapter_Generic import BudgetExceeded
+from svo import Blocks
+from utils.InputFormats import Subformulas
+
+from .ConjunctionTree import ConjunctionTree
+from .Scheduler import ReorderScheduler
+from .Trace import Trace
+
 # TODO: Move to interface
 
-from config import DDUERUEM_VERSION
+from config import DDUERUEM_VERSION, TREE_STORE_MAX_AGE
 
 def get_meta(lib):
     return {
@@ -17,14 +32,31 @@ def get_meta(lib):
     }
 
 class BDD:
-    def __init__(self, lib):
+    def __init__(self, lib, sizing = None):
         self.bdd = None
         self.lib = lib
+        self.var2desc = {}
+        self.budget = None
+        self.trace = None
+        self.scheduler = None
+        self.var_groups = None
+        self.quantify = None
+        self.quantified = []
+        self.roots = {}
+        self.tree = None
+        self.checkpoint_every = None
+        self.resume = False
+        self.checkpoint_preorder = None
+
+        self.subformulas = Subformulas()
+        self.subformula_bdds = {}
+        self.subformula_hits = 0
 
         self.mgr = self.lib.Manager()
-        self.mgr.init()
+        self.mgr.init(sizing)
 
         self.meta = get_meta(lib)
+        self.meta["mgr-sizing"] = ",".join([f"{k}={v}" for k, v in self.mgr.sizing.items()])
 
     def __enter__(self):
         return self
@@ -43,8 +75,17 @@ class BDD:
 
 
     def buildFrom(self, input, order = None):
-        if input.get_stub() == "cnf":
+        if self.quantify and input.get_stub() != "cnf":
+            Logging.warning("Quantification requires a CNF, ignored for", Logging.highlight(input.get_stub()))
+
+        if input.get_stub() == "cnf" and self.tree:
+            self.fromCNFTree(input, order)
+        elif input.get_stub() == "cnf":
             self.fromCNF(input, order)
+        elif input.get_stub() == "fm":
+            self.fromFM(input, order)
+        elif input.get_stub() == "ast":
+            self.fromAST(input, order)
         else:
             raise NotImplementedError(f"\"{input.get_stub()}\"")
 
@@ -65,6 +106,80 @@ class BDD:
         if order:
             mgr.set_order(order)
 
+        if self.var_groups:
+            self.add_var_blocks(order if order else [x + 1 for x in range(0, no_variables)])
+
+    def set_var_groups(self, groups):
+        """Groups of (one-based) variables to reorder as blocks, applied where they are contiguous in the order.
+
+        Group-aware DVO options (e.g., sift-group) profit most, see svo.Blocks for deriving the groups.
+        """
+        self.var_groups = groups
+
+    def set_incremental(self, fanout = 8, persist = True):
+        """Compiles CNFs along a content-addressed conjunction tree whose BDDs are reused by later compilations (see fromCNFTree).
+
+        With persist, the BDDs of the tree are stored on disk per library and
+        reused by later runs as well.
+        """
+        self.tree = ConjunctionTree(fanout, Caching.get_tree_store(self.lib.stub) if persist else None)
+
+    def set_checkpoints(self, every = None, resume = False, preorder = None):
+        """Writes checkpoints (partial BDD, clause cursor, variable order) during fromCNF every `every` seconds and on aborts.
+
+        With resume, fromCNF continues from the last checkpoint of the input,
+        provided its clauses (in their order) are unchanged. Checkpoints are
+        kept per library, preorder, dynorder, and mode.
+        """
+        self.checkpoint_every = every
+        self.resume = resume
+        self.checkpoint_preorder = preorder
+
+    def set_quantify(self, patterns):
+        """Variables to quantify existentially during fromCNF, given as one-based ids, names, or regular expressions over the names.
+
+        Every variable is quantified right after the last clause it occurs in
+        (see CNF.last_occurrences), the result is the projection onto the
+        remaining variables.
+        """
+        self.quantify = patterns
+
+    def quantified_variables(self):
+        """Resolves the patterns of set_quantify to sorted one-based variable ids."""
+
+        out = set()
+
+        for x in self.quantify:
+            x = str(x).strip()
+
+            if x.isdigit() and 0 < int(x) <= self.no_variables:
+                out.add(int(x))
+                continue
+
+            pattern = re.compile(x)
+            matches = [k for k, v in self.var2desc.items() if pattern.fullmatch(v.strip())]
+
+            if not matches:
+                Logging.warning("No variable matches", Logging.highlight(x))
+
+            out.update(matches)
+
+        return sorted(out)
+
+    def add_var_blocks(self, order):
+
+        blocks = Blocks.blocks(self.var_groups, order)
+
+        n_added = 0
+
+        for block in blocks:
+            if self.mgr.add_var_block([x - self.varmod for x in block]):
+                n_added += 1
+
+        self.meta["n_var_blocks"] = n_added
+
+        Logging.info("Variable blocks:", Logging.highlight(n_added), "of", Logging.highlight(len(blocks)))
+
     def set_dvo(self, dvo_stub):
         if self.mgr is None:
             Logging.warning("BDD manager not initialized, not setting DVO.")
@@ -97,42 +212,864 @@ class BDD:
 
         Logging.info(f"Available DVO options for {self.lib.name}:", bulk_format(Logging.highlight(", ".join(ls)), color = "blue"))
 
+    def set_budget(self, max_nodes = None, time_limit = None, max_rss = None):
+        """Limits the compilation to max_nodes live nodes, time_limit seconds, and max_rss bytes of peak memory.
+
+        Exceeding a budget aborts the compilation with BudgetExceeded, the report
+        then only contains the meta data and how far the compilation got.
+        """
+
+        if max_nodes or time_limit or max_rss:
+            self.budget = {"max_nodes": max_nodes, "time_limit": time_limit, "max_rss": max_rss}
+        else:
+            self.budget = None
+
+    def set_trace(self, rate = None):
+        """Records the growth of the compilation every rate clauses as well as all garbage collections and
+        reorderings, the trace is written next to the report."""
+
+        if rate:
+            self.trace = Trace(rate)
+            self.mgr.set_hooks(self.trace.event)
+        else:
+            self.trace = None
+            self.mgr.set_hooks(None)
+
+    def set_reorder_schedule(self, every = None, growth = None, time_cap = None, method = "lib-default"):
+        """Reorders with the DVO method every given number of clauses and/or once the live nodes grew by the
+        factor growth, until time_cap seconds were spent reordering (see ReorderScheduler)."""
+
+        if not (every or growth):
+            self.scheduler = None
+            return
+
+        if method not in self.lib.dvo_options:
+            Logging.warning(f"Library {self.lib.name} does not support DVO {method}, reordering with lib-default")
+            method = "lib-default"
+
+        self.scheduler = ReorderScheduler(every, growth, time_cap, self.lib.dvo_options[method])
+
+    def is_aborted(self):
+        return "aborted" in self.meta
+
+    def check_budget(self, time_start):
+        budget = self.budget
+
+        if budget["max_nodes"] and self.mgr.live_nodes_() > budget["max_nodes"]:
+            raise BudgetExceeded("max-nodes")
+
+        if budget["time_limit"] and (datetime.now() - time_start).total_seconds() > budget["time_limit"]:
+            raise BudgetExceeded("time-limit")
+
+        # ru_maxrss is in KiB
+        if budget["max_rss"] and resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 > budget["max_rss"]:
+            raise BudgetExceeded("max-rss")
+
     def fromCNF(self, cnf, order = None):
 
         bdd = self.bdd
         lib = self.lib
         mgr = self.mgr
 
+        checkpoint = self.find_checkpoint(cnf) if self.resume else None
+
         if bdd is None:
+            # the order of the checkpoint is applied (before the variable blocks) by init
+            if checkpoint:
+                order = [int(x) for x in re.split(r",", checkpoint["order"])]
+
             self.init(cnf.get_no_variables(), cnf.get_meta(), order)
+            self.var2desc = cnf.var2desc
             bdd = mgr.one_()
 
+        budget = self.budget
+        trace = self.trace
+        scheduler = self.scheduler
+
+        if budget:
+            mgr.set_limits(budget["max_nodes"], budget["time_limit"], budget["max_rss"])
+
         time_start = datetime.now()
+        time_stop = time_start
+
+        if trace:
+            trace.start()
+            trace.clause = 1
 
         info_indent = len(str(len(cnf.clauses)))
+        log_progress = Logging.is_enabled(Logging.LL_INFO)
 
-        bdd = mgr.one_()
-        for i, clause in enumerate(cnf.clauses):
+        # variables to quantify after the i-th clause
+        due = {}
 
-            clause_bdd = mgr.zero_()
+        if self.quantify:
+            self.quantified = self.quantified_variables()
 
-            for x in clause:
+            for x, i in cnf.last_occurrences(self.quantified).items():
+                due.setdefault(i, []).append(x - self.varmod)
 
-                y = abs(x) - self.varmod
+            self.meta["n_quantified"] = len(self.quantified)
+            self.meta["quantified"] = ",".join([str(x) for x in self.quantified])
+
+            Logging.info("Quantifying", Logging.highlight(len(self.quantified)), "variables")
+
+        n_conjoined = 0
+
+        if checkpoint:
+            resumed = self.read_checkpoint(checkpoint)
+
+            if resumed:
+                n_conjoined, x = resumed
+                mgr.delref_(bdd)
+                bdd = x
+
+        time_checkpoint = datetime.now()
+
+        # whether bdd holds a complete conjunction, operations aborted by the library consume it
+        bdd_complete = True
+
+        try:
+            for i, clause in enumerate(cnf.clauses):
+
+                if i < n_conjoined:
+                    continue
+
+                bdd_complete = False
+
+                clause_bdd = mgr.zero_()
+
+                for x in clause:
+
+                    y = abs(x) - self.varmod
+                    
+                    if x < 0:
+                        clause_bdd = mgr.or_(clause_bdd, mgr.nithvar_(y))
+                    else:
+                        clause_bdd = mgr.or_(clause_bdd, mgr.ithvar_(y))
+
+                bdd = mgr.and_(bdd, clause_bdd)
+                n_conjoined += 1
+
+                if i in due:
+                    bdd = mgr.exist_(bdd, due[i])
+
+                bdd_complete = True
+
+                if trace and trace.due(i, len(cnf.clauses)):
+                    trace.record(n_conjoined, mgr.live_nodes_(), mgr.size_(bdd))
+
+                if scheduler:
+                    live_nodes = mgr.live_nodes_()
+
+                    if scheduler.due(n_conjoined, live_nodes):
+                        mark = trace.mark() if trace else None
+
+                        _, duration, nodes_before, nodes_after = scheduler.reorder(mgr, n_conjoined, live_nodes)
+
+                        Logging.info(f"Reordered after {n_conjoined} clauses: {nodes_before} -> {nodes_after} nodes in {format_runtime(duration)}")
+
+                        if trace:
+                            trace.scheduled(mark, duration, nodes_before, nodes_after)
+
+                if trace:
+                    # library events are attributed to the clause being conjoined
+                    trace.clause = n_conjoined + 1
                 
-                if x < 0:
-                    clause_bdd = mgr.or_(clause_bdd, mgr.nithvar_(y))
-                else:
-                    clause_bdd = mgr.or_(clause_bdd, mgr.ithvar_(y))
+                time_stop = datetime.now()            
+
+                if log_progress:
+                    Logging.info(f"{i + 1:{info_indent}} / {len(cnf.clauses)} ({100*(i+1)/len(cnf.clauses):5.1f}%) {format_runtime(time_stop - time_start)} {clause}")
+
+                if budget:
+                    self.check_budget(time_start)
+
+                if self.checkpoint_every and (time_stop - time_checkpoint).total_seconds() >= self.checkpoint_every:
+                    self.write_checkpoint(cnf, bdd, n_conjoined)
+                    time_checkpoint = datetime.now()
+
+        except BudgetExceeded as e:
+            time_stop = datetime.now()
 
-            bdd = mgr.and_(bdd, clause_bdd)
-            
-            time_stop = datetime.now()            
-            Logging.info(f"{i + 1:{info_indent}} / {len(cnf.clauses)} ({100*(i+1)/len(cnf.clauses):5.1f}%) {format_runtime(time_stop - time_start)} {clause}")
+            self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+            self.meta["aborted"] = str(e)
+            self.meta["n_clauses_conjoined"] = n_conjoined
+
+            if self.checkpoint_every and bdd_complete:
+                self.write_checkpoint(cnf, bdd, n_conjoined)
+
+            if scheduler:
+                self.meta["reorder-scheduled"] = scheduler.summary()
+
+            Logging.warning(f"Compilation aborted ({e}) after {n_conjoined} / {len(cnf.clauses)} clauses")
+
+            raise
 
         self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+
+        if scheduler:
+            self.meta["reorder-scheduled"] = scheduler.summary()
+
+        if self.checkpoint_every or self.resume:
+            self.clear_checkpoint(cnf)
+
         self.bdd = bdd
 
+#---- Checkpoints -------------------------------------------------------------#
+
+# A checkpoint is the partial BDD (in the library's format, see save_) and a
+# sidecar with the clause cursor, the variable order, and the digest of the
+# clauses. The sidecar is replaced atomically after the BDD was written.
+
+    def checkpoint_sidecar(self, cnf):
+        return Caching.get_checkpoint_cache(cnf.meta["input-name"], self.lib.stub, self.get_dvo(), self.checkpoint_preorder, self.meta.get("mode", "bdd"))
+
+    def read_sidecar(self, sidecar):
+
+        if not path.exists(sidecar):
+            return None
+
+        with open(sidecar) as file:
+            return dict([re.split(r":", x.strip(), 1) for x in file.readlines() if ":" in x])
+
+    def write_checkpoint(self, cnf, bdd, n_conjoined):
+
+        mgr = self.mgr
+        sidecar = self.checkpoint_sidecar(cnf)
+        filename = Caching.get_checkpoint_bdd(sidecar, n_conjoined)
+
+        if not mgr.save_(bdd, filename):
+            Logging.warning("Checkpoint", Logging.highlight(filename), "could not be written")
+            return
+
+        previous = self.read_sidecar(sidecar)
+
+        order = sorted(range(0, self.no_variables), key = mgr.var2level_)
+
+        content = []
+        content.append(f"input-name:{self.meta['input-name']}")
+        content.append(f"input-hash:{self.meta['input-hash']}")
+        content.append(f"clauses-digest:{cnf.digest()}")
+        content.append(f"n_clauses_conjoined:{n_conjoined}")
+        content.append(f"order:{','.join([str(x + 1) for x in order])}")
+        content.append(f"bdd:{filename}")
+
+        with open(f"{sidecar}.tmp", "w") as file:
+            file.write(os.linesep.join(content))
+
+        os.replace(f"{sidecar}.tmp", sidecar)
+
+        if previous and previous["bdd"] != filename and path.exists(previous["bdd"]):
+            os.remove(previous["bdd"])
+
+        self.meta["checkpoint"] = sidecar
+
+        Logging.info("Checkpoint after", Logging.highlight(n_conjoined), "clauses:", Logging.highlight(filename))
+
+    def find_checkpoint(self, cnf):
+        """Returns the sidecar of the last checkpoint as dict, None if there is no one matching the clauses."""
+
+        sidecar = self.checkpoint_sidecar(cnf)
+
+        info = self.read_sidecar(sidecar)
+
+        if info is None:
+            Logging.warning("No checkpoint found, starting from the first clause")
+            return None
+
+        if info["clauses-digest"] != cnf.digest():
+            Logging.warning("Checkpoint", Logging.highlight(sidecar), "does not match the clauses, starting from the first clause")
+            return None
+
+        return info
+
+    def read_checkpoint(self, info):
+        """Returns (clause cursor, BDD) of the checkpoint found by find_checkpoint, None if its BDD cannot be loaded."""
+
+        mgr = self.mgr
+
+        bdd = mgr.load_(info["bdd"])
+
+        if bdd is None:
+            Logging.warning("Checkpoint", Logging.highlight(info["bdd"]), "could not be loaded, starting from the first clause")
+            return None
+
+        n_conjoined = int(info["n_clauses_conjoined"])
+
+        self.meta["resumed-from"] = n_conjoined
+
+        Logging.info("Resuming after", Logging.highlight(n_conjoined), "clauses from", Logging.highlight(info["bdd"]))
+
+        return n_conjoined, bdd
+
+    def clear_checkpoint(self, cnf):
+
+        sidecar = self.checkpoint_sidecar(cnf)
+        info = self.read_sidecar(sidecar)
+
+        if info is None:
+            return
+
+        if path.exists(info["bdd"]):
+            os.remove(info["bdd"])
+
+        os.remove(sidecar)
+
+    def fromFM(self, fm, order = None):
+        """Compiles the feature tree bottom-up, one BDD per group, and conjoins the cross-tree constraints last."""
+
+        mgr = self.mgr
+
+        self.init(fm.get_no_variables(), fm.get_meta(), order)
+        self.var2desc = fm.var2desc
+
+        budget = self.budget
+
+        if budget:
+            mgr.set_limits(budget["max_nodes"], budget["time_limit"], budget["max_rss"])
+
+        time_start = datetime.now()
+
+        log_progress = Logging.is_enabled(Logging.LL_INFO)
+        info_indent = len(str(len(fm.expr_ctcs)))
+
+        n_conjoined = 0
+
+        try:
+            # the root feature is always selected
+            bdd = mgr.and_(self.literal_(fm.expr_fd[0]), self.compile_feature_(fm.expr_fd))
+
+            time_stop = datetime.now()
+            Logging.info("Feature tree:", Logging.highlight(format_runtime(time_stop - time_start)))
+
+            if budget:
+                self.check_budget(time_start)
+
+            for i, ctc in enumerate(fm.expr_ctcs):
+                bdd = mgr.and_(bdd, self.compile_ast_(ctc))
+                n_conjoined += 1
+
+                time_stop = datetime.now()
+
+                if log_progress:
+                    Logging.info(f"{i + 1:{info_indent}} / {len(fm.expr_ctcs)} ({100*(i+1)/len(fm.expr_ctcs):5.1f}%) {format_runtime(time_stop - time_start)}")
+
+                if budget:
+                    self.check_budget(time_start)
+
+        except BudgetExceeded as e:
+            time_stop = datetime.now()
+
+            self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+            self.meta["aborted"] = str(e)
+            self.meta["n_ctcs_conjoined"] = n_conjoined
+
+            self.free_subformulas()
+
+            Logging.warning(f"Compilation aborted ({e}) after {n_conjoined} / {len(fm.expr_ctcs)} cross-tree constraints")
+
+            raise
+
+        self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+        self.free_subformulas()
+
+        self.bdd = bdd
+
+    def fromAST(self, ast, order = None):
+        """Conjoins the formulas of ast, structurally identical subformulas are built only once (see compile_ast_)."""
+
+        mgr = self.mgr
+
+        self.init(ast.get_no_variables(), ast.get_meta(), order)
+        self.var2desc = ast.var2desc
+
+        budget = self.budget
+
+        if budget:
+            mgr.set_limits(budget["max_nodes"], budget["time_limit"], budget["max_rss"])
+
+        time_start = datetime.now()
+        time_stop = time_start
+
+        log_progress = Logging.is_enabled(Logging.LL_INFO)
+        info_indent = len(str(len(ast.clauses)))
+
+        n_conjoined = 0
+
+        try:
+            bdd = mgr.one_()
+
+            for i, formula in enumerate(ast.clauses):
+                bdd = mgr.and_(bdd, self.compile_ast_(formula))
+                n_conjoined += 1
+
+                time_stop = datetime.now()
+
+                if log_progress:
+                    Logging.info(f"{i + 1:{info_indent}} / {len(ast.clauses)} ({100*(i+1)/len(ast.clauses):5.1f}%) {format_runtime(time_stop - time_start)}")
+
+                if budget:
+                    self.check_budget(time_start)
+
+        except BudgetExceeded as e:
+            time_stop = datetime.now()
+
+            self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+            self.meta["aborted"] = str(e)
+            self.meta["n_formulas_conjoined"] = n_conjoined
+
+            self.free_subformulas()
+
+            Logging.warning(f"Compilation aborted ({e}) after {n_conjoined} / {len(ast.clauses)} formulas")
+
+            raise
+
+        self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+        self.free_subformulas()
+
+        self.bdd = bdd
+
+    def fromCNFTree(self, cnf, order = None):
+        """Compiles the CNF along the conjunction tree (see set_incremental)."""
+
+        self.init(cnf.get_no_variables(), cnf.get_meta(), order)
+        self.var2desc = cnf.var2desc
+
+        self.conjoin_tree(cnf)
+
+    def conjoin_tree(self, cnf):
+        """Builds the BDD of cnf along the conjunction tree in the initialized manager.
+
+        The BDD of every inner node is kept, nodes already known from an
+        earlier compilation in this manager are reused. Afterwards only the
+        nodes of this CNF's tree are kept.
+        """
+
+        mgr = self.mgr
+        tree = self.tree
+
+        if self.trace or self.scheduler or self.quantify or self.checkpoint_every or self.resume:
+            Logging.error("Traces, scheduled reorderings, quantification, and checkpoints are not supported along the conjunction tree")
+
+        budget = self.budget
+
+        if budget:
+            mgr.set_limits(budget["max_nodes"], budget["time_limit"], budget["max_rss"])
+
+        time_start = datetime.now()
+
+        root = tree.build(cnf.clauses)
+        reused_before = tree.n_reused
+        loaded_before = tree.n_loaded
+        computed_before = tree.n_computed
+
+        try:
+            bdd = self.compile_tree_node_(root, time_start) if root else mgr.one_()
+        except BudgetExceeded as e:
+            time_stop = datetime.now()
+
+            self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+            self.meta["aborted"] = str(e)
+
+            Logging.warning(f"Compilation aborted ({e})")
+
+            raise
+
+        time_stop = datetime.now()
+
+        # nodes of earlier versions are no longer needed
+        for x in tree.retain(root):
+            mgr.delref_(x)
+
+        n_reused = tree.n_reused - reused_before
+        n_loaded = tree.n_loaded - loaded_before
+        n_computed = tree.n_computed - computed_before
+
+        Logging.info("Conjunction tree:", Logging.highlight(n_reused), "nodes reused,", Logging.highlight(n_loaded), "loaded,", Logging.highlight(n_computed), "computed")
+
+        n_pruned = tree.prune(TREE_STORE_MAX_AGE)
+
+        if n_pruned:
+            Logging.info("Conjunction tree store:", Logging.highlight(n_pruned), "unused nodes removed")
+
+        self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+        self.meta["tree-nodes-reused"] = n_reused
+        self.meta["tree-nodes-loaded"] = n_loaded
+        self.meta["tree-nodes-computed"] = n_computed
+
+        self.bdd = bdd
+
+    def compile_tree_node_(self, node, time_start):
+
+        mgr = self.mgr
+        tree = self.tree
+
+        digest, clause, childs = node
+
+        if clause is not None:
+            out = mgr.zero_()
+
+            for x in clause:
+                out = mgr.or_(out, self.literal_(x))
+
+            return out
+
+        if digest in tree.bdds:
+            tree.n_reused += 1
+
+            out = tree.bdds[digest]
+            mgr.addref_(out)
+
+            return out
+
+        out = self.load_tree_node_(digest)
+
+        if out is not None:
+            tree.n_loaded += 1
+        else:
+            out = mgr.one_()
+
+            for x in childs:
+                out = mgr.and_(out, self.compile_tree_node_(x, time_start))
+
+            tree.n_computed += 1
+
+            self.save_tree_node_(digest, out)
+
+        # one reference for the tree, one for the caller
+        mgr.addref_(out)
+        tree.bdds[digest] = out
+
+        if self.budget:
+            self.check_budget(time_start)
+
+        return out
+
+    def load_tree_node_(self, digest):
+        """The BDD of the node digest from the store (referenced), None if it is not stored."""
+
+        filename = self.tree.stored(digest)
+
+        if filename is None or not path.exists(filename):
+            return None
+
+        out = self.mgr.load_(filename)
+
+        if out is None:
+            Logging.warning("Stored tree node", Logging.highlight(filename), "could not be loaded")
+            return None
+
+        # marks the node as used for pruning
+        os.utime(filename)
+
+        return out
+
+    def save_tree_node_(self, digest, bdd):
+
+        filename = self.tree.stored(digest)
+
+        if filename is None or path.exists(filename):
+            return
+
+        # concurrent runs may store the same node
+        tmp = f"{filename}.{os.getpid()}.tmp"
+
+        if self.mgr.save_(bdd, tmp):
+            os.replace(tmp, filename)
+        else:
+            Logging.warning("Tree node", Logging.highlight(filename), "could not be stored")
+
+#---- Roots -------------------------------------------------------------------#
+
+# Several CNFs over the same variables (e.g., versions of a product line, see
+# utils.InputFormats.merge) compiled into one manager as named roots, their
+# shared structure is stored only once.
+
+    def fromCNFs(self, cnfs, names, order = None):
+        """Compiles every CNF into the root of the same name, the first root becomes the BDD of the report."""
+
+        mgr = self.mgr
+
+        self.init(cnfs[0].get_no_variables(), cnfs[0].get_meta(), order)
+        self.var2desc = cnfs[0].var2desc
+
+        time_start = datetime.now()
+
+        for name, cnf in zip(names, cnfs):
+            Logging.info("Root", Logging.highlight(name))
+
+            if self.tree:
+                self.conjoin_tree(cnf)
+            else:
+                # fromCNF conjoins onto an existing BDD
+                self.bdd = mgr.one_()
+                self.fromCNF(cnf)
+
+            self.roots[name] = self.bdd
+
+        time_stop = datetime.now()
+
+        self.bdd = self.roots[names[0]]
+
+        self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+        self.meta["roots"] = ",".join([f"{name}={mgr.size_(x)}" for name, x in self.roots.items()])
+        self.meta["roots-shared-nodes"] = mgr.live_nodes_()
+
+    def satcount(self, bdd = None):
+        """Number of configurations of bdd (by default the compiled BDD), quantified variables are not counted."""
+
+        return Counting.satcount(self.node_table(bdd)) // 2 ** len(self.quantified)
+
+    def equivalent(self, a, b):
+        """Whether the roots a and b represent the same configurations."""
+
+        mgr = self.mgr
+
+        x = mgr.xor_(self.roots[a], self.roots[b], free_factors = False)
+        out = mgr.terminal_(mgr.ref_(x)) is False
+        mgr.delref_(x)
+
+        return out
+
+    def difference(self, a, b):
+        """Returns the number of configurations added (only in root b) and removed (only in root a)."""
+
+        mgr = self.mgr
+        out = []
+
+        for x, y in [(b, a), (a, b)]:
+            z = mgr.not_(self.roots[y])
+            only_x = mgr.and_(self.roots[x], z, free_factors = False)
+            mgr.delref_(z)
+
+            out.append(self.satcount(only_x))
+            mgr.delref_(only_x)
+
+        return tuple(out)
+
+    def compare_roots(self):
+        """Differences between consecutive roots (in the order of compilation), added to the report."""
+
+        names = list(self.roots)
+        out = []
+
+        for a, b in zip(names, names[1:]):
+            added, removed = self.difference(a, b)
+            out.append((a, b, added, removed))
+
+        self.meta["root-diffs"] = ",".join([f"{a}->{b}:+{added}/-{removed}" for a, b, added, removed in out])
+
+        return out
+
+#---- Structural Compilation --------------------------------------------------#
+
+# All helpers return referenced BDDs owned by the caller.
+
+    def literal_(self, x):
+        """BDD of the one-based literal x."""
+
+        if x < 0:
+            return self.mgr.nithvar_(-x - self.varmod)
+        else:
+            return self.mgr.ithvar_(x - self.varmod)
+
+    def compile_feature_(self, feature):
+        """Conjunction of all groups in the subtree below feature."""
+
+        mgr = self.mgr
+        var, groups = feature
+
+        out = mgr.one_()
+
+        for kind, childs in groups:
+            for child in childs:
+                out = mgr.and_(out, self.compile_feature_(child))
+
+            out = mgr.and_(out, self.compile_group_(var, kind, [x for x, _ in childs]))
+
+        return out
+
+    def compile_group_(self, parent, kind, childs):
+        """Relation of parent and its group of childs, kind as in UVL_Parser."""
+
+        mgr = self.mgr
+
+        out = mgr.one_()
+
+        if kind == "mandatory":
+            for x in childs:
+                xor = mgr.xor_(self.literal_(x), self.literal_(parent))
+                out = mgr.and_(out, mgr.not_(xor))
+                mgr.delref_(xor)
+
+            return out
+
+        # every child implies its parent
+        for x in childs:
+            out = mgr.and_(out, mgr.or_(self.literal_(-x), self.literal_(parent)))
+
+        if kind == "optional":
+            return out
+
+        if kind == "or":
+            lo, hi = 1, None
+        elif kind == "alternative":
+            lo, hi = 1, 1
+        else:
+            lo, hi = kind
+
+        # the parent implies the cardinality
+        return mgr.and_(out, mgr.or_(self.literal_(-parent), self.cardinality_(childs, lo, hi)))
+
+    def cardinality_(self, variables, lo, hi = None):
+        """BDD of "between lo and hi (None: any number) of the one-based variables are true"."""
+
+        mgr = self.mgr
+
+        if hi is None or hi >= len(variables):
+            hi = None
+
+        if lo == 0 and hi is None:
+            return mgr.one_()
+
+        if lo == 1 and hi is None:
+            out = mgr.zero_()
+
+            for x in variables:
+                out = mgr.or_(out, self.literal_(x))
+
+            return out
+
+        def and_literal(x, obj):
+            literal = self.literal_(x)
+            out = mgr.and_(literal, obj, free_factors = False)
+            mgr.delref_(literal)
+
+            return out
+
+        # counts[j]: exactly j of the processed variables are true, the last
+        # bucket collects all counts beyond the range of interest
+        cap = lo if hi is None else hi + 1
+        counts = [mgr.one_()] + [mgr.zero_() for _ in range(0, cap)]
+
+        for x in variables:
+            update = []
+
+            for j in range(0, cap):
+                y = and_literal(-x, counts[j])
+
+                if j > 0:
+                    y = mgr.or_(y, and_literal(x, counts[j - 1]))
+
+                update.append(y)
+
+            y = and_literal(x, counts[cap - 1])
+            update.append(mgr.or_(y, counts[cap], free_factors = False))
+            mgr.delref_(y)
+
+            for y in counts:
+                mgr.delref_(y)
+
+            counts = update
+
+        selected = [cap] if hi is None else range(lo, hi + 1)
+
+        out = mgr.zero_()
+
+        for j in selected:
+            out = mgr.or_(out, counts[j])
+            counts[j] = None
+
+        for y in counts:
+            if y is not None:
+                mgr.delref_(y)
+
+        return out
+
+    def compile_ast_(self, ast):
+        """BDD of the AST (op, [childs]) with op in not, and, or, impl, iff, xor, leafs are one-based literals.
+
+        Subformulas are hash-consed (see utils.InputFormats.Subformulas) and
+        their BDDs kept until free_subformulas, hence every subformula
+        repeated within or across ASTs is built only once.
+        """
+        return self.compile_subformula_(self.subformulas.intern(ast))
+
+    def compile_subformula_(self, i):
+
+        mgr = self.mgr
+
+        if i in self.subformula_bdds:
+            self.subformula_hits += 1
+
+            out = self.subformula_bdds[i]
+            mgr.addref_(out)
+
+            return out
+
+        node = self.subformulas.nodes[i]
+
+        if isinstance(node, int):
+            return self.literal_(node)
+
+        op, childs = node
+
+        if op == "not":
+            x = self.compile_subformula_(childs[0])
+            out = mgr.not_(x)
+            mgr.delref_(x)
+
+        elif op == "and":
+            out = mgr.one_()
+
+            for x in childs:
+                out = mgr.and_(out, self.compile_subformula_(x))
+
+        elif op == "or":
+            out = mgr.zero_()
+
+            for x in childs:
+                out = mgr.or_(out, self.compile_subformula_(x))
+
+        elif op == "impl":
+            lhs = self.compile_subformula_(childs[0])
+            out = mgr.not_(lhs)
+            mgr.delref_(lhs)
+
+            out = mgr.or_(out, self.compile_subformula_(childs[1]))
+
+        elif op in ["iff", "xor"]:
+            out = mgr.xor_(self.compile_subformula_(childs[0]), self.compile_subformula_(childs[1]))
+
+            if op == "iff":
+                y = mgr.not_(out)
+                mgr.delref_(out)
+                out = y
+
+        else:
+            raise NotImplementedError(f"\"{op}\"")
+
+        # one reference for the cache, one for the caller
+        mgr.addref_(out)
+        self.subformula_bdds[i] = out
+
+        return out
+
+    def free_subformulas(self):
+        """Releases the cached subformula BDDs, the hash-consing table is kept."""
+
+        for x in self.subformula_bdds.values():
+            self.mgr.delref_(x)
+
+        if self.subformulas:
+            self.meta["n_subformulas"] = len(self.subformulas)
+            self.meta["subformula-hits"] = self.subformula_hits
+
+        self.subformula_bdds = {}
+
+    def stats(self):
+        """Returns the counters of the manager (see Adapter_Generic.stats)."""
+        return self.mgr.stats()
+
     def dump(self, filename = None):
 
         if filename is None:
@@ -140,7 +1077,176 @@ class BDD:
 
         Logging.info("Dumpfile:", Logging.highlight(filename))
 
-        self.mgr.dump(self.bdd, filename, no_variables = self.no_variables, meta = self.meta)
+        self.meta.update({f"mgr-{k}": v for k, v in self.stats().items()})
+
+        if self.trace:
+            for event, (n, total) in self.trace.summary().items():
+                self.meta[f"trace-{event}"] = f"{n} events, {total:.3f}s"
+
+            self.meta["trace"] = self.trace.write(Caching.get_trace_cache(filename))
+            Logging.info("Trace:", Logging.highlight(self.meta["trace"]))
+
+        if self.bdd is None:
+            self.dump_meta(filename)
+        else:
+            self.mgr.dump(self.bdd, filename, no_variables = self.no_variables, meta = self.meta)
+
+        return filename
+
+    def dump_meta(self, filename):
+        """Writes a report without nodes, e.g., for aborted compilations."""
+
+        content = sorted([f"{k}:{v}" for k, v in self.meta.items()])
+        content.append("----")
+
+        with open(filename, "w") as file:
+            file.write(os.linesep.join(content))
+            file.write(os.linesep)
+
+    def node_table(self, bdd = None):
+
+        if bdd is None:
+            bdd = self.bdd
+
+        return self.mgr.node_table(bdd, self.no_variables)
+
+    def resolve_features(self, features):
+        """Maps feature names or (one-based) variable ids to sorted library variable ids."""
+
+        desc2var = {v: k for k, v in self.var2desc.items()}
+
+        out = set()
+
+        for x in features:
+            x = str(x).strip()
+
+            if x in desc2var:
+                out.add(desc2var[x] - self.varmod)
+            elif x.isdigit() and 0 < int(x) <= self.no_variables:
+                out.add(int(x) - self.varmod)
+            else:
+                Logging.error("Unknown feature", Logging.highlight(x))
+
+        return sorted(out)
+
+    def commonality(self):
+        """Computes the commonality of every variable and the resulting core and dead variables.
+
+        Uses one bottom-up and one top-down pass over the node table, results are added to the report.
+        """
+
+        time_start = datetime.now()
+
+        total, commonalities, core, dead = Counting.commonality(self.node_table())
+
+        if self.quantified:
+            # quantified variables are unconstrained, each doubles the count
+            total //= 2 ** len(self.quantified)
+
+            quantified = set([x - self.varmod for x in self.quantified])
+
+            commonalities = [None if i in quantified else x for i, x in enumerate(commonalities)]
+            core = [x for x in core if x not in quantified]
+            dead = [x for x in dead if x not in quantified]
+
+        varmod = self.varmod
+        commonalities = {i + varmod: x for i, x in enumerate(commonalities) if x is not None}
+        core = [x + varmod for x in core]
+        dead = [x + varmod for x in dead]
+
+        time_stop = datetime.now()
+
+        self.meta["n_configurations"] = total
+        self.meta["core"] = ",".join([str(x) for x in core])
+        self.meta["dead"] = ",".join([str(x) for x in dead])
+        self.meta["commonality"] = ",".join([f"{k}={v:.6f}" for k, v in commonalities.items()])
+        self.meta["runtime-analysis"] = format_runtime(time_stop - time_start)
+
+        return total, commonalities, core, dead
+
+    def configurations(self, features = None, as_cubes = False):
+        """Lazily generates the configurations (or satisfying cubes) as lists of one-based literals.
+
+        If features is given, the configurations are projected onto these features.
+        """
+
+        variables = [x for x in range(0, self.no_variables) if x + self.varmod not in self.quantified]
+        bdd = self.bdd
+
+        if features is not None:
+            variables = self.resolve_features(features)
+            projected = set(variables)
+            others = [x for x in range(0, self.no_variables) if x not in projected]
+
+            if others:
+                bdd = self.mgr.exist_(self.bdd, others, free_factors = False)
+
+        table = self.node_table(bdd)
+
+        if bdd is not self.bdd:
+            self.mgr.delref_(bdd)
+
+        varmod = self.varmod
+
+        if as_cubes:
+            for cube in Enumeration.cubes(table):
+                yield [x + varmod if value else -(x + varmod) for x, value in sorted(cube.items())]
+        else:
+            for values in Enumeration.configurations(table, variables):
+                yield [x + varmod if value else -(x + varmod) for x, value in zip(variables, values)]
+
+    def enumerate(self, filename = None, features = None, as_cubes = False):
+        """Streams all configurations (or satisfying cubes) as DIMACS-style lines to filename."""
+
+        if filename is None:
+            filename = Caching.get_configurations_cache(self.meta['input-name'], self.lib.stub, self.get_dvo())
+
+        time_start = datetime.now()
+
+        n = 0
+        with open(filename, "w") as file:
+            for literals in self.configurations(features, as_cubes):
+                file.write(" ".join([str(x) for x in literals]))
+                file.write(" 0\n")
+                n += 1
+
+        time_stop = datetime.now()
+
+        self.meta["n_enumerated"] = n
+        self.meta["runtime-enumeration"] = format_runtime(time_stop - time_start)
+
+        Logging.info("Configurations:", Logging.highlight(filename))
+
+        return filename
+
+    def configurator(self, cache_size = 1024):
+        """Returns a Configurator for incremental decision propagation on this BDD."""
+        return Propagation.Configurator(self, cache_size)
+
+    def sampler(self, seed = None):
+        """Returns a Sampler for uniform random sampling of configurations, model counts are precomputed once."""
+
+        # NumPy is only needed for sampling
+        from analysis.Sampling import Sampler
+
+        return Sampler(self.node_table(), seed)
+
+    def sample(self, k, filename = None, seed = None):
+        """Writes k uniformly drawn configurations as DIMACS-style lines to filename."""
+
+        if filename is None:
+            filename = Caching.get_samples_cache(self.meta['input-name'], self.lib.stub, self.get_dvo())
+
+        time_start = datetime.now()
+
+        self.sampler(seed).write(k, filename, varmod = self.varmod)
+
+        time_stop = datetime.now()
+
+        self.meta["n_samples"] = k
+        self.meta["runtime-sampling"] = format_runtime(time_stop - time_start)
+
+        Logging.info("Samples:", Logging.highlight(filename))
 
         return filename
 
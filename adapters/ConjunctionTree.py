@@ -0,0 +1,130 @@
+from datetime import datetime
+
+import hashlib
+import os
+from os import path
+
+class ConjunctionTree:
+    """Content-addressed conjunction tree over the clauses of a CNF, the BDDs of its inner nodes are kept for later versions.
+
+    Every node is identified by the digest of its content (the clause for
+    leafs, the digests of its childs otherwise). A node ends after a child
+    whose digest is divisible by fanout, hence the boundaries depend on the
+    content only and adding or removing a clause changes just the nodes on
+    its path to the root, all other subtrees are reused (see BDD.fromCNFTree).
+
+    Nodes are tuples (digest, clause, childs), with clause None for inner
+    nodes and childs None for leafs.
+
+    With a store (a directory), the BDDs of inner nodes are also kept on disk
+    under their digest, hence later runs (e.g., next week's version of the
+    model) load unchanged subtrees instead of compiling them.
+    """
+
+    def __init__(self, fanout = 8, store = None):
+        self.fanout = max(2, fanout)
+        self.bdds = {}
+        self.store = store
+
+        if store:
+            os.makedirs(store, exist_ok = True)
+
+        self.n_reused = 0
+        self.n_loaded = 0
+        self.n_computed = 0
+
+    def leaf(self, clause):
+        clause = sorted(clause, key = abs)
+        digest = hashlib.md5(" ".join([str(x) for x in clause]).encode("utf-8")).digest()
+
+        return (digest, clause, None)
+
+    def node(self, childs):
+        digest = hashlib.md5(b"".join([x[0] for x in childs])).digest()
+
+        return (digest, None, childs)
+
+    def is_boundary(self, node):
+        return int.from_bytes(node[0][:4], "little") % self.fanout == 0
+
+    def build(self, clauses):
+        """Returns the root of the tree over clauses, None if there are none."""
+
+        nodes = [self.leaf(x) for x in clauses]
+
+        while len(nodes) > 1:
+            out = []
+            group = []
+
+            for x in nodes:
+                group.append(x)
+
+                if self.is_boundary(x):
+                    out.append(self.node(group))
+                    group = []
+
+            if group:
+                out.append(self.node(group))
+
+            # every node a boundary, the level does not shrink
+            if len(out) == len(nodes):
+                out = [self.node(nodes)]
+
+            nodes = out
+
+        return nodes[0] if nodes else None
+
+    def digests(self, root):
+        """Digests of all inner nodes below (and including) root."""
+
+        out = set()
+        stack = [root] if root else []
+
+        while stack:
+            digest, _, childs = stack.pop()
+
+            if childs is not None and digest not in out:
+                out.add(digest)
+                stack.extend(childs)
+
+        return out
+
+    def retain(self, root):
+        """Drops the BDDs of all nodes not in the tree of root, returns them to be dereferenced."""
+
+        keep = self.digests(root)
+        dropped = [v for k, v in self.bdds.items() if k not in keep]
+
+        self.bdds = {k: v for k, v in self.bdds.items() if k in keep}
+
+        return dropped
+
+    def stored(self, digest):
+        """File of the node digest in the store (which may not exist yet), None without store."""
+
+        if not self.store:
+            return None
+
+        return path.join(self.store, f"{digest.hex()}.bdd")
+
+    def prune(self, max_age):
+        """Removes the stored nodes not used for max_age days, returns their number."""
+
+        if not self.store:
+            return 0
+
+        threshold = datetime.now().timestamp() - max_age * 86400
+        n_removed = 0
+
+        for x in os.listdir(self.store):
+            filename = path.join(self.store, x)
+
+            # temporary files of concurrent writers are left alone
+            if x.endswith(".bdd") and path.getmtime(filename) < threshold:
+                os.remove(filename)
+                n_removed += 1
+
+        return n_removed
+
+    def summary(self):
+        return f"{len(self.bdds)} nodes, {self.n_reused} reused, {self.n_loaded} loaded, {self.n_computed} computed"
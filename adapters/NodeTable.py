@@ -0,0 +1,42 @@
+class NodeTable:
+    """Library-independent, complement-free copy of a BDD's node DAG.
+
+    Index 0 is the false terminal, index 1 the true terminal. Every inner node
+    is stored after its children, i.e., iterating the indizes in ascending order
+    is a bottom-up traversal and iterating in descending order a top-down one.
+    """
+
+    def __init__(self, no_variables, var2level):
+        self.no_variables = no_variables
+        self.var2level = var2level
+
+        self.var = [None, None]
+        self.low = [None, None]
+        self.high = [None, None]
+
+        self.root = 0
+
+    def __len__(self):
+        return len(self.var)
+
+    def add(self, var, low, high):
+        self.var.append(var)
+        self.low.append(low)
+        self.high.append(high)
+
+        return len(self.var) - 1
+
+    def levels(self):
+        """Level of every node, terminals are placed below the last variable."""
+        n = self.no_variables
+        var2level = self.var2level
+
+        return [n, n] + [var2level[x] for x in self.var[2:]]
+
+    def level2var(self):
+        out = [0 for _ in range(0, self.no_variables)]
+
+        for var, level in enumerate(self.var2level):
+            out[level] = var
+
+        return out
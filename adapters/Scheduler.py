@@ -0,0 +1,54 @@
+from datetime import datetime
+
+class ReorderScheduler:
+    """Triggers one-shot reorderings (see dvo_once) between the conjunctions of a compilation.
+
+    Policies can be combined: reorder every k clauses, or once the live nodes
+    grew by the factor growth since the last reordering (starting from at
+    least min_nodes). Once time_cap seconds were spent reordering, no further
+    reorderings are triggered.
+    """
+
+    def __init__(self, every = None, growth = None, time_cap = None, dvo_id = None, min_nodes = 4096):
+        self.every = every
+        self.growth = growth
+        self.time_cap = time_cap
+        self.dvo_id = dvo_id
+        self.min_nodes = min_nodes
+
+        self.baseline = min_nodes
+        self.time_total = 0
+        self.events = []
+
+    def due(self, n_conjoined, live_nodes):
+
+        if self.time_cap is not None and self.time_total >= self.time_cap:
+            return False
+
+        if self.every and n_conjoined % self.every == 0:
+            return True
+
+        if self.growth and live_nodes >= self.growth * self.baseline:
+            return True
+
+        return False
+
+    def reorder(self, mgr, n_conjoined, live_nodes):
+        """Reorders once, returns the event (clause, duration, nodes before, nodes after)."""
+
+        time_start = datetime.now()
+        mgr.dvo_once(self.dvo_id)
+        duration = datetime.now() - time_start
+
+        nodes_after = mgr.live_nodes_()
+
+        self.time_total += duration.total_seconds()
+        self.baseline = max(nodes_after, self.min_nodes)
+
+        event = (n_conjoined, duration, live_nodes, nodes_after)
+        self.events.append(event)
+
+        return event
+
+    def summary(self):
+        return f"{len(self.events)} events, {self.time_total:.3f}s"
\ No newline at end of file
@@ -0,0 +1,67 @@
+import csv
+from datetime import datetime
+
+class Trace:
+    """Growth trace of a compilation, sampled every rate clauses (and after the last one).
+
+    Every "clause" row holds the number of conjoined clauses, the elapsed
+    seconds, the live nodes of the manager, and the size of the intermediate
+    result. Garbage collections and reorderings inside the library are added
+    as "gc" and "reorder" rows with their duration and the node counts before
+    and after (see Adapter_Generic.set_hooks).
+    """
+
+    columns = ["event", "clause", "elapsed", "live_nodes", "size", "duration", "nodes_before", "nodes_after"]
+
+    def __init__(self, rate = 1):
+        self.rate = max(1, rate)
+        self.rows = []
+        self.clause = 0
+
+        self.time_start = datetime.now()
+
+    def start(self):
+        self.time_start = datetime.now()
+
+    def elapsed(self):
+        return (datetime.now() - self.time_start).total_seconds()
+
+    def due(self, i, n):
+        """Whether the i-th (zero-based) of n clauses is sampled."""
+        return (i + 1) % self.rate == 0 or i + 1 == n
+
+    def record(self, clause, live_nodes, size):
+        self.rows.append(("clause", clause, f"{self.elapsed():.6f}", live_nodes, size, "", "", ""))
+
+    def event(self, event, duration, nodes_before, nodes_after):
+        self.rows.append((event, self.clause, f"{self.elapsed():.6f}", "", "", f"{duration.total_seconds():.6f}", nodes_before, nodes_after))
+
+    def mark(self):
+        return len(self.rows)
+
+    def scheduled(self, mark, duration, nodes_before, nodes_after):
+        """Records a scheduled reordering as one "scheduled-reorder" row, replacing the "reorder" rows the library's hooks added since mark."""
+
+        self.rows = self.rows[:mark] + [x for x in self.rows[mark:] if x[0] != "reorder"]
+        self.event("scheduled-reorder", duration, nodes_before, nodes_after)
+
+    def summary(self):
+        """Number and total seconds of the events per kind."""
+
+        out = {}
+
+        for row in self.rows:
+            if row[0] != "clause":
+                n, total = out.get(row[0], (0, 0))
+                out[row[0]] = (n + 1, total + float(row[5]))
+
+        return out
+
+    def write(self, filename):
+
+        with open(filename, "w", newline = "") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.columns)
+            writer.writerows(self.rows)
+
+        return filename
\ No newline at end of file
@@ -0,0 +1,214 @@
+from datetime import datetime
+
+import os
+
+from utils.IO import format_runtime
+
+import utils.Caching as Caching
+import utils.Logging as Logging
+
+from .Adapter_Generic import BudgetExceeded
+from .BDD import BDD
+
+class ZDD(BDD):
+    """Zero-suppressed DD of a CNF, i.e., the family of its configurations as sets of selected variables.
+
+    ZDDs skip variables that are off, hence sparse configuration spaces are
+    often far smaller than as BDDs. Requires a library with ZDD support
+    (CUDD). Only compilation, counting, and dumps are supported.
+    """
+
+    def __init__(self, lib, sizing = None):
+        BDD.__init__(self, lib, sizing)
+
+        if not self.mgr.supports_zdd:
+            Logging.error(Logging.highlight(lib.name), "does not support ZDDs")
+
+        self.meta["mode"] = "zdd"
+
+    def init(self, no_variables, meta = {}, order = None):
+        BDD.init(self, no_variables, meta, order)
+
+        self.mgr.zdd_init_(no_variables)
+
+        if order:
+            self.mgr.zdd_set_order(order)
+
+    def set_dvo(self, dvo_stub):
+        BDD.set_dvo(self, dvo_stub)
+
+        if self.get_dvo() != "off":
+            self.mgr.zdd_enable_dvo(self.lib.dvo_options[self.get_dvo()])
+
+    def buildFrom(self, input, order = None):
+        if input.get_stub() == "cnf":
+            self.fromCNF(input, order)
+        else:
+            raise NotImplementedError(f"\"{input.get_stub()}\"")
+
+    def fromCNFs(self, cnfs, names, order = None):
+        Logging.error("Versions are not supported for ZDDs")
+
+    def fromCNF(self, cnf, order = None):
+        """Intersects the families of the clauses, every clause the union of its literals' families."""
+
+        mgr = self.mgr
+
+        self.init(cnf.get_no_variables(), cnf.get_meta(), order)
+        self.var2desc = cnf.var2desc
+
+        if self.trace or self.scheduler or self.quantify or self.checkpoint_every:
+            Logging.warning("Traces, scheduled reorderings, quantification, and checkpoints are not supported for ZDDs")
+
+        budget = self.budget
+
+        if budget:
+            mgr.set_limits(budget["max_nodes"], budget["time_limit"], budget["max_rss"])
+
+        time_start = datetime.now()
+        time_stop = time_start
+
+        info_indent = len(str(len(cnf.clauses)))
+        log_progress = Logging.is_enabled(Logging.LL_INFO)
+
+        n_conjoined = 0
+
+        try:
+            zdd = mgr.zdd_one_()
+
+            for i, clause in enumerate(cnf.clauses):
+
+                clause_zdd = mgr.zdd_zero_()
+
+                for x in clause:
+                    y = abs(x) - self.varmod
+
+                    if x < 0:
+                        clause_zdd = mgr.zdd_union_(clause_zdd, mgr.zdd_nithvar_(y))
+                    else:
+                        clause_zdd = mgr.zdd_union_(clause_zdd, mgr.zdd_ithvar_(y))
+
+                zdd = mgr.zdd_intersect_(zdd, clause_zdd)
+                n_conjoined += 1
+
+                time_stop = datetime.now()
+
+                if log_progress:
+                    Logging.info(f"{i + 1:{info_indent}} / {len(cnf.clauses)} ({100*(i+1)/len(cnf.clauses):5.1f}%) {format_runtime(time_stop - time_start)} {clause}")
+
+                if budget:
+                    self.check_budget(time_start)
+
+        except BudgetExceeded as e:
+            time_stop = datetime.now()
+
+            self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+            self.meta["aborted"] = str(e)
+            self.meta["n_clauses_conjoined"] = n_conjoined
+
+            Logging.warning(f"Compilation aborted ({e}) after {n_conjoined} / {len(cnf.clauses)} clauses")
+
+            raise
+
+        self.meta["runtime-compilation"] = format_runtime(time_stop - time_start)
+        self.bdd = zdd
+
+#---- Nodes -------------------------------------------------------------------#
+
+    def nodes(self, zdd = None):
+        """The nodes reachable from zdd (by default the compiled one) in post-order, as {ref: (var, low, high)}, terminals as {ref: value}."""
+
+        mgr = self.mgr
+
+        if zdd is None:
+            zdd = self.bdd
+
+        out = {}
+        stack = [mgr.ref_(zdd)]
+
+        while stack:
+            ref = stack[-1]
+
+            if ref in out:
+                stack.pop()
+                continue
+
+            value = mgr.zdd_terminal_(ref)
+
+            if value is not None:
+                out[ref] = value
+                stack.pop()
+                continue
+
+            low = mgr.low_(ref)
+            high = mgr.high_(ref)
+
+            missing = [x for x in (low, high) if x not in out]
+
+            if missing:
+                stack.extend(missing)
+            else:
+                out[ref] = (mgr.var_(ref), low, high)
+                stack.pop()
+
+        return out
+
+    def satcount(self, zdd = None):
+        """Number of configurations, i.e., sets in the family."""
+
+        counts = {}
+
+        for ref, node in self.nodes(zdd).items():
+            if isinstance(node, bool):
+                counts[ref] = int(node)
+            else:
+                _, low, high = node
+                counts[ref] = counts[low] + counts[high]
+
+        return counts[self.mgr.ref_(zdd if zdd is not None else self.bdd)]
+
+    def node_table(self, bdd = None):
+        Logging.error("Analyses are not supported for ZDDs")
+
+    def dump(self, filename = None):
+        """Writes the report, nodes are listed as id var low high with 0 and 1 as terminals."""
+
+        mgr = self.mgr
+
+        if filename is None:
+            filename = Caching.get_artifact_cache(self.meta['input-name'], f"{self.lib.stub}-zdd", self.get_dvo())
+
+        Logging.info("Dumpfile:", Logging.highlight(filename))
+
+        self.meta.update({f"mgr-{k}": v for k, v in self.stats().items()})
+
+        if self.bdd is None:
+            self.dump_meta(filename)
+            return filename
+
+        nodes = self.nodes()
+
+        ids = {}
+        lines = []
+
+        for ref, node in nodes.items():
+            if isinstance(node, bool):
+                ids[ref] = int(node)
+            else:
+                var, low, high = node
+                ids[ref] = len(lines) + 2
+                lines.append(f"{ids[ref]} {var} {ids[low]} {ids[high]}")
+
+        self.meta["n_nodes"] = mgr.zdd_size_(self.bdd)
+        self.meta["n_configurations"] = self.satcount()
+        self.meta["root"] = ids[mgr.ref_(self.bdd)]
+
+        content = sorted([f"{k}:{v}" for k, v in self.meta.items()])
+        content.append("----")
+        content.extend(lines)
+
+        with open(filename, "w") as file:
+            file.write(os.linesep.join(content))
+            file.write(os.linesep)
+
+        return filename
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .BDD import BDD
+from .ZDD import ZDD
 from . import Adapter_BUDDY as BUDDY
 from . import Adapter_CUDD as CUDD
\ No newline at end of file
@@ -0,0 +1,131 @@
+#------------------------------------------------------------------------------#
+
+# Model counting on a NodeTable (see adapters/NodeTable.py).
+#
+# counts[i] is the number of models of node i over the variables on the levels
+# level(i), ..., no_variables - 1, paths[i] is the number of assignments to the
+# levels 0, ..., level(i) - 1 leading from the root to node i. Together they
+# yield the per-variable model counts in one bottom-up and one top-down pass.
+
+#------------------------------------------------------------------------------#
+
+def model_counts(table):
+    """Bottom-up pass, returns the model count of every node."""
+
+    levels = table.levels()
+    low = table.low
+    high = table.high
+
+    counts = [0, 1]
+
+    for i in range(2, len(table)):
+        lvl = levels[i]
+        lo, hi = low[i], high[i]
+
+        counts.append((counts[lo] << (levels[lo] - lvl - 1)) + (counts[hi] << (levels[hi] - lvl - 1)))
+
+    return counts
+
+def path_counts(table):
+    """Top-down pass, returns the number of root-paths (incl. skipped levels) to every node."""
+
+    levels = table.levels()
+    low = table.low
+    high = table.high
+
+    paths = [0 for _ in range(0, len(table))]
+    paths[table.root] = 1 << levels[table.root]
+
+    for i in range(len(table) - 1, 1, -1):
+        p = paths[i]
+
+        if p == 0:
+            continue
+
+        lvl = levels[i]
+        lo, hi = low[i], high[i]
+
+        paths[lo] += p << (levels[lo] - lvl - 1)
+        paths[hi] += p << (levels[hi] - lvl - 1)
+
+    return paths
+
+def satcount(table, counts = None):
+
+    if counts is None:
+        counts = model_counts(table)
+
+    return counts[table.root] << table.levels()[table.root]
+
+def variable_counts(table):
+    """Returns the total model count and, for every variable, the number of models in which it is true."""
+
+    n = table.no_variables
+    levels = table.levels()
+    low = table.low
+    high = table.high
+
+    counts = model_counts(table)
+    paths = path_counts(table)
+
+    total = counts[table.root] << levels[table.root]
+
+    # ones[l]: models with the variable on level l set to true
+    ones = [0 for _ in range(0, n)]
+
+    # Edges skipping levels contribute half of their models to every skipped
+    # level, accumulated as a difference array over the levels.
+    skipped = [0 for _ in range(0, n + 1)]
+
+    if levels[table.root] > 0:
+        skipped[0] += total >> 1
+        skipped[levels[table.root]] -= total >> 1
+
+    for i in range(2, len(table)):
+        p = paths[i]
+
+        if p == 0:
+            continue
+
+        lvl = levels[i]
+
+        for child, is_high in ((low[i], False), (high[i], True)):
+            gap = levels[child] - lvl - 1
+            models = (p * counts[child]) << gap
+
+            if is_high:
+                ones[lvl] += models
+
+            if gap > 0:
+                skipped[lvl + 1] += models >> 1
+                skipped[levels[child]] -= models >> 1
+
+    acc = 0
+    for lvl in range(0, n):
+        acc += skipped[lvl]
+        ones[lvl] += acc
+
+    level2var = table.level2var()
+
+    var_counts = [0 for _ in range(0, n)]
+    for lvl, x in enumerate(ones):
+        var_counts[level2var[lvl]] = x
+
+    return total, var_counts
+
+def commonality(table):
+    """Returns total model count, per-variable commonality, core variables, and dead variables.
+
+    Variables are identified by their (zero-based) library indizes.
+    """
+
+    total, var_counts = variable_counts(table)
+
+    if total == 0:
+        return total, [0.0 for _ in var_counts], [], list(range(0, len(var_counts)))
+
+    commonalities = [x / total for x in var_counts]
+    core = [i for i, x in enumerate(var_counts) if x == total]
+    dead = [i for i, x in enumerate(var_counts) if x == 0]
+
+    return total, commonalities, core, dead
@@ -0,0 +1,70 @@
+from itertools import product
+
+#------------------------------------------------------------------------------#
+
+# Lazy enumeration of the satisfying cubes / configurations of a NodeTable.
+# Memory is bounded by the depth of the BDD, not by the number of solutions.
+
+#------------------------------------------------------------------------------#
+
+def cubes(table):
+    """Generates the satisfying cubes (one per path to the true terminal) as dicts var -> value.
+
+    Variables not on a path are don't cares. The yielded dict is reused, copy it to keep it.
+    """
+
+    low = table.low
+    high = table.high
+    var = table.var
+
+    if table.root == 0:
+        return
+
+    cube = {}
+    path = []
+    stack = [(table.root, 0, None)]
+
+    while stack:
+        node, depth, lit = stack.pop()
+
+        while len(path) > depth:
+            del cube[path.pop()]
+
+        if lit is not None:
+            x, value = lit
+            cube[x] = value
+            path.append(x)
+
+        if node == 1:
+            yield cube
+            continue
+
+        depth = len(path)
+        x = var[node]
+
+        if low[node] != 0:
+            stack.append((low[node], depth, (x, False)))
+
+        if high[node] != 0:
+            stack.append((high[node], depth, (x, True)))
+
+def expand(cube, variables):
+    """Generates all full assignments to variables (sorted list) covered by cube, as lists of values.
+
+    The yielded list is reused, copy it to keep it.
+    """
+
+    free = [i for i, x in enumerate(variables) if x not in cube]
+    values = [cube.get(x, False) for x in variables]
+
+    for bits in product((False, True), repeat = len(free)):
+        for i, bit in zip(free, bits):
+            values[i] = bit
+
+        yield values
+
+def configurations(table, variables):
+    """Generates every satisfying assignment to variables (sorted list), which has to contain the support of table."""
+
+    for cube in cubes(table):
+        yield from expand(cube, variables)
@@ -0,0 +1,207 @@
+#------------------------------------------------------------------------------#
+
+# Decision propagation for interactive configuration: partial assignments are
+# applied to one copy of the node table by only following the edges they
+# allow, the implied literals are cached per decision prefix.
+
+#------------------------------------------------------------------------------#
+
+def reachable(table, assignment, alive = None):
+    """Indizes of the nodes reachable from the root under the partial assignment (library variable -> bool), ascending.
+
+    With alive, only edges to nodes alive[i] are followed.
+    """
+
+    var = table.var
+    low = table.low
+    high = table.high
+
+    seen = set([table.root])
+    stack = [table.root]
+
+    while stack:
+        i = stack.pop()
+
+        if i < 2:
+            continue
+
+        value = assignment.get(var[i])
+
+        if value is None:
+            childs = (low[i], high[i])
+        else:
+            childs = (high[i], ) if value else (low[i], )
+
+        for x in childs:
+            if x not in seen and (alive is None or alive[x]):
+                seen.add(x)
+                stack.append(x)
+
+    return sorted(seen)
+
+def implied_literals(table, assignment = {}):
+    """Returns the variables forced to true and forced to false by table under the partial assignment, or None if unsatisfiable.
+
+    Only the nodes reachable under the assignment are visited, i.e., the work
+    shrinks with every decision (and no restricted BDD is built). A node is
+    alive if it has a model under the assignment; a variable can be true
+    (false) iff a reachable alive node on its level has a high (low) edge to an
+    alive node, or an edge skips its level. Assigned variables are never forced.
+    """
+
+    n = table.no_variables
+    levels = table.levels()
+    var = table.var
+    low = table.low
+    high = table.high
+
+    alive = {0: False, 1: True}
+
+    for i in reachable(table, assignment):
+        if i < 2:
+            continue
+
+        value = assignment.get(var[i])
+
+        if value is None:
+            alive[i] = alive[low[i]] or alive[high[i]]
+        else:
+            alive[i] = alive[high[i]] if value else alive[low[i]]
+
+    if not alive[table.root]:
+        return None
+
+    can_true = [False for _ in range(0, n)]
+    can_false = [False for _ in range(0, n)]
+
+    skipped = [0 for _ in range(0, n + 1)]
+
+    if levels[table.root] > 0:
+        skipped[0] += 1
+        skipped[levels[table.root]] -= 1
+
+    for i in reachable(table, assignment, alive):
+        if i < 2:
+            continue
+
+        lvl = levels[i]
+        value = assignment.get(var[i])
+
+        for child, flags, edge in ((low[i], can_false, False), (high[i], can_true, True)):
+            if (value is not None and value != edge) or not alive[child]:
+                continue
+
+            flags[lvl] = True
+
+            if levels[child] - lvl > 1:
+                skipped[lvl + 1] += 1
+                skipped[levels[child]] -= 1
+
+    forced_true = []
+    forced_false = []
+
+    level2var = table.level2var()
+
+    acc = 0
+    for lvl in range(0, n):
+        acc += skipped[lvl]
+
+        if acc > 0 or (can_true[lvl] and can_false[lvl]) or level2var[lvl] in assignment:
+            continue
+
+        if can_true[lvl]:
+            forced_true.append(level2var[lvl])
+        elif can_false[lvl]:
+            forced_false.append(level2var[lvl])
+
+    return sorted(forced_true), sorted(forced_false)
+
+class Configurator:
+    """Incremental decision propagation on a compiled BDD (see BDD.configurator).
+
+    The node table of the BDD is copied once, every decision then only visits
+    the nodes reachable under the decisions (see implied_literals). Decisions
+    and implied literals are one-based, signed variable ids as in DIMACS.
+    """
+
+    def __init__(self, bdd, cache_size = 1024):
+        self.bdd = bdd
+        self.varmod = bdd.varmod
+        self.cache_size = cache_size
+
+        self.table = bdd.node_table()
+
+        self.decisions = []
+        self.cache = {(): self.compute_implied({})}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.clear()
+
+    def compute_implied(self, assignment):
+        implied = implied_literals(self.table, assignment)
+
+        if implied is None:
+            return None
+
+        forced_true, forced_false = implied
+        varmod = self.varmod
+
+        return sorted([x + varmod for x in forced_true] + [-(x + varmod) for x in forced_false], key = abs)
+
+    def implied(self):
+        """Implied literals under the current decisions (decided variables excluded), None on conflict."""
+        return self.cache[tuple(self.decisions)]
+
+    def decide(self, literal):
+        """Adds the decision literal and returns the implied literals, None if the decisions are conflicting (also with each other)."""
+
+        prefix = tuple(self.decisions)
+        extended = prefix + (literal, )
+
+        if extended not in self.cache:
+            if self.cache[prefix] is None or -literal in prefix:
+                implied = None
+            else:
+                implied = self.compute_implied(dict([(abs(x) - self.varmod, x > 0) for x in extended]))
+
+            self.evict()
+            self.cache[extended] = implied
+
+        self.decisions.append(literal)
+
+        return self.implied()
+
+    def propagate(self, literals):
+        for literal in literals:
+            self.decide(literal)
+
+        return self.implied()
+
+    def undo(self, n = 1):
+        """Retracts the last n decisions, their results stay cached."""
+
+        for _ in range(0, min(n, len(self.decisions))):
+            self.decisions.pop()
+
+        return self.implied()
+
+    def reset(self):
+        return self.undo(len(self.decisions))
+
+    def evict(self):
+        """Drops cached results not on the current decision path once the cache is full."""
+
+        if len(self.cache) < self.cache_size:
+            return
+
+        path = set([tuple(self.decisions[:i]) for i in range(0, len(self.decisions) + 1)])
+
+        for prefix in [x for x in self.cache.keys() if x not in path]:
+            del self.cache[prefix]
+
+    def clear(self):
+        self.decisions = []
+        self.cache = {(): self.cache[()]}
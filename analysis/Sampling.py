@@ -0,0 +1,84 @@
+import numpy as np
+
+#------------------------------------------------------------------------------#
+
+from analysis.Counting import model_counts
+
+#------------------------------------------------------------------------------#
+
+class Sampler:
+    """Uniform random sampling of satisfying assignments of a NodeTable.
+
+    The model counts are computed once on construction, afterwards every batch
+    of samples is drawn by descending all samples at once, level by level.
+    """
+
+    def __init__(self, table, seed = None):
+
+        n = table.no_variables
+        levels = table.levels()
+        counts = model_counts(table)
+
+        if counts[table.root] == 0:
+            raise ValueError("Cannot sample from an unsatisfiable BDD")
+
+        p_high = [0.0 for _ in range(0, len(table))]
+
+        for i in range(2, len(table)):
+            lo, hi = table.low[i], table.high[i]
+
+            mass_low = counts[lo] << (levels[lo] - levels[i] - 1)
+            mass_high = counts[hi] << (levels[hi] - levels[i] - 1)
+
+            # exact integer division, counts may exceed the range of floats
+            p_high[i] = mass_high / (mass_low + mass_high)
+
+        self.no_variables = n
+        self.root = table.root
+        self.level2var = table.level2var()
+
+        self.levels = np.array(levels, dtype = np.int64)
+        self.low = np.array([0, 0] + table.low[2:], dtype = np.int64)
+        self.high = np.array([0, 0] + table.high[2:], dtype = np.int64)
+        self.p_high = np.array(p_high, dtype = np.float64)
+
+        self.rng = np.random.default_rng(seed)
+
+    def reseed(self, seed = None):
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, k):
+        """Draws k samples, returns a (k x no_variables) boolean matrix, columns are indexed by variable."""
+
+        out = np.empty((k, self.no_variables), dtype = bool)
+        current = np.full(k, self.root, dtype = np.int64)
+
+        for lvl, var in enumerate(self.level2var):
+            decides = self.levels[current] == lvl
+
+            r = self.rng.random(k)
+            bits = np.where(decides, r < self.p_high[current], r < 0.5)
+
+            out[:, var] = bits
+            current = np.where(decides, np.where(bits, self.high[current], self.low[current]), current)
+
+        return out
+
+    def lines(self, k, varmod = 1, batch_size = 4096):
+        """Generates k samples as DIMACS-style lines ("1 -2 3 0"), drawn in batches of batch_size."""
+
+        ids = np.arange(varmod, self.no_variables + varmod)
+
+        while k > 0:
+            batch = self.sample(min(k, batch_size))
+            k -= len(batch)
+
+            for row in np.where(batch, ids, -ids):
+                yield " ".join(row.astype(str)) + " 0"
+
+    def write(self, k, filename, varmod = 1, batch_size = 4096):
+
+        with open(filename, "w") as file:
+            for line in self.lines(k, varmod, batch_size):
+                file.write(line)
+                file.write("\n")
@@ -0,0 +1,3 @@
+from . import Counting
+from . import Enumeration
+from . import Propagation
\ No newline at end of file
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+#------------------------------------------------------------------------------#
+
+import argparse
+import csv
+import glob
+import json
+
+import os
+from os import path
+
+from itertools import product
+
+#------------------------------------------------------------------------------#
+
+import config
+from ddueruem import init, quiet_compile_job, budget_from_args, sizing_from_args, schedule_from_args, quantify_from_args
+import utils.Caching as Caching
+import utils.Logging as Logging
+from utils.IO import bulk_format, timestamp
+from utils.Jobs import Job, run_all
+
+#------------------------------------------------------------------------------#
+
+CSV_COLUMNS = ["input-name", "lib", "preorder", "dynorder", "mode", "status", "runtime-wallclock", "runtime-parsing", "runtime-preodering", "runtime-compilation", "n_nodes", "n_configurations", "mgr-peak-nodes", "mgr-cache-lookups", "mgr-cache-hits", "mgr-gc-count", "mgr-gc-time", "mgr-reorder-count", "mgr-reorder-time", "reorder-scheduled", "n_subformulas", "subformula-hits", "n_quantified", "aborted", "n_clauses_conjoined", "resumed-from", "report", "trace", "error"]
+
+def collect_inputs(sources):
+    """Expands directories, glob patterns, and manifests (one model per line, # for comments) to a list of files."""
+
+    files = []
+
+    for source in sources:
+        if path.isdir(source):
+            for ext in config.INPUT_EXTENSIONS:
+                files.extend(sorted(glob.glob(path.join(source, f"*.{ext}"))))
+        elif any([x in source for x in "*?["]):
+            files.extend(sorted(glob.glob(source)))
+        elif any([source.lower().endswith(ext) for ext in config.INPUT_EXTENSIONS]):
+            files.append(source)
+        else:
+            with open(source) as file:
+                for line in file.readlines():
+                    line = line.strip()
+
+                    if line and not line.startswith("#"):
+                        files.append(path.join(path.dirname(source), line))
+
+    return files
+
+def make_jobs(files, libs, preorders, dynorders, timeout = None, memory_limit = None, budget = None, sizing = None, trace_rate = None, schedule = None, var_blocks = False, quantify = None, checkpoint = None, resume = False, modes = [config.MODE_DEFAULT]):
+
+    jobs = []
+
+    for input_file, lib, preorder, dynorder, mode in product(files, libs, preorders, dynorders, modes):
+        info = {"input-name": input_file, "lib": lib, "preorder": preorder, "dynorder": dynorder, "mode": mode}
+        jobs.append(Job(quiet_compile_job, (input_file, lib, preorder, dynorder, None, True, budget, sizing, trace_rate, schedule, var_blocks, quantify, checkpoint, resume, mode), timeout, memory_limit, info))
+
+    return jobs
+
+def write_results(results, name):
+
+    file_json, file_csv = Caching.get_batch_results(name)
+
+    with open(file_json, "w") as file:
+        json.dump(results, file, indent = 2, default = str)
+
+    with open(file_csv, "w", newline = "") as file:
+        writer = csv.DictWriter(file, fieldnames = CSV_COLUMNS, extrasaction = "ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+    return file_json, file_csv
+
+#------------------------------------------------------------------------------#
+
+def cli():
+    parser = argparse.ArgumentParser(description = bulk_format("cli_batch_desc"))
+
+    parser.add_argument("inputs", nargs = "+", help = bulk_format("cli_batch_inputs"))
+
+    parser.add_argument("--lib", nargs = "+", help = bulk_format("cli--lib"), choices = config.LIBRARY_CHOICES, type = str.lower, default = [config.LIB_DEFAULT])
+    parser.add_argument("--preorder", nargs = "+", help = bulk_format("cli--preorder"), choices = config.PREORDER_CHOICES, type = str.lower, default = [config.SVO_DEFAULT])
+    parser.add_argument("--dynorder", nargs = "+", help = bulk_format("cli--dynorder"), type = str.lower, default = [config.DVO_DEFAULT])
+    parser.add_argument("--mode", nargs = "+", help = bulk_format("cli--mode"), choices = config.MODE_CHOICES, type = str.lower, default = [config.MODE_DEFAULT])
+    parser.add_argument("--reorder-every", help = bulk_format("cli--reorder-every"), type = int, default = None)
+    parser.add_argument("--reorder-growth", help = bulk_format("cli--reorder-growth"), type = float, default = None)
+    parser.add_argument("--reorder-time-cap", help = bulk_format("cli--reorder-time-cap"), type = float, default = None)
+    parser.add_argument("--reorder-method", help = bulk_format("cli--reorder-method"), type = str.lower, default = "lib-default")
+    parser.add_argument("--var-blocks", help = bulk_format("cli--var-blocks"), dest = "var_blocks", action = "store_true", default = False)
+    parser.add_argument("--quantify", help = bulk_format("cli--quantify"), type = str, default = None)
+
+    parser.add_argument("--jobs", help = bulk_format("cli_batch--jobs"), type = int, default = os.cpu_count())
+    parser.add_argument("--timeout", help = bulk_format("cli_batch--timeout"), type = float, default = None)
+    parser.add_argument("--memory-limit", help = bulk_format("cli_batch--memory-limit"), type = int, default = None)
+    parser.add_argument("--max-nodes", help = bulk_format("cli--max-nodes"), type = int, default = None)
+    parser.add_argument("--time-limit", help = bulk_format("cli--time-limit"), type = float, default = None)
+    parser.add_argument("--max-rss", help = bulk_format("cli--max-rss"), type = int, default = None)
+    parser.add_argument("--checkpoint", help = bulk_format("cli--checkpoint"), nargs = "?", type = float, const = 600, default = None)
+    parser.add_argument("--resume", help = bulk_format("cli--resume"), dest = "resume", action = "store_true", default = False)
+    parser.add_argument("--node-table", help = bulk_format("cli--node-table"), type = int, default = None)
+    parser.add_argument("--cache-size", help = bulk_format("cli--cache-size"), type = int, default = None)
+    parser.add_argument("--min-free", help = bulk_format("cli--min-free"), type = int, default = None)
+    parser.add_argument("--max-increase", help = bulk_format("cli--max-increase"), type = int, default = None)
+    parser.add_argument("--max-memory", help = bulk_format("cli--max-memory"), type = int, default = None)
+    parser.add_argument("--auto-size", help = bulk_format("cli_batch--auto-size"), dest = "auto_size", action = "store_true", default = False)
+    parser.add_argument("--trace", help = bulk_format("cli--trace"), nargs = "?", type = int, const = 1, default = None)
+    parser.add_argument("--name", help = bulk_format("cli_batch--name"), default = None)
+
+    parser.add_argument("--silent", help = bulk_format("cli--silent"), dest = "silent", action = "store_true", default = False)
+    parser.add_argument("--report-dir", help = bulk_format("cli--report-dir"))
+    parser.add_argument("--log-dir", help = bulk_format("cli--log-dir"))
+    parser.add_argument("--cache-dir", help = bulk_format("cli--cache-dir"))
+
+    args = parser.parse_args()
+
+    # inputs are relative to the caller, init moves to the script's directory
+    inputs = [path.abspath(x) for x in args.inputs]
+
+    if args.report_dir:
+        config.REPORT_DIR = args.report_dir
+
+    if args.log_dir:
+        config.LOG_DIR = args.log_dir
+
+    if args.cache_dir:
+        config.CACHE_DIR = args.cache_dir
+
+    init(root_script = __file__, silent = args.silent)
+
+    files = collect_inputs(inputs)
+
+    memory_limit = args.memory_limit * 1024 * 1024 if args.memory_limit else None
+    # auto-sized managers share the memory among the workers
+    sizing = sizing_from_args(args, n_parallel = args.jobs)
+    jobs = make_jobs(files, args.lib, args.preorder, args.dynorder, args.timeout, memory_limit, budget_from_args(args), sizing, args.trace, schedule_from_args(args), args.var_blocks, quantify_from_args(args), args.checkpoint, args.resume, args.mode)
+
+    Logging.info("ddueruem batch", config.DDUERUEM_VERSION)
+    Logging.info("Jobs:", Logging.highlight(len(jobs)), "Workers:", Logging.highlight(args.jobs))
+
+    def on_done(job):
+        r = job.result
+        Logging.info(Logging.highlight(r["status"]), r["input-name"], r["lib"], r["preorder"], r["dynorder"], r["mode"], r["runtime-wallclock"])
+
+    results = run_all(jobs, args.jobs, on_done)
+
+    name = args.name if args.name else f"batch-{timestamp('-', '-')}"
+    file_json, file_csv = write_results(results, name)
+
+    Logging.info("Results:", Logging.highlight(file_json), Logging.highlight(file_csv))
+
+#------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    cli()
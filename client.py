@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+#------------------------------------------------------------------------------#
+
+import argparse
+import json
+
+from os import path
+import re
+
+import socket
+
+#------------------------------------------------------------------------------#
+
+import config
+
+#------------------------------------------------------------------------------#
+
+# Minimal client for server.py, kept free of the heavier ddueruem imports.
+
+#------------------------------------------------------------------------------#
+
+class Client:
+
+    def __init__(self, address = config.SERVER_ADDRESS):
+
+        if ":" in address:
+            host, port = address.rsplit(":", 1)
+            self.sock = socket.create_connection((host or config.SERVER_HOST, int(port)))
+        else:
+            # relative socket paths are relative to the server's directory
+            if not path.isabs(address):
+                address = path.join(path.dirname(path.realpath(__file__)), address)
+
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(address)
+
+        self.file = self.sock.makefile("rwb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def request(self, cmd, **kwargs):
+
+        req = dict(kwargs)
+        req["cmd"] = cmd
+
+        # the server resolves relative paths against its own directory
+        if "file" in req:
+            req["file"] = path.abspath(req["file"])
+
+        self.file.write(json.dumps(req).encode("utf-8"))
+        self.file.write(b"\n")
+        self.file.flush()
+
+        return json.loads(self.file.readline())
+
+def request(cmd, address = config.SERVER_ADDRESS, **kwargs):
+    with Client(address) as client:
+        return client.request(cmd, **kwargs)
+
+#------------------------------------------------------------------------------#
+
+def cli():
+    parser = argparse.ArgumentParser(description = "Client for the ddueruem server.")
+
+    parser.add_argument("cmd", choices = ["compile", "count", "commonality", "sample", "propagate", "drop", "list", "shutdown"])
+    parser.add_argument("file", nargs = "?", default = None)
+
+    parser.add_argument("--address", default = config.SERVER_ADDRESS)
+
+    parser.add_argument("--lib", choices = config.LIBRARY_CHOICES, type = str.lower, default = config.LIB_DEFAULT)
+    parser.add_argument("--preorder", choices = config.PREORDER_CHOICES, type = str.lower, default = config.SVO_DEFAULT)
+    parser.add_argument("--dynorder", type = str.lower, default = config.DVO_DEFAULT)
+
+    parser.add_argument("--k", type = int, default = 1, help = "number of samples")
+    parser.add_argument("--seed", type = int, default = None)
+    parser.add_argument("--literals", type = str, default = "", help = "comma-separated decisions, e.g., 3,-5")
+
+    args = parser.parse_args()
+
+    kwargs = {}
+
+    if args.file:
+        kwargs.update({"file": args.file, "lib": args.lib, "preorder": args.preorder, "dynorder": args.dynorder})
+
+    if args.cmd == "sample":
+        kwargs["k"] = args.k
+
+        if args.seed is not None:
+            kwargs["seed"] = args.seed
+
+    if args.cmd == "propagate":
+        kwargs["literals"] = [int(x) for x in re.split(r",", args.literals) if x.strip()]
+
+    out = request(args.cmd, args.address, **kwargs)
+
+    if args.cmd == "sample" and out["status"] == "ok":
+        print("\n".join(out["samples"]))
+    else:
+        print(json.dumps(out, indent = 2))
+
+#------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    cli()
@@ -1,5 +1,7 @@
 DDUERUEM_VERSION = "v2021-08"
 
+LOCALE          = "en"
+
 LIB_DEFAULT     = "buddy"
 PARSER_DEFAULT  = "auto"
 SVO_DEFAULT     = "off"
@@ -10,10 +12,33 @@ CACHE_DIR   = "_cache"
 LOG_DIR     = "_log"
 REPORT_DIR  = "_reports"
 
+# Portfolio: lib:preorder:dynorder
+PORTFOLIO_DEFAULT = ["buddy:off:off", "buddy:force:off", "cudd:off:sift", "cudd:force:sift", "cudd:force:off"]
+
+# Order racing: initial budgets of every candidate (grow every round), FORCE seeds
+RACE_NODES_DEFAULT  = 10000
+RACE_TIME_DEFAULT   = 1.0
+RACE_SEEDS_DEFAULT  = 4
+
+# Conjunction tree store (see --incremental): days after which unused nodes are removed
+TREE_STORE_MAX_AGE = 30
+
+# Server
+SERVER_ADDRESS      = "_cache/ddueruem.sock"
+# host of addresses given as :port, only local clients
+SERVER_HOST         = "127.0.0.1"
+SERVER_MAX_RESIDENT = 16
+
+# Inputs recognized in directories (batch mode)
+INPUT_EXTENSIONS = ["dimacs", "uvl"]
+
 # CLI choices
-PREORDER_CHOICES    = ["off", "random", "force", "force-triage"]
+PREORDER_CHOICES    = ["off", "random", "force", "force-triage", "race"]
+
+PARSER_CHOICES      = ["dimacs", "uvl"]
 
-PARSER_CHOICES      = ["dimacs"]
+MODE_CHOICES        = ["bdd", "zdd"]
+MODE_DEFAULT        = "bdd"
 
 LOGLEVEL_CHOICES     = ["LL_OFF", "LL_ERROR", "LL_WARNING", "LL_INFO", "LL_ALL"]
 LL_VOLATILE_DEFAULT = 3     # LL_INFO
@@ -2,32 +2,38 @@
 
 #------------------------------------------------------------------------------#
 
-import argparse             
 from datetime import datetime
 
+time_startup = datetime.now()
+
+import argparse             
+import json
+
 import os
 from os import path
 
-from pprint import pprint
-
 import re
 
-from termcolor import cprint
-
 #------------------------------------------------------------------------------#
 
 import config
 import utils.Caching as Caching
+from utils.InputFormats import merge
 
 # FIXME
-from utils.IO import bulk_format, format_runtime
+from utils.IO import basename, bulk_format, format_runtime
 
 import utils.Logging as Logging
+import utils.Portfolio as Portfolio
+import utils.Racing as Racing
 
 from adapters import Adapters
+from adapters.Adapter_Generic import BudgetExceeded
 
-from parsers import DIMACS_Parser
+from parsers import DIMACS_Parser, UVL_Parser
 from svo import SVOutils as SVO
+from svo import Blocks
+from svo import Metrics
 
 #------------------------------------------------------------------------------#
 
@@ -45,7 +51,7 @@ def parsing(input_file, flag_parser = None):
 
     return expr
 
-def ordering(expr, flag_preorder):
+def ordering(expr, flag_preorder, cache_order = True):
 
     time_start = datetime.now()
     
@@ -54,6 +60,15 @@ def ordering(expr, flag_preorder):
         pass
     elif flag_preorder == "random":
         order = SVO.compute_random_order(expr)
+    elif flag_preorder == "race":
+        # raced orders are only cached by the race itself (see --race)
+        Logging.warning("No raced order cached (see --race), keeping the order of the input")
+        expr.meta["runtime-preodering"] = format_runtime(datetime.now() - time_start)
+
+        return order
+    elif expr.get_stub() != "cnf":
+        # feature models come with the pre-order of their feature tree
+        Logging.warning(f"Preorder {flag_preorder} requires a CNF, keeping the order of the input")
     else:
         preorder = SVO.select_svo(flag_preorder)
         Logging.info("SVO:", Logging.highlight(preorder.name()))
@@ -61,30 +76,183 @@ def ordering(expr, flag_preorder):
         with preorder(flag_preorder) as svo:
             order = svo.run(expr, order)
             if svo.provides_clause_ordering():
-                expr.clauses = svo.order_clauses(expr.clauses, order)
+                expr.clauses = svo.order_clauses(expr, order)
 
     time_stop = datetime.now()
     expr.meta["runtime-preodering"] = format_runtime(time_stop-time_start)
 
+    if not cache_order:
+        return order
+
     cachefile = Caching.get_order_cache(expr.meta["input-name"], flag_preorder)
     content = []
     content.append(f"input-name:{expr.meta['input-name']}")
     content.append(f"input-hash:{expr.meta['input-hash']}")
     content.append(f"order:{','.join([str(x) for x in order])}")
 
-    with open(cachefile, "w") as file:
-        file.write(os.linesep.join(content))
+    # parallel jobs on the same input read the cache meanwhile
+    Caching.write_atomic(cachefile, os.linesep.join(content))
+
+    return order
+
+def versioning(expr, input_file, version_files, flag_parser = None):
+    """Parses the versions of input_file and aligns their variables by name.
+
+    Returns the CNF of all clauses (for ordering), the renumbered CNFs, and
+    the names of their roots (see BDD.fromCNFs).
+    """
+
+    files = [input_file] + version_files
+
+    if len(set([path.abspath(x) for x in files])) < len(files):
+        Logging.error("Versions have to be distinct files")
+    exprs = [expr] + [parsing(x, flag_parser) for x in version_files]
+
+    if any([x.get_stub() != "cnf" for x in exprs]):
+        Logging.error("Versions require CNF inputs")
+
+    names = [basename(x) for x in files]
+
+    if len(set(names)) < len(names):
+        names = files
+
+    merged, cnfs = merge(exprs, f"{path.splitext(input_file)[0]}-roots")
+
+    Logging.info("Versions:", Logging.highlight(len(cnfs)), "sharing", Logging.highlight(merged.get_no_variables()), "variables")
+
+    return merged, cnfs, names
+
+def get_order(expr, input_file, flag_preorder, use_cached_order = True, cache_order = True):
+
+    order = None
+
+    if use_cached_order and Caching.order_cache_exists(input_file, flag_preorder):
+        order = Caching.read_order_cache(input_file, flag_preorder)
+
+    if order:
+        Logging.info("Using cached variable order:", Logging.highlight(order))
+    else:
+        order = ordering(expr, flag_preorder, cache_order)
+        Logging.info("Preordering time:", Logging.highlight(expr.meta["runtime-preodering"]))
 
     return order
 
-def init(root_script = __file__, log_level = None, silent = False, no_log = False):
+def grouping(expr, order):
+    """Derives the variable groups from expr's clauses or feature tree, returns them and order with every group clustered."""
+
+    if expr.get_stub() == "fm":
+        groups = Blocks.groups_from_fm(expr)
+    elif expr.get_stub() == "cnf":
+        groups = Blocks.groups_from_clauses(expr.clauses, expr.get_no_variables())
+    else:
+        groups = []
+
+    Logging.info("Variable groups:", Logging.highlight(len(groups)), "covering", Logging.highlight(sum([len(x) for x in groups])), "variables")
+
+    return groups, Blocks.cluster_order(order, groups)
+
+def scoring(expr, order):
+    """Logs the static metrics of order (see svo.Metrics) and returns them, prefixed with order-."""
+
+    if expr.get_stub() not in ["cnf", "ast"]:
+        Logging.error("Scoring orders requires a CNF or formulas, not", Logging.highlight(expr.get_stub()))
+
+    time_start = datetime.now()
+    try:
+        if expr.get_stub() == "cnf":
+            scores = Metrics.score_index(expr.get_index(), order)
+        else:
+            scores = Metrics.score(Metrics.hyperedges(expr), order)
+    except ValueError as ve:
+        Logging.error("Cannot score the order:", ve)
+    time_stop = datetime.now()
+
+    for k, v in scores.items():
+        Logging.info(f"Order {k}:", Logging.highlight(f"{v:.2f}" if isinstance(v, float) else v))
+
+    out = {f"order-{k}": v for k, v in scores.items()}
+    out["runtime-scoring"] = format_runtime(time_stop - time_start)
+
+    return out
+
+def build(input_file, lib_stub = config.LIB_DEFAULT, flag_parser = None, flag_preorder = config.SVO_DEFAULT, flag_dynorder = config.DVO_DEFAULT, use_cached_order = True, budget = None, sizing = None, trace_rate = None, schedule = None, var_blocks = False, quantify = None, checkpoint = None, resume = False, mode = config.MODE_DEFAULT):
+    """Parses, orders, and compiles input_file. The returned BDD has to be closed by the caller.
+
+    If a budget (see BDD.set_budget) is exceeded, the returned BDD is aborted (see BDD.is_aborted).
+    The manager is sized according to sizing (see Adapters.make_sizing), trace_rate enables the growth trace,
+    schedule the explicit reordering (see BDD.set_reorder_schedule), var_blocks the variable blocks,
+    quantify the variables to project away (see BDD.set_quantify), checkpoint and resume the
+    checkpointing (see BDD.set_checkpoints). With mode zdd, a ZDD is compiled instead.
+    """
+
+    t, lib = Adapters.get_lib(lib_stub, mode)
+
+    expr = parsing(input_file, flag_parser)
+    order = get_order(expr, input_file, flag_preorder, use_cached_order)
+
+    groups = None
+
+    if var_blocks:
+        groups, order = grouping(expr, order)
+
+    bdd = t(lib, Adapters.make_sizing(lib, expr, sizing))
+
+    # the caller only closes a returned BDD, e.g., the server keeps running after failed builds
+    try:
+        bdd.set_dvo(flag_dynorder)
+
+        if budget:
+            bdd.set_budget(**budget)
+
+        bdd.set_trace(trace_rate)
+
+        if schedule:
+            bdd.set_reorder_schedule(**schedule)
+
+        if groups:
+            bdd.set_var_groups(groups)
+
+        if quantify:
+            bdd.set_quantify(quantify)
+
+        bdd.set_checkpoints(checkpoint, resume, flag_preorder)
+
+        bdd.buildFrom(expr, order)
+    except BudgetExceeded:
+        pass
+    except (Exception, SystemExit):
+        bdd.mgr.exit()
+        raise
+
+    return bdd
+
+def compile_job(input_file, lib_stub, flag_preorder, flag_dynorder, flag_parser = None, use_cached_order = True, budget = None, sizing = None, trace_rate = None, schedule = None, var_blocks = False, quantify = None, checkpoint = None, resume = False, mode = config.MODE_DEFAULT):
+    """Compiles input_file and writes its report (named after all settings), returns the report's meta data."""
+
+    with build(input_file, lib_stub, flag_parser, flag_preorder, flag_dynorder, use_cached_order, budget, sizing, trace_rate, schedule, var_blocks, quantify, checkpoint, resume, mode) as bdd:
+        stub = lib_stub if mode == "bdd" else f"{lib_stub}-{mode}"
+        filename = bdd.dump(Caching.get_artifact_cache(input_file, stub, flag_dynorder, flag_preorder))
+
+        out = dict(bdd.meta)
+        out["report"] = filename
+
+        if bdd.is_aborted():
+            out["status"] = "aborted"
+
+    return out
+
+def quiet_compile_job(*args):
+    """compile_job without any logging, used in worker processes whose output would interleave."""
+
+    Logging.init(Logging.LL_OFF, Logging.LL_OFF, Logging.get_logger().machine)
+
+    return compile_job(*args)
+
+def init(root_script = __file__, log_level = None, silent = False, no_log = False, machine = False):
 
     # move to directory of the executed script
     os.chdir(os.path.dirname(os.path.realpath(root_script)))
 
-    log_dir = config.LOG_DIR
-    verify_create(log_dir)
-
     if not log_level:
         ll_vol = config.LL_VOLATILE_DEFAULT
         ll_per = config.LL_PERSISTENT_DEFAULT
@@ -98,7 +266,11 @@ def init(root_script = __file__, log_level = None, silent = False, no_log = Fals
     if no_log:
         ll_per = 0 # LL_OFF
 
-    Logging.init(ll_vol, ll_per)
+    Logging.init(ll_vol, ll_per, machine)
+
+    # log files are only created on the first write, after this call
+    log_dir = config.LOG_DIR
+    verify_create(log_dir)
 
     # verify existence of the folders cache & report
     cache_dir = config.CACHE_DIR
@@ -110,17 +282,14 @@ def init(root_script = __file__, log_level = None, silent = False, no_log = Fals
 def verify_create(dir):
     """Creates the directory dir if it does not already exist."""
 
-    if not path.exists(dir):
-        try:
-            os.mkdir(dir)
-        except OSError as ose:
-            Logging.error("error_create_directory_failed", Logging.highlight(dir))
-        else:
-            pass
-            Logging.log("info_create_directory", Logging.highlight(path.abspath(dir)))
-    else:
-        pass
+    try:
+        os.mkdir(dir)
+    except FileExistsError:
         Logging.log("info_use_directory", Logging.highlight(path.abspath(dir)))
+    except OSError as ose:
+        Logging.error("error_create_directory_failed", Logging.highlight(dir))
+    else:
+        Logging.log("info_create_directory", Logging.highlight(path.abspath(dir)))
 
 ### TODO: Move to parsers directory utility class
 def select_parser(input_file, parser = None):
@@ -128,13 +297,71 @@ def select_parser(input_file, parser = None):
     if not parser or parser == "auto":
         if input_file.lower().endswith("dimacs"):
             return DIMACS_Parser
+        elif input_file.lower().endswith("uvl"):
+            return UVL_Parser
         else:
             Logging.error("Could not auto-detect input file format, please manually select the correct parser")
     elif parser == "dimacs":
         return DIMACS_Parser
+    elif parser == "uvl":
+        return UVL_Parser
     else:
         Logging.error("Unknown parser", Logging.highlight(parser))
 
+def budget_from_args(args):
+    max_rss = args.max_rss * 1024 * 1024 if args.max_rss else None
+
+    return {"max_nodes": args.max_nodes, "time_limit": args.time_limit, "max_rss": max_rss}
+
+def sizing_from_args(args, n_parallel = 1):
+    """Manager sizing from the cli, None if neither set nor auto-tuned (library defaults)."""
+
+    max_memory = args.max_memory * 1024 * 1024 if args.max_memory else None
+
+    sizing = {"node_table": args.node_table, "cache_size": args.cache_size, "min_free": args.min_free, "max_increase": args.max_increase, "max_memory": max_memory}
+
+    if args.auto_size:
+        sizing["auto"] = n_parallel
+    elif all([x is None for x in sizing.values()]):
+        return None
+
+    return sizing
+
+def schedule_from_args(args):
+    """Explicit reordering from the cli, None if no policy triggers reorderings."""
+
+    if not (args.reorder_every or args.reorder_growth):
+        return None
+
+    return {"every": args.reorder_every, "growth": args.reorder_growth, "time_cap": args.reorder_time_cap, "method": args.reorder_method}
+
+def quantify_from_args(args):
+    """Variables to quantify during compilation from the cli, None if not set."""
+
+    if not args.quantify:
+        return None
+
+    return re.split(r",", args.quantify)
+
+def portfolio(args):
+
+    stubs = args.portfolio if args.portfolio else config.PORTFOLIO_DEFAULT
+    configurations = [Portfolio.parse_configuration(x) for x in stubs]
+
+    Logging.info("Input:", Logging.highlight(args.file))
+    Logging.info("Portfolio:", Logging.highlight(", ".join(stubs)))
+
+    result = Portfolio.run(args.file, configurations, args.portfolio_deadline, args.use_cached_portfolio)
+
+    if result is None:
+        Logging.error("No configuration of the portfolio succeeded")
+
+    Logging.info("Winner:", Logging.highlight(Portfolio.format_configuration(result)))
+    Logging.info("Dumpfile:", Logging.highlight(result["report"]))
+
+    if args.machine:
+        print(json.dumps(result, default = str))
+
 def cli():    
     parser = argparse.ArgumentParser(description=bulk_format("cli_desc"))
     parser.add_argument("file", help = bulk_format("cli_file"))
@@ -142,16 +369,57 @@ def cli():
     # Run Options
     parser.add_argument("--lib", help = bulk_format("cli--lib"), choices = config.LIBRARY_CHOICES, type = str.lower, default = config.LIB_DEFAULT)
     parser.add_argument("--parser", help = bulk_format("cli--parser"), choices = config.PARSER_CHOICES, type = str.lower, default = None)
-    # parser.add_argument("--mode", help = bulk_format("cli--mode"), choices = config.MODE_CHOICES, type = str.lower, default = config.MODE_DEFAULT)
+    parser.add_argument("--versions", help = bulk_format("cli--versions"), nargs = "+", default = None)
+    parser.add_argument("--incremental", help = bulk_format("cli--incremental"), nargs = "?", type = int, const = 8, default = None)
+    parser.add_argument("--mode", help = bulk_format("cli--mode"), choices = config.MODE_CHOICES, type = str.lower, default = config.MODE_DEFAULT)
 
     # Variable Ordering
     parser.add_argument("--preorder", help = bulk_format("cli--preorder"), choices = config.PREORDER_CHOICES, type = str.lower, default = config.SVO_DEFAULT)
     parser.add_argument("--dynorder", help = bulk_format("cli--dynorder"), type = str.lower, default = config.DVO_DEFAULT)
+    parser.add_argument("--reorder-every", help = bulk_format("cli--reorder-every"), type = int, default = None)
+    parser.add_argument("--reorder-growth", help = bulk_format("cli--reorder-growth"), type = float, default = None)
+    parser.add_argument("--reorder-time-cap", help = bulk_format("cli--reorder-time-cap"), type = float, default = None)
+    parser.add_argument("--reorder-method", help = bulk_format("cli--reorder-method"), type = str.lower, default = "lib-default")
+    parser.add_argument("--var-blocks", help = bulk_format("cli--var-blocks"), dest = "var_blocks", action = "store_true", default = False)
+    parser.add_argument("--quantify", help = bulk_format("cli--quantify"), type = str, default = None)
+    parser.add_argument("--race", help = bulk_format("cli--race"), nargs = "?", type = int, const = config.RACE_NODES_DEFAULT, default = None)
+    parser.add_argument("--race-seeds", help = bulk_format("cli--race-seeds"), type = int, default = config.RACE_SEEDS_DEFAULT)
+    parser.add_argument("--score-order", help = bulk_format("cli--score-order"), dest = "score_order", action = "store_true", default = False)
+
+    # Analyses
+    parser.add_argument("--commonality", help = bulk_format("cli--commonality"), dest = "commonality", action = "store_true", default = False)
+    parser.add_argument("--sample", help = bulk_format("cli--sample"), type = int, default = 0)
+    parser.add_argument("--seed", help = bulk_format("cli--seed"), type = int, default = None)
+    parser.add_argument("--enumerate", help = bulk_format("cli--enumerate"), dest = "enumerate", action = "store_true", default = False)
+    parser.add_argument("--cubes", help = bulk_format("cli--cubes"), dest = "cubes", action = "store_true", default = False)
+    parser.add_argument("--project", help = bulk_format("cli--project"), type = str, default = None)
     
     # IO Toggles
     parser.add_argument("--log-level", help = bulk_format("cli--log-level"), choices = config.LOGLEVEL_CHOICES, type = str, default = None)
     parser.add_argument("--silent", help = bulk_format("cli--silent"), dest = "silent", action = "store_true", default = False)
     parser.add_argument("--no-log", help = bulk_format("cli--no-log"), dest = "no_log", action = "store_true", default = False)
+    parser.add_argument("--machine", help = bulk_format("cli--machine"), dest = "machine", action = "store_true", default = False)
+    parser.add_argument("--trace", help = bulk_format("cli--trace"), nargs = "?", type = int, const = 1, default = None)
+
+    # Budgets
+    parser.add_argument("--max-nodes", help = bulk_format("cli--max-nodes"), type = int, default = None)
+    parser.add_argument("--time-limit", help = bulk_format("cli--time-limit"), type = float, default = None)
+    parser.add_argument("--max-rss", help = bulk_format("cli--max-rss"), type = int, default = None)
+    parser.add_argument("--checkpoint", help = bulk_format("cli--checkpoint"), nargs = "?", type = float, const = 600, default = None)
+    parser.add_argument("--resume", help = bulk_format("cli--resume"), dest = "resume", action = "store_true", default = False)
+
+    # Manager Sizing
+    parser.add_argument("--node-table", help = bulk_format("cli--node-table"), type = int, default = None)
+    parser.add_argument("--cache-size", help = bulk_format("cli--cache-size"), type = int, default = None)
+    parser.add_argument("--min-free", help = bulk_format("cli--min-free"), type = int, default = None)
+    parser.add_argument("--max-increase", help = bulk_format("cli--max-increase"), type = int, default = None)
+    parser.add_argument("--max-memory", help = bulk_format("cli--max-memory"), type = int, default = None)
+    parser.add_argument("--auto-size", help = bulk_format("cli--auto-size"), dest = "auto_size", action = "store_true", default = False)
+
+    # Portfolio
+    parser.add_argument("--portfolio", help = bulk_format("cli--portfolio"), nargs = "*", type = str.lower, default = None)
+    parser.add_argument("--portfolio-deadline", help = bulk_format("cli--portfolio-deadline"), type = float, default = None)
+    parser.add_argument("--ignore-cached-portfolio", help = bulk_format("cli--ignore-cached-portfolio"), dest = "use_cached_portfolio", action = "store_false", default = True)
 
     # Caching Toggles    
     parser.add_argument("--ignore-cached-order", help = bulk_format("cli--ignore-cached-order"), dest = "use_cached_order", action = "store_false", default = True)
@@ -176,27 +444,31 @@ def cli():
     if args.log_level:
         log_level = config.LOGLEVEL_CHOICES.index(args.log_level)
 
-    init(log_level = log_level, silent = args.silent, no_log = args.no_log)
+    if args.machine:
+        args.silent = True
+        args.no_log = True
+
+    init(log_level = log_level, silent = args.silent, no_log = args.no_log, machine = args.machine)
+
+    runtime_startup = format_runtime(datetime.now() - time_startup)
 
     Logging.info("ddueruem", config.DDUERUEM_VERSION)
     Logging.vspace()
 
-    ### Library
+    # forks before any library is loaded
+    if args.portfolio is not None:
+        portfolio(args)
+        return
 
-    t,lib = Adapters.get_lib(args.lib)
+    ### Library
 
-    kc_engine = t(lib)
-    kc_engine.say_hi()
+    t,lib = Adapters.get_lib(args.lib, args.mode)
 
     dvo = args.dynorder
 
     if dvo == "help":
-        kc_engine.list_available_dvo_options()
+        Adapters.list_dvo_options(lib)
         exit()
-    else:
-        kc_engine.set_dvo(dvo)
-
-    Logging.vspace()
 
     input_file = args.file
 
@@ -213,21 +485,122 @@ def cli():
 
     Logging.vspace()
 
-    if args.use_cached_order and Caching.order_cache_exists(input_file, args.preorder):
-        order = Caching.read_order_cache(input_file, args.preorder)
-        Logging.info("Using cached variable order:", Logging.highlight(order))
+    versions = None
+
+    if args.versions:
+        # the order is computed for all versions together, hence never cached
+        expr, versions, names = versioning(expr, input_file, args.versions, args.parser)
+        order = get_order(expr, expr.meta["input-name"], args.preorder, False, False)
     else:
-        order = ordering(expr, args.preorder)
-        Logging.info("Preordering time:", Logging.highlight(expr.meta["runtime-preodering"]))
+        order = get_order(expr, input_file, args.preorder, args.use_cached_order)
+
+    race = args.race
+
+    # a raced order is requested but not cached yet
+    if args.preorder == "race" and not race and not (args.use_cached_order and Caching.order_cache_exists(input_file, "race")) and not versions:
+        race = config.RACE_NODES_DEFAULT
+
+    if race:
+        if versions or expr.get_stub() != "cnf":
+            Logging.warning("Racing orders requires a single CNF, keeping the order")
+        else:
+            order = Racing.run(expr, order, args.lib, args.mode, dvo, race, args.race_seeds, args.seed)
+            Logging.info("Race winner:", Logging.highlight(expr.meta["race-winner"]), "after", Logging.highlight(expr.meta["race-rounds"]), "rounds in", Logging.highlight(expr.meta["runtime-racing"]))
+
+    groups = None
+
+    if args.var_blocks:
+        groups, order = grouping(expr, order)
+
+    Logging.vspace()
+
+    if args.score_order:
+        scores = scoring(expr, order)
+
+        if args.machine:
+            print(json.dumps(dict(scores, order = order), default = str))
 
+        return
+
+    # the manager is sized after the input
+    kc_engine = t(lib, Adapters.make_sizing(lib, expr, sizing_from_args(args)))
+    kc_engine.say_hi()
+    kc_engine.set_dvo(dvo)
+
+    Logging.info("Manager sizing:", Logging.highlight(kc_engine.meta["mgr-sizing"]))
     Logging.vspace()
 
     with kc_engine as bdd:
-        bdd.buildFrom(expr, order)
+        bdd.meta["runtime-startup"] = runtime_startup
+        bdd.set_budget(**budget_from_args(args))
+        bdd.set_trace(args.trace)
+
+        schedule = schedule_from_args(args)
+
+        if schedule:
+            bdd.set_reorder_schedule(**schedule)
+
+        if groups:
+            bdd.set_var_groups(groups)
+
+        if args.incremental:
+            bdd.set_incremental(args.incremental)
+
+        quantify = quantify_from_args(args)
+
+        if quantify:
+            bdd.set_quantify(quantify)
+
+        bdd.set_checkpoints(args.checkpoint, args.resume, "race" if race else args.preorder)
+
+        try:
+            if versions:
+                bdd.fromCNFs(versions, names, order)
+            else:
+                bdd.buildFrom(expr, order)
+        except BudgetExceeded:
+            # the manager is released when leaving the with block
+            filename_bdd = bdd.dump()
+
+            if args.machine:
+                print(json.dumps(dict(bdd.meta, report = filename_bdd), default = str))
+
+            return
+
         Logging.info("Compilation time:", Logging.highlight(bdd.meta["runtime-compilation"]))
 
+        if versions:
+            Logging.info("Roots:", Logging.highlight(bdd.meta["roots"]), "Shared nodes:", Logging.highlight(bdd.meta["roots-shared-nodes"]))
+
+            for a, b, added, removed in bdd.compare_roots():
+                if added == 0 and removed == 0:
+                    Logging.info(f"{a} -> {b}:", Logging.highlight("equivalent"))
+                else:
+                    Logging.info(f"{a} -> {b}:", Logging.highlight(f"+{added}"), "added", Logging.highlight(f"-{removed}"), "removed configurations")
+
+        if args.commonality:
+            total, _, core, dead = bdd.commonality()
+            Logging.info("Configurations:", Logging.highlight(total))
+            Logging.info("Core features:", Logging.highlight(len(core)), "Dead features:", Logging.highlight(len(dead)))
+            Logging.info("Analysis time:", Logging.highlight(bdd.meta["runtime-analysis"]))
+
+        if args.sample > 0:
+            bdd.sample(args.sample, seed = args.seed)
+            Logging.info("Sampling time:", Logging.highlight(bdd.meta["runtime-sampling"]))
+
+        if args.enumerate:
+            features = None
+            if args.project:
+                features = re.split(r",", args.project)
+
+            bdd.enumerate(features = features, as_cubes = args.cubes)
+            Logging.info("Enumerated:", Logging.highlight(bdd.meta["n_enumerated"]), "in", Logging.highlight(bdd.meta["runtime-enumeration"]))
+
         filename_bdd = bdd.dump()
 
+        if args.machine:
+            print(json.dumps(dict(bdd.meta, report = filename_bdd), default = str))
+
 #------------------------------------------------------------------------------#
 
 if __name__ == "__main__":
@@ -0,0 +1,247 @@
+import re
+
+#------------------------------------------------------------------------------#
+
+import utils.Logging as Logging
+
+from utils.InputFormats import FM
+from utils.IO import hash_hex
+
+#------------------------------------------------------------------------------#
+
+# Parser for the Universal Variability Language (UVL), covering the feature
+# tree (mandatory, optional, alternative, or, and [n..m] groups, attributes
+# are skipped) and propositional constraints (!, &, |, =>, <=>).
+#
+# Features are numbered in pre-order of the feature tree, which keeps every
+# subtree contiguous and serves as natural variable order.
+#
+# FM.expr_fd is the root feature, every feature is a tuple (var, groups) and
+# every group a tuple (kind, features), with kind in mandatory, optional,
+# alternative, or, or (lo, hi) for cardinalities. FM.expr_ctcs are ASTs
+# (op, [childs]) with op in not, and, or, impl, iff, leafs are (negated)
+# variables.
+
+#------------------------------------------------------------------------------#
+
+group_kinds = ["mandatory", "optional", "alternative", "or"]
+
+# ordered by ascending precedence
+binary_ops = [("<=>", "iff"), ("=>", "impl"), ("|", "or"), ("&", "and")]
+
+token_pattern = re.compile(r"\s*(<=>|=>|[!&|()]|\"[^\"]*\"|[\w.]+)")
+
+def tokenize(content):
+    """Splits a constraint into tokens, None if it contains unsupported characters."""
+
+    tokens = []
+    pos = 0
+
+    while pos < len(content):
+        m = token_pattern.match(content, pos)
+
+        if m is None:
+            if content[pos:].strip():
+                return None
+
+            break
+
+        tokens.append(m[1])
+        pos = m.end()
+
+    return tokens
+
+class UVL_Parser:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return
+
+    def name(self):
+        return "uvl"
+
+    def parse(self, filename):
+
+        with open(filename) as file:
+            lines = file.readlines()
+
+        self.desc2var = {}
+        self.var2desc = {}
+
+        section = None
+        stack = []
+        root = None
+
+        ctc_lines = []
+
+        for i, line in enumerate(lines):
+            line = line.rstrip()
+            content = line.strip()
+
+            if not content or content.startswith("//"):
+                continue
+
+            # section headers are not indented
+            if not line[0].isspace():
+                section = re.split(r"\s+", content)[0]
+                continue
+
+            if section == "features":
+                indent = len(line) - len(line.lstrip())
+
+                while stack and stack[-1][0] >= indent:
+                    stack.pop()
+
+                kind = self.parse_group_kind(content)
+
+                if kind is not None:
+                    if not stack or stack[-1][1] != "feature":
+                        Logging.error(f"{filename}:{i + 1}: group without parent feature")
+
+                    group = (kind, [])
+                    stack[-1][2][1].append(group)
+                    stack.append((indent, "group", group))
+                else:
+                    feature = (self.add_feature(content), [])
+
+                    if not stack:
+                        if root is not None:
+                            Logging.error(f"{filename}:{i + 1}: second root feature")
+
+                        root = feature
+                    elif stack[-1][1] != "group":
+                        Logging.error(f"{filename}:{i + 1}: feature without group")
+                    else:
+                        stack[-1][2][1].append(feature)
+
+                    stack.append((indent, "feature", feature))
+
+            elif section == "constraints":
+                ctc_lines.append((i + 1, content))
+
+        if root is None:
+            Logging.error(f"{filename}: no features")
+
+        n_features = len(self.var2desc)
+
+        ctcs = []
+
+        for i, content in ctc_lines:
+            self.tokens = tokenize(content)
+
+            if self.tokens is None:
+                Logging.error(f"{filename}:{i}: unsupported constraint", Logging.highlight(content))
+
+            self.pos = 0
+            ctcs.append(self.parse_expr(0))
+
+            if self.pos != len(self.tokens):
+                Logging.error(f"{filename}:{i}: unexpected", Logging.highlight(self.tokens[self.pos]))
+
+        if len(self.var2desc) > n_features:
+            Logging.warning(f"{len(self.var2desc) - n_features} features only occur in constraints")
+
+        meta = {
+            "input-name": filename,
+            "input-hash": hash_hex(filename),
+            "n_vars": len(self.var2desc),
+            "n_ctcs": len(ctcs)
+        }
+
+        return FM(root, ctcs, self.var2desc, meta)
+
+    def parse_group_kind(self, content):
+
+        if content in group_kinds:
+            return content
+
+        m = re.match(r"^\[\s*(?P<lo>\d+)\s*(\.\.\s*(?P<hi>\d+|\*)\s*)?\]$", content)
+
+        if m is None:
+            return None
+
+        lo = int(m["lo"])
+
+        if m["hi"] is None:
+            hi = lo
+        elif m["hi"] == "*":
+            hi = None
+        else:
+            hi = int(m["hi"])
+
+        return (lo, hi)
+
+    def add_feature(self, desc):
+
+        # drop attributes and quotes
+        desc = re.sub(r"\{.*\}", "", desc).strip().strip("\"")
+
+        if desc not in self.desc2var:
+            var = len(self.desc2var) + 1
+            self.desc2var[desc] = var
+            self.var2desc[var] = desc
+
+        return self.desc2var[desc]
+
+#---- Constraints -------------------------------------------------------------#
+
+    def parse_expr(self, level):
+        """Precedence climbing over binary_ops, implications are right-associative."""
+
+        if level == len(binary_ops):
+            return self.parse_unary()
+
+        symbol, op = binary_ops[level]
+
+        childs = [self.parse_expr(level + 1)]
+
+        while self.pos < len(self.tokens) and self.tokens[self.pos] == symbol:
+            self.pos += 1
+
+            if op == "impl":
+                return (op, [childs[0], self.parse_expr(level)])
+
+            childs.append(self.parse_expr(level + 1))
+
+        if len(childs) == 1:
+            return childs[0]
+
+        if op == "iff":
+            out = childs[0]
+            for x in childs[1:]:
+                out = (op, [out, x])
+            return out
+
+        return (op, childs)
+
+    def parse_unary(self):
+
+        if self.pos >= len(self.tokens):
+            Logging.error("Unexpected end of constraint")
+
+        token = self.tokens[self.pos]
+        self.pos += 1
+
+        if token == "!":
+            x = self.parse_unary()
+
+            if isinstance(x, int):
+                return -x
+
+            return ("not", [x])
+
+        if token == "(":
+            x = self.parse_expr(0)
+
+            if self.pos >= len(self.tokens) or self.tokens[self.pos] != ")":
+                Logging.error("Missing closing parenthesis")
+
+            self.pos += 1
+            return x
+
+        if token in [")", "&", "|", "=>", "<=>"]:
+            Logging.error("Unexpected", Logging.highlight(token))
+
+        return self.add_feature(token)
\ No newline at end of file
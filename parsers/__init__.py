@@ -1 +1,2 @@
-from .DIMACS_Parser import DIMACS_Parser
\ No newline at end of file
+from .DIMACS_Parser import DIMACS_Parser
+from .UVL_Parser import UVL_Parser
\ No newline at end of file
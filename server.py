@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+#------------------------------------------------------------------------------#
+
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+import json
+
+import os
+from os import path
+
+import socketserver
+
+#------------------------------------------------------------------------------#
+
+import config
+from ddueruem import init, build
+import utils.Logging as Logging
+from utils.IO import bulk_format, format_runtime, hash_hex
+
+from analysis import Counting
+
+#------------------------------------------------------------------------------#
+
+# Long-lived compile/query server. Libraries stay loaded and compiled BDDs stay
+# resident, keyed by the hash of the input and the compilation settings.
+#
+# Protocol: one JSON object per line and request, answered by one JSON object
+# per line. Every request has a "cmd" and (except for "list" and "shutdown")
+# the model settings "file", "lib", "preorder", and "dynorder".
+#
+# BuDDy keeps its state in globals, hence at most one BuDDy BDD is resident.
+
+#------------------------------------------------------------------------------#
+
+class Resident:
+
+    def __init__(self, bdd):
+        self.bdd = bdd
+        self.sampler = None
+        self.configurator = None
+        self.total = None
+
+    def close(self):
+        if self.configurator:
+            self.configurator.clear()
+
+        self.bdd.__exit__()
+
+class Session:
+
+    def __init__(self, max_resident = config.SERVER_MAX_RESIDENT):
+        self.max_resident = max_resident
+        self.residents = OrderedDict()
+        self.running = True
+
+    def key(self, req):
+        return "-".join([hash_hex(req["file"]), req["lib"], req["preorder"], req["dynorder"]])
+
+    def get(self, req):
+
+        key = self.key(req)
+
+        if key in self.residents:
+            self.residents.move_to_end(key)
+            return key, self.residents[key]
+
+        if req["lib"] == "buddy":
+            for k in [k for k, x in self.residents.items() if x.bdd.lib.stub == "buddy"]:
+                self.drop(k)
+
+        while len(self.residents) >= self.max_resident:
+            self.drop(next(iter(self.residents)))
+
+        bdd = build(req["file"], req["lib"], req.get("parser"), req["preorder"], req["dynorder"])
+
+        self.residents[key] = Resident(bdd)
+
+        return key, self.residents[key]
+
+    def drop(self, key):
+        if key in self.residents:
+            self.residents.pop(key).close()
+
+    def close(self):
+        for key in list(self.residents.keys()):
+            self.drop(key)
+
+#---- Commands ----------------------------------------------------------------#
+
+def cmd_compile(session, req):
+    key, resident = session.get(req)
+
+    return {"key": key, "meta": resident.bdd.meta}
+
+def cmd_count(session, req):
+    _, resident = session.get(req)
+
+    if resident.total is None:
+        resident.total = Counting.satcount(resident.bdd.node_table())
+
+    # JSON numbers cannot hold arbitrary precision
+    return {"n_configurations": str(resident.total)}
+
+def cmd_commonality(session, req):
+    _, resident = session.get(req)
+
+    total, commonalities, core, dead = resident.bdd.commonality()
+    resident.total = total
+
+    return {"n_configurations": str(total), "commonality": commonalities, "core": core, "dead": dead}
+
+def cmd_sample(session, req):
+    _, resident = session.get(req)
+
+    if resident.sampler is None:
+        resident.sampler = resident.bdd.sampler()
+
+    if "seed" in req:
+        resident.sampler.reseed(req["seed"])
+
+    return {"samples": list(resident.sampler.lines(int(req.get("k", 1)), varmod = resident.bdd.varmod))}
+
+def cmd_propagate(session, req):
+    _, resident = session.get(req)
+
+    if resident.configurator is None:
+        resident.configurator = resident.bdd.configurator()
+
+    configurator = resident.configurator
+    configurator.reset()
+
+    return {"implied": configurator.propagate([int(x) for x in req.get("literals", [])])}
+
+def cmd_drop(session, req):
+    session.drop(session.key(req))
+    return {}
+
+def cmd_list(session, req):
+    return {"resident": list(session.residents.keys())}
+
+def cmd_shutdown(session, req):
+    session.running = False
+    return {}
+
+commands = {
+    "compile": cmd_compile,
+    "count": cmd_count,
+    "commonality": cmd_commonality,
+    "sample": cmd_sample,
+    "propagate": cmd_propagate,
+    "drop": cmd_drop,
+    "list": cmd_list,
+    "shutdown": cmd_shutdown
+}
+
+def defaults(req):
+    req.setdefault("lib", config.LIB_DEFAULT)
+    req.setdefault("preorder", config.SVO_DEFAULT)
+    req.setdefault("dynorder", config.DVO_DEFAULT)
+
+    return req
+
+def dispatch(session, req):
+
+    time_start = datetime.now()
+
+    try:
+        cmd = req.get("cmd")
+
+        if cmd not in commands:
+            raise NotImplementedError(f"Unknown command \"{cmd}\"")
+
+        out = commands[cmd](session, defaults(req))
+        out["status"] = "ok"
+    # Logging.error exits on failure, which must not take the server down
+    except (Exception, SystemExit) as e:
+        out = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    time_stop = datetime.now()
+    out["runtime-request"] = format_runtime(time_stop - time_start)
+
+    return out
+
+#---- Transport ---------------------------------------------------------------#
+
+class Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        session = self.server.session
+
+        for line in self.rfile:
+            try:
+                req = json.loads(line)
+            except json.JSONDecodeError as e:
+                out = {"status": "error", "error": f"Malformed request: {e}"}
+            else:
+                Logging.info("Request:", Logging.highlight(req.get("cmd")))
+                out = dispatch(session, req)
+
+            self.wfile.write(json.dumps(out).encode("utf-8"))
+            self.wfile.write(b"\n")
+            self.wfile.flush()
+
+            if not session.running:
+                break
+
+def make_server(address):
+    """address is either [host]:port or the path of a Unix socket."""
+
+    if ":" in address:
+        host, port = address.rsplit(":", 1)
+        return socketserver.TCPServer((host or config.SERVER_HOST, int(port)), Handler)
+
+    if path.exists(address):
+        os.remove(address)
+
+    return socketserver.UnixStreamServer(address, Handler)
+
+def serve(address = config.SERVER_ADDRESS, max_resident = config.SERVER_MAX_RESIDENT):
+
+    session = Session(max_resident)
+
+    with make_server(address) as server:
+        server.session = session
+        Logging.info("Listening on", Logging.highlight(address))
+
+        try:
+            while session.running:
+                server.handle_request()
+        finally:
+            session.close()
+
+            if ":" not in address and path.exists(address):
+                os.remove(address)
+
+    Logging.info("Server stopped")
+
+#------------------------------------------------------------------------------#
+
+def cli():
+    parser = argparse.ArgumentParser(description = bulk_format("cli_server_desc"))
+
+    parser.add_argument("--address", help = bulk_format("cli_server--address"), default = config.SERVER_ADDRESS)
+    parser.add_argument("--max-resident", help = bulk_format("cli_server--max-resident"), type = int, default = config.SERVER_MAX_RESIDENT)
+
+    parser.add_argument("--silent", help = bulk_format("cli--silent"), dest = "silent", action = "store_true", default = False)
+    parser.add_argument("--no-log", help = bulk_format("cli--no-log"), dest = "no_log", action = "store_true", default = False)
+
+    args = parser.parse_args()
+
+    init(root_script = __file__, silent = args.silent, no_log = args.no_log)
+
+    Logging.info("ddueruem server", config.DDUERUEM_VERSION)
+
+    serve(args.address, args.max_resident)
+
+#------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,135 @@
+from itertools import combinations
+
+#------------------------------------------------------------------------------#
+
+# Variable blocks: groups of related variables that reordering moves as a
+# whole (see BDD.set_var_groups). Groups are derived from the clauses:
+#
+# - coupled pairs, i.e., the binary clauses (x v y) and (-x v -y), which
+#   covers equivalences a <-> b (mandatory features, Tseitin variables)
+# - alternative groups, i.e., a clause (-p v c1 v ... v ck) whose childs are
+#   pairwise exclusive by binary clauses (-ci v -cj), together with p
+#
+# For feature models, every feature is grouped with its mandatory childs and
+# with its alternative groups.
+#
+# Blocks have to be contiguous in the variable order, cluster_order moves the
+# members of every group next to each other.
+
+#------------------------------------------------------------------------------#
+
+def find(parent, x):
+
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+
+    return x
+
+def union(parent, x, y):
+    parent[find(parent, x)] = find(parent, y)
+
+def collect(parent, no_variables):
+    """Returns the sets of the union-find forest parent with at least two variables."""
+
+    groups = {}
+
+    for x in range(1, no_variables + 1):
+        groups.setdefault(find(parent, x), []).append(x)
+
+    return [x for x in groups.values() if len(x) > 1]
+
+def groups_from_clauses(clauses, no_variables):
+    """Returns the groups (sorted lists of one-based variables, at least two each) derived from the clauses."""
+
+    parent = list(range(0, no_variables + 1))
+
+    binary = set([tuple(sorted(x, key = abs)) for x in clauses if len(x) == 2])
+
+    for x, y in binary:
+        if (-x, -y) in binary:
+            union(parent, abs(x), abs(y))
+
+    for clause in clauses:
+        neg = [x for x in clause if x < 0]
+        pos = [x for x in clause if x > 0]
+
+        if len(neg) != 1 or len(pos) < 2:
+            continue
+
+        if all([tuple(sorted((-x, -y), key = abs)) in binary for x, y in combinations(pos, 2)]):
+            for x in pos:
+                union(parent, -neg[0], x)
+
+    return collect(parent, no_variables)
+
+def groups_from_fm(fm):
+    """Returns the groups derived from the feature tree of fm, see groups_from_clauses."""
+
+    no_variables = fm.get_no_variables()
+    parent = list(range(0, no_variables + 1))
+
+    stack = [fm.expr_fd]
+
+    while stack:
+        var, groups = stack.pop()
+
+        for kind, childs in groups:
+            if kind in ["mandatory", "alternative"]:
+                for x, _ in childs:
+                    union(parent, var, x)
+
+            stack.extend(childs)
+
+    return collect(parent, no_variables)
+
+def cluster_order(order, groups):
+    """Moves the members of every group to the position of the group's first member in order."""
+
+    group_of = {}
+
+    for i, group in enumerate(groups):
+        for x in group:
+            group_of[x] = i
+
+    members = {}
+
+    for x in order:
+        if x in group_of:
+            members.setdefault(group_of[x], []).append(x)
+
+    out = []
+
+    for x in order:
+        if x not in group_of:
+            out.append(x)
+        elif members[group_of[x]][0] == x:
+            out.extend(members[group_of[x]])
+
+    return out
+
+def blocks(groups, order):
+    """Splits the groups into runs of variables adjacent in order, runs of a single variable are dropped."""
+
+    group_of = {}
+
+    for i, group in enumerate(groups):
+        for x in group:
+            group_of[x] = i
+
+    out = []
+    run = []
+
+    for x in order:
+        if run and x in group_of and group_of[x] == group_of.get(run[-1]):
+            run.append(x)
+        else:
+            if len(run) > 1:
+                out.append(run)
+
+            run = [x]
+
+    if len(run) > 1:
+        out.append(run)
+
+    return out
\ No newline at end of file
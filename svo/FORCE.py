@@ -3,6 +3,8 @@ from random import shuffle
 from copy import copy
 from utils.Logging import log
 
+from svo.Metrics import positions
+
 class FORCE:
 
     @staticmethod
@@ -31,55 +33,52 @@ class FORCE:
     def provides_clause_ordering(self):
         return True
 
-    def order_clauses(self, clauses, order):
-        
-        spans = []
+    def order_clauses(self, cnf, order):
+        """Returns the clauses of cnf sorted ascending by their span in order."""
 
-        for clause in clauses:
-            spans.append((clause, force_compute_span([clause], order)))
+        index = cnf.get_index()
+        pos = positions(order)
 
-        spans = sorted(spans, key = lambda x : x[1])
+        spans = [clause_span(index, pos, i) for i in range(0, index.n_clauses)]
 
-        return [x for x, _ in spans]
+        return [cnf.clauses[i] for i in sorted(range(0, index.n_clauses), key = lambda i: spans[i])]
 
 ### FORCE (Aloul et al.)
 
 def force(cnf, time_limit = 60, order = None):
-    clauses = cnf.clauses
+    index = cnf.get_index()
+
+    if order is None:
+        order = list(range(1, index.no_variables + 1))
 
     log("[FORCE] Start")
     log("--------------------------------")
     
-    span = force_compute_span(clauses, order)
+    span = force_compute_span(index, order)
     log(f"Span: {span}")
 
     now = datetime.now()
 
     while datetime.now() - now < timedelta(seconds = time_limit):
-        cogs_v = {}
         span_old = span
 
-        for i, clause in enumerate(clauses):
-            cogs = force_compute_cog(clause, order)
+        pos = positions(order)
+        cogs_v = [0] * (index.no_variables + 1)
+
+        for i in range(0, index.n_clauses):
+            clause = index.clause_vars(i)
+            cog = sum([pos[x] for x in clause]) / len(clause)
 
             for x in clause:
-                x = abs(x)
-                if x in cogs_v:
-                    a,b = cogs_v[x]
-                    cogs_v[x] = (a+cogs, b+1)
-                else:
-                    cogs_v[x] = (cogs, 1)
-
-        tlocs = []
-        for key, value in cogs_v.items():
-            center, n = value
-            tlocs.append((key, center / n))
+                cogs_v[x] += cog
 
+        # variables without clauses are dropped
+        tlocs = [(x, cogs_v[x] / index.degrees[x]) for x in index.variables]
         tlocs = sorted(tlocs, key = lambda x: x[1])
 
         order = [x[0] for x in tlocs]
 
-        span = force_compute_span(clauses, order)
+        span = force_compute_span(index, order)
         log(f"Span: {span}")
 
 
@@ -90,26 +89,17 @@ def force(cnf, time_limit = 60, order = None):
     log("[FORCE] End")
     return (order, span)
 
+def clause_span(index, pos, i):
+    clause = [pos[x] for x in index.clause_vars(i)]
 
-def force_compute_cog(clause, order):
-
-    cog = sum([order.index(abs(x)) for x in clause])
-
-    return cog / len(clause)
-
-
-def force_compute_span(clauses, order):
-
-    span = []
-    for clause in clauses:
-        lspan = 0
+    return max(clause) - min(clause)
 
-        indizes = [order.index(abs(x)) for x in clause]
-        lspan = max(indizes) - min(indizes)
+def force_compute_span(index, order):
+    """Sum of the spans of all clauses of index (see CNF.get_index) in order."""
 
-        span.append(lspan)
+    pos = positions(order)
 
-    return sum(span)
+    return sum([clause_span(index, pos, i) for i in range(0, index.n_clauses)])
 
 def force_triage(cnf, n1 = 8, order = None):
 
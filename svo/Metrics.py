@@ -0,0 +1,135 @@
+from array import array
+
+#------------------------------------------------------------------------------#
+
+from utils.InputFormats import support
+
+#------------------------------------------------------------------------------#
+
+# Static quality metrics of a variable order, cheap enough to rank candidate
+# orders before compiling any of them. All metrics are computed in one pass
+# over the clauses, flattened into arrays (see flatten, or CNF.get_index for
+# CNFs), with the position of every variable in an array instead of
+# order.index:
+#
+# - span: sum of the clauses' spreads (max - min position), as in FORCE
+# - spread-max, spread-avg: maximum and average spread of a clause
+# - cut-width: maximum number of clauses crossing a cut between two adjacent
+#   positions
+# - bandwidth, profile: of the primal graph (variables adjacent if they share
+#   a clause), i.e., the maximum distance of adjacent variables and the sum
+#   of the distances of every variable to its earliest neighbor
+#
+# Lower is better for all of them.
+
+#------------------------------------------------------------------------------#
+
+METRICS = ["span", "spread-max", "spread-avg", "cut-width", "bandwidth", "profile"]
+
+def flatten(clauses):
+    """Returns the variables of all clauses as one array and the offsets of the clauses into it (clause i is lits[offsets[i]:offsets[i+1]])."""
+
+    lits = array("l")
+    offsets = array("l", [0])
+
+    for clause in clauses:
+        lits.extend([abs(x) for x in clause])
+        offsets.append(len(lits))
+
+    return lits, offsets
+
+def positions(order):
+    """Returns the position of every (one-based) variable in order, -1 for variables not in order."""
+
+    pos = array("l", [-1]) * (max(order, default = 0) + 1)
+
+    for i, x in enumerate(order):
+        pos[x] = i
+
+    return pos
+
+def score(clauses, order):
+    """Returns the metrics of order for clauses (see METRICS) as a dict."""
+
+    lits, offsets = flatten(clauses)
+
+    return score_flat(lits, offsets, order)
+
+def score_flat(lits, offsets, order):
+    """Like score, for clauses flattened by flatten. Raises ValueError if a variable of the clauses is not in order."""
+
+    pos = positions(order)
+
+    missing = sorted([x for x in set(lits) if x >= len(pos) or pos[x] < 0])
+
+    if missing:
+        raise ValueError(f"Order misses variables {missing}")
+    n = len(order)
+    n_clauses = len(offsets) - 1
+
+    # crossings[i] - crossings[i+1] clauses end between positions i and i+1
+    crossings = array("l", [0]) * (n + 1)
+    # earliest position of a neighbor (or the variable itself)
+    first = array("l", range(0, n))
+
+    span = 0
+    spread_max = 0
+
+    for i in range(0, n_clauses):
+        clause = [pos[x] for x in lits[offsets[i]:offsets[i + 1]]]
+
+        if not clause:
+            continue
+
+        lo = min(clause)
+        hi = max(clause)
+
+        span += hi - lo
+        spread_max = max(spread_max, hi - lo)
+
+        crossings[lo] += 1
+        crossings[hi] -= 1
+
+        for p in clause:
+            if lo < first[p]:
+                first[p] = lo
+
+    cut_width = 0
+    crossing = 0
+
+    for i in range(0, n):
+        crossing += crossings[i]
+        cut_width = max(cut_width, crossing)
+
+    return {
+        "span": span,
+        "spread-max": spread_max,
+        "spread-avg": span / n_clauses if n_clauses else 0,
+        "cut-width": cut_width,
+        # the farthest neighbors of a variable share the clause spreading most
+        "bandwidth": spread_max,
+        "profile": sum([i - first[i] for i in range(0, n)])
+    }
+
+def score_index(index, order):
+    """Like score, for the clauses of a CNFIndex."""
+    return score_flat(index.vars, index.offsets, order)
+
+def rank(clauses, orders, metric = "span"):
+    """Returns the indices of orders sorted ascending by metric, together with the scores of all orders."""
+
+    lits, offsets = flatten(clauses)
+    scores = [score_flat(lits, offsets, x) for x in orders]
+
+    return sorted(range(0, len(orders)), key = lambda i: scores[i][metric]), scores
+
+def hyperedges(expr):
+    """The variables of every clause of a CNF, or of every formula of an AST."""
+
+    if expr.get_stub() == "cnf":
+        return expr.clauses
+
+    if expr.get_stub() == "ast":
+        return [support(x) for x in expr.clauses]
+
+    raise NotImplementedError(f"\"{expr.get_stub()}\"")
\ No newline at end of file
@@ -11,6 +11,43 @@ def compute_random_order(expr):
 
     return order
 
+def complete_order(order, no_variables):
+    """Appends the variables missing in order (e.g., those without clauses) in ascending order."""
+
+    missing = set(range(1, no_variables + 1)) - set(order)
+
+    return order + sorted(missing)
+
+def compute_cuthill_mckee_order(expr):
+    """Reverse Cuthill-McKee order of the primal graph of expr's clauses, every component from a variable of minimum degree."""
+
+    index = expr.get_index()
+    n = index.no_variables
+
+    order = []
+    visited = [False] * (n + 1)
+
+    for start in sorted(range(1, n + 1), key = index.primal_degree):
+        if visited[start]:
+            continue
+
+        visited[start] = True
+        queue = [start]
+        i = 0
+
+        while i < len(queue):
+            x = queue[i]
+            i += 1
+
+            for y in sorted(index.neighbors(x), key = index.primal_degree):
+                if not visited[y]:
+                    visited[y] = True
+                    queue.append(y)
+
+        order.extend(queue)
+
+    return list(reversed(order))
+
 def select_svo(stub):
     if stub == "off":
         return None
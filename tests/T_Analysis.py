@@ -0,0 +1,94 @@
+from itertools import product
+
+from adapters import Adapters
+from parsers.DIMACS_Parser import DIMACS_Parser
+import utils.Logging as Logging
+
+Logging.init(Logging.LL_OFF, Logging.LL_OFF)
+
+with DIMACS_Parser() as parser:
+    cnf = parser.parse("examples/sandwich.dimacs")
+
+n = cnf.get_no_variables()
+
+def satisfies(config, clauses):
+    return all([any([(x > 0) == config[abs(x)] for x in clause]) for clause in clauses])
+
+# brute force over all assignments, config[v] is the value of variable v
+models = []
+
+for bits in product([False, True], repeat = n):
+    config = (None, ) + bits
+
+    if satisfies(config, cnf.clauses):
+        models.append(config)
+
+assert len(models) == 2808
+
+t, lib = Adapters.get_lib("cudd")
+
+with t(lib) as bdd:
+    bdd.buildFrom(cnf)
+
+    assert bdd.satcount() == 2808
+
+    #---- Commonality ----#
+
+    total, commonalities, core, dead = bdd.commonality()
+
+    assert total == 2808
+
+    for v in range(1, n + 1):
+        count = len([x for x in models if x[v]])
+
+        assert abs(commonalities[v] - count / total) < 1e-9
+        assert (v in core) == (count == total)
+        assert (v in dead) == (count == 0)
+
+    #---- Enumeration ----#
+
+    configs = [tuple(sorted(x, key = abs)) for x in bdd.configurations()]
+
+    assert len(configs) == len(set(configs)) == 2808
+    assert set(configs) == set([tuple([v if x[v] else -v for v in range(1, n + 1)]) for x in models])
+
+    #---- Sampling ----#
+
+    samples = bdd.sampler(seed = 0).sample(1000)
+
+    for row in samples:
+        config = [None] * (n + 1)
+
+        for v in range(1, n + 1):
+            config[v] = bool(row[v - bdd.varmod])
+
+        assert satisfies(config, cnf.clauses)
+
+    #---- Propagation ----#
+
+    with bdd.configurator() as configurator:
+        implied = configurator.implied()
+
+        assert set([x for x in implied if x > 0]) == set(core)
+        assert set([-x for x in implied if x < 0]) == set(dead)
+
+        free = [v for v in range(1, n + 1) if v not in core and v not in dead]
+
+        # deciding the free variables one after another, implied literals hold in every remaining model
+        remaining = models
+
+        for v in free:
+            implied = configurator.decide(v)
+
+            if implied is None:
+                assert not [x for x in remaining if x[v]]
+                break
+
+            remaining = [x for x in remaining if x[v]]
+
+            for x in implied:
+                assert all([m[abs(x)] == (x > 0) for m in remaining])
+
+        # the root feature is core
+        configurator.reset()
+        assert configurator.decide(-core[0]) is None
@@ -0,0 +1,105 @@
+from svo import Metrics
+from svo.Blocks import groups_from_clauses
+from svo.FORCE import force, force_compute_span
+from utils.CNFIndex import CNFIndex
+from utils.InputFormats import CNF
+from parsers.DIMACS_Parser import DIMACS_Parser
+import utils.Logging as Logging
+
+Logging.init(Logging.LL_OFF, Logging.LL_OFF)
+
+#---- CNFIndex ----#
+
+clauses = [[1, -2], [2, 3], [-1, 3, 4]]
+index = CNFIndex(clauses, 5)
+
+assert list(index.clause(2)) == [-1, 3, 4]
+assert list(index.clause_vars(0)) == [1, 2]
+assert list(index.literal_occurrences(3)) == [1, 2]
+assert list(index.literal_occurrences(-1)) == [2]
+assert list(index.occurrences(1)) == [0, 2]
+assert list(index.degrees) == [0, 2, 2, 2, 1, 0]
+assert index.variables == [1, 2, 3, 4]
+assert index.last_occurrence(2) == 1
+assert index.last_occurrence(5) == -1
+assert sorted(index.neighbors(1)) == [2, 3, 4]
+assert sorted(index.neighbors(4)) == [1, 3]
+assert index.primal_degree(5) == 0
+
+#---- Metrics ----#
+
+scores = Metrics.score(clauses, [1, 2, 3, 4])
+
+assert scores["span"] == 5
+assert scores["spread-max"] == 3
+assert abs(scores["spread-avg"] - 5 / 3) < 1e-9
+assert scores["cut-width"] == 2
+assert scores["bandwidth"] == 3
+assert scores["profile"] == 6
+
+assert Metrics.score_index(index, [1, 2, 3, 4]) == scores
+assert Metrics.score(clauses, [3, 4, 1, 2])["span"] == 6
+
+try:
+    Metrics.score(clauses, [1, 2, 3])
+    assert False
+except ValueError:
+    pass
+
+ranked, _ = Metrics.rank(clauses, [[3, 4, 1, 2], [1, 2, 3, 4]])
+assert ranked == [1, 0]
+
+#---- FORCE ----#
+
+def force_naive(clauses, order):
+    """FORCE on lists, as before the CNFIndex."""
+
+    def compute_span(order):
+        return sum([max([order.index(abs(x)) for x in c]) - min([order.index(abs(x)) for x in c]) for c in clauses])
+
+    span = compute_span(order)
+
+    while True:
+        span_old = span
+
+        cogs = {}
+
+        for clause in clauses:
+            cog = sum([order.index(abs(x)) for x in clause]) / len(clause)
+
+            for x in clause:
+                x = abs(x)
+                n, total = cogs.get(x, (0, 0))
+                cogs[x] = (n + 1, total + cog)
+
+        variables = []
+
+        for clause in clauses:
+            for x in clause:
+                if abs(x) not in variables:
+                    variables.append(abs(x))
+
+        order = sorted(variables, key = lambda x: cogs[x][1] / cogs[x][0])
+        span = compute_span(order)
+
+        if span == span_old:
+            break
+
+    return order, span
+
+with DIMACS_Parser() as parser:
+    cnf = parser.parse("examples/sandwich.dimacs")
+
+start = list(range(1, cnf.get_no_variables() + 1))
+order, span = force(cnf, order = start)
+
+assert (order, span) == force_naive(cnf.clauses, start)
+assert span == force_compute_span(cnf.get_index(), order) == Metrics.score(cnf.clauses, order)["span"]
+assert span <= force_compute_span(cnf.get_index(), start)
+
+#---- Blocks ----#
+
+# 1 <-> 2 and the alternative group 3 -> (4 | 5) with 4, 5 exclusive
+groups = groups_from_clauses([[1, -2], [-1, 2], [-3, 4, 5], [-4, -5], [1, 6, 7]], 7)
+
+assert sorted(groups) == [[1, 2], [3, 4, 5]]
@@ -2,13 +2,33 @@ from utils.InputFormats import CNF
 from parsers.DIMACS_Parser import DIMACS_Parser
 from parsers.UVL_Parser import UVL_Parser
 
-with DIMACS_Parser("examples/sandwich.dimacs") as parser:
-    cnf = parser.parse()
+with DIMACS_Parser() as parser:
+    cnf = parser.parse("examples/sandwich.dimacs")
 
-test1 = "(Sandwich) ∧ (Vegetables ∨ ¬Cucumber) ∧ (Vegetables ∨ ¬Tomatoes) ∧ (Vegetables ∨ ¬Lettuce) ∧ (Cheese ∨ ¬Gouda) ∧ (Cheese ∨ ¬Cheddar) ∧ (Cheese ∨ ¬Cream) ∧ (Sandwich0 ∨ ¬SandwichSandwich) ∧ (Sandwich0 ∨ ¬SandwichVegetables) ∧ (Sandwich0 ∨ ¬SandwichCucumber) ∧ (SandwichSandwich ∨ SandwichVegetables ∨ SandwichCucumber ∨ ¬Sandwich0) ∧ (¬SandwichSandwich ∨ ¬SandwichVegetables) ∧ (¬SandwichSandwich ∨ ¬SandwichCucumber) ∧ (¬SandwichVegetables ∨ ¬SandwichCucumber) ∧ (SandwichTomatoes ∨ ¬SandwichLettuce) ∧ (SandwichTomatoes ∨ ¬SandwichCheese) ∧ (SandwichTomatoes ∨ ¬SandwichGouda) ∧ (SandwichLettuce ∨ SandwichCheese ∨ SandwichGouda ∨ ¬SandwichTomatoes) ∧ (Sandwich ∨ ¬Sandwich0) ∧ (Sandwich ∨ ¬Cheese) ∧ (Sandwich ∨ ¬SandwichTomatoes) ∧ (Sandwich ∨ ¬Vegetables) ∧ (Sandwich0 ∨ ¬Sandwich) ∧ (Gouda ∨ ¬SandwichCheddar) ∧ (Gouda ∨ ¬SandwichCream) ∧ (SandwichCheddar ∨ SandwichCream ∨ ¬Gouda) ∧ (¬SandwichCheddar ∨ ¬SandwichCream)"
+test1 = "(Flatbread0) ∧ (Vegetables ∨ ¬Cucumber) ∧ (Vegetables ∨ ¬FlatbreadSalami) ∧ (Vegetables ∨ ¬FlatbreadFlatbread) ∧ (Cheese ∨ ¬FlatbreadCucumber) ∧ (¬Cheddar ∨ Cheese) ∧ (Cheese ∨ ¬FlatbreadMeat) ∧ (¬Full ∨ Bread) ∧ (¬Flatbread ∨ Bread) ∧ (Bread ∨ ¬FlatbreadVegetables) ∧ (Flatbread ∨ Full ∨ ¬Bread ∨ FlatbreadVegetables) ∧ (¬Flatbread ∨ ¬Full) ∧ (¬Full ∨ ¬FlatbreadVegetables) ∧ (¬Flatbread ∨ ¬FlatbreadVegetables) ∧ (¬Salami ∨ Meat) ∧ (Meat ∨ ¬FlatbreadCheddar) ∧ (Meat ∨ ¬FlatbreadFull) ∧ (Salami ∨ ¬Meat ∨ FlatbreadCheddar ∨ FlatbreadFull) ∧ (¬Bread ∨ Flatbread0) ∧ (¬Cheese ∨ Flatbread0) ∧ (¬Meat ∨ Flatbread0) ∧ (¬Vegetables ∨ Flatbread0) ∧ (Bread ∨ ¬Flatbread0) ∧ (FlatbreadCucumber ∨ ¬FlatbreadBread) ∧ (¬FlatbreadCheese ∨ FlatbreadCucumber) ∧ (FlatbreadCheese ∨ ¬FlatbreadCucumber ∨ FlatbreadBread) ∧ (¬FlatbreadCheese ∨ ¬FlatbreadBread)"
 assert cnf.verbose() == test1
 
-with UVL_Parser("examples/cerf.uvl") as parser:
-    fm = parser.parse()
+with UVL_Parser() as parser:
+    fm = parser.parse("examples/cerf.uvl")
 
-print(fm.computer_erc())
\ No newline at end of file
+print(fm.computer_erc())
+
+from adapters import Adapters
+import utils.Logging as Logging
+
+Logging.init(Logging.LL_OFF, Logging.LL_OFF)
+
+t, lib = Adapters.get_lib("cudd")
+
+with UVL_Parser() as parser:
+    fm = parser.parse("examples/sandwich.uvl")
+
+with t(lib) as bdd:
+    bdd.buildFrom(cnf)
+    n_cnf = bdd.satcount()
+
+with t(lib) as bdd:
+    bdd.buildFrom(fm)
+    n_fm = bdd.satcount()
+
+assert n_cnf == n_fm == 2808
\ No newline at end of file
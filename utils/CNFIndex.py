@@ -0,0 +1,123 @@
+from array import array
+
+#------------------------------------------------------------------------------#
+
+# Index of a CNF shared by the ordering heuristics (see CNF.get_index), built
+# once per list of clauses. All lists are arrays in CSR form, i.e., a flat
+# array of entries and an array of offsets into it:
+#
+# - clauses: lits[offsets[i]:offsets[i+1]] are the literals of clause i,
+#   vars the same as variables
+# - occurrences: occ[occ_offsets[j]:occ_offsets[j+1]] are the clauses of
+#   literal j (2v for v, 2v+1 for -v), in ascending order
+# - primal graph: adj[adj_offsets[v]:adj_offsets[v+1]] are the variables
+#   sharing a clause with v
+#
+# Variables are one-based, entry 0 of every per-variable array is unused.
+
+#------------------------------------------------------------------------------#
+
+def lit_id(x):
+    return 2 * abs(x) + (1 if x < 0 else 0)
+
+class CNFIndex:
+
+    def __init__(self, clauses, no_variables):
+        self.clauses = clauses
+
+        n = max([no_variables] + [abs(x) for clause in clauses for x in clause])
+
+        self.no_variables = n
+        self.n_clauses = len(clauses)
+
+        #---- Clauses ----#
+
+        self.lits = array("l")
+        self.offsets = array("l", [0])
+
+        for clause in clauses:
+            self.lits.extend(clause)
+            self.offsets.append(len(self.lits))
+
+        self.vars = array("l", [abs(x) for x in self.lits])
+
+        #---- Occurrences ----#
+
+        counts = array("l", [0]) * (2 * n + 3)
+
+        for x in self.lits:
+            counts[lit_id(x) + 1] += 1
+
+        for j in range(1, len(counts)):
+            counts[j] += counts[j - 1]
+
+        self.occ_offsets = counts
+        self.occ = array("l", [0]) * len(self.lits)
+
+        fill = array("l", self.occ_offsets)
+
+        for i in range(0, self.n_clauses):
+            for x in self.lits[self.offsets[i]:self.offsets[i + 1]]:
+                self.occ[fill[lit_id(x)]] = i
+                fill[lit_id(x)] += 1
+
+        self.degrees = array("l", [0]) * (n + 1)
+
+        for v in range(1, n + 1):
+            self.degrees[v] = self.occ_offsets[2 * v + 2] - self.occ_offsets[2 * v]
+
+        # variables in the order of their first occurrence
+        self.variables = []
+        seen = array("b", [0]) * (n + 1)
+
+        for v in self.vars:
+            if not seen[v]:
+                seen[v] = 1
+                self.variables.append(v)
+
+        #---- Primal Graph ----#
+
+        self.adj = array("l")
+        self.adj_offsets = array("l", [0, 0])
+
+        # stamp[u] == v once u was added as neighbor of v
+        stamp = array("l", [0]) * (n + 1)
+
+        for v in range(1, n + 1):
+            stamp[v] = v
+
+            for i in self.occurrences(v):
+                for u in self.vars[self.offsets[i]:self.offsets[i + 1]]:
+                    if stamp[u] != v:
+                        stamp[u] = v
+                        self.adj.append(u)
+
+            self.adj_offsets.append(len(self.adj))
+
+    def clause(self, i):
+        return self.lits[self.offsets[i]:self.offsets[i + 1]]
+
+    def clause_vars(self, i):
+        return self.vars[self.offsets[i]:self.offsets[i + 1]]
+
+    def literal_occurrences(self, x):
+        """Clauses of literal x, ascending."""
+        return self.occ[self.occ_offsets[lit_id(x)]:self.occ_offsets[lit_id(x) + 1]]
+
+    def occurrences(self, v):
+        """Clauses of variable v (positive occurrences first, then negative ones)."""
+        return self.occ[self.occ_offsets[2 * v]:self.occ_offsets[2 * v + 2]]
+
+    def last_occurrence(self, v):
+        """Index of the last clause of v, -1 if v does not occur."""
+
+        pos = self.literal_occurrences(v)
+        neg = self.literal_occurrences(-v)
+
+        return max(pos[-1] if pos else -1, neg[-1] if neg else -1)
+
+    def neighbors(self, v):
+        return self.adj[self.adj_offsets[v]:self.adj_offsets[v + 1]]
+
+    def primal_degree(self, v):
+        return self.adj_offsets[v + 1] - self.adj_offsets[v]
\ No newline at end of file
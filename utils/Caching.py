@@ -6,13 +6,56 @@ import re
 from utils.IO import basename
 import config
 
-def get_artifact_cache(input_file_name, lib_stub, dvo_stub):
+def write_atomic(filename, content):
+    """Writes content to filename via a temporary file, concurrent readers see either the old or the new file."""
+
+    tmp = f"{filename}.{os.getpid()}.tmp"
+
+    with open(tmp, "w") as file:
+        file.write(content)
+
+    os.replace(tmp, filename)
+
+def get_artifact_cache(input_file_name, lib_stub, dvo_stub, svo_stub = None):
+    if svo_stub:
+        return f"{config.REPORT_DIR}/{basename(input_file_name)}-{lib_stub}-{svo_stub}-dvo_{dvo_stub}.bdd"
+
     return f"{config.REPORT_DIR}/{basename(input_file_name)}-{lib_stub}-dvo_{dvo_stub}.bdd"
 
 def artifact_cache_exists(input_file, flag_lib, flag_dvo):
     filename = get_artifact_cache(input_file, flag_lib, flag_dvo)
     return path.exists(filename)
 
+def get_samples_cache(input_file_name, lib_stub, dvo_stub):
+    return f"{config.REPORT_DIR}/{basename(input_file_name)}-{lib_stub}-dvo_{dvo_stub}.samples"
+
+def get_configurations_cache(input_file_name, lib_stub, dvo_stub):
+    return f"{config.REPORT_DIR}/{basename(input_file_name)}-{lib_stub}-dvo_{dvo_stub}.configs"
+
+def get_trace_cache(report_file):
+    """The trace is stored next to the report."""
+    return f"{path.splitext(report_file)[0]}.trace.csv"
+
+def get_checkpoint_cache(input_file_name, lib_stub, dvo_stub, svo_stub = None, mode = "bdd"):
+    """Sidecar of the latest checkpoint, which names its BDD file."""
+    return f"{config.CACHE_DIR}/{basename(input_file_name)}-{lib_stub}-{mode}-{svo_stub}-dvo_{dvo_stub}.checkpoint"
+
+def get_checkpoint_bdd(sidecar, n_conjoined):
+    return f"{path.splitext(sidecar)[0]}-{n_conjoined}.ckpt"
+
+def get_tree_store(lib_stub):
+    """Directory of the stored conjunction tree nodes, shared by all inputs as nodes are addressed by their clauses."""
+    return f"{config.CACHE_DIR}/tree-{lib_stub}"
+
+def get_batch_results(name):
+    return (f"{config.REPORT_DIR}/{name}.json", f"{config.REPORT_DIR}/{name}.csv")
+
+def get_portfolio_cache(input_file):
+    return f"{config.CACHE_DIR}/{basename(input_file)}.portfolio"
+
+def portfolio_cache_exists(input_file):
+    return path.exists(get_portfolio_cache(input_file))
+
 def get_order_cache(input_file, svo_stub):
     return f"{config.REPORT_DIR}/{basename(input_file)}-{svo_stub}.order"
 
@@ -27,10 +70,10 @@ def read_order_cache(input_file, svo_stub):
         lines = file.readlines()
 
     for line in lines:
-        if line.startswith("order"):
-            order = re.split(r":", line)
-            order = re.split(r",", order[1])
-            order = [int(x) for x in order]
-            break
+        if line.startswith("order:"):
+            try:
+                return [int(x) for x in re.split(r",", re.split(r":", line)[1])]
+            except ValueError:
+                return None
 
-    return order
\ No newline at end of file
+    return None
\ No newline at end of file
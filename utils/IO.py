@@ -1,34 +1,30 @@
-from ctypes import CDLL, c_void_p
 from datetime import datetime, timedelta
 import hashlib
 
-import i18n
+import json
 
 import os
 from os import path
 
 import re
-import requests
-
-import tarfile
-from termcolor import colored
-
-import tempfile
 
 import sys
 
 import config
 
-# initialize i18n
-i18n.load_path.append("lang")
-i18n.set('filename_format', '{locale}.{format}')
+# Install-only (requests, tarfile) and presentation-only (termcolor, yaml)
+# modules are imported on first use to keep the startup of the CLI fast.
 
 ### Download
 def untar(filepath):
+    import tarfile
+
     with tarfile.open(filepath) as archive:
         archive.extractall(path = config.CACHE_DIR)   
 
 def download(url, target):
+    import requests
+
     req = requests.get(url)
 
     with open(target, "wb") as file:
@@ -62,6 +58,45 @@ def prepend_input_file_signature(filename_to_hash, filename_to_store):
         file.write(f"{filename_to_hash}:{hash(filename_to_hash)}{os.linesep}")
         file.write(contents)
 
+### Translation
+
+translations = None
+
+def load_translations(locale = config.LOCALE):
+    """Loads lang/<locale>.yml, precompiled to JSON in the cache directory to avoid parsing YAML on every start."""
+
+    source = path.join(path.dirname(path.realpath(__file__)), "..", "lang", f"{locale}.yml")
+    compiled = f"{config.CACHE_DIR}/lang-{locale}.json"
+
+    if path.exists(compiled) and path.getmtime(compiled) >= path.getmtime(source):
+        try:
+            with open(compiled) as file:
+                return json.load(file)
+        except json.JSONDecodeError:
+            # e.g., truncated by an interrupted write, recompiled below
+            pass
+
+    import yaml
+    # Caching imports this module
+    from utils.Caching import write_atomic
+
+    with open(source) as file:
+        out = yaml.safe_load(file)[locale]
+
+    # concurrent starts (e.g., batch jobs) read the file meanwhile
+    if path.isdir(config.CACHE_DIR):
+        write_atomic(compiled, json.dumps(out))
+
+    return out
+
+def translate(msg):
+    global translations
+
+    if translations is None:
+        translations = load_translations()
+
+    return translations.get(msg, msg)
+
 ### Formatting
 
 def bulk_format(*msgs, color = None, attrs = None, return_type = str, str_sep = " "):    
@@ -69,7 +104,7 @@ def bulk_format(*msgs, color = None, attrs = None, return_type = str, str_sep =
 
     for msg in msgs:
         msg = str(msg)
-        msg = i18n.t(msg)
+        msg = translate(msg)
         if m := re.match(r"\$\$(?P<inner>[^$]+)\$\$", msg):
             msg = m["inner"]
             msg = format(msg, color, attrs)
@@ -85,6 +120,8 @@ def bulk_format(*msgs, color = None, attrs = None, return_type = str, str_sep =
 
 def format(msg, color = None, bg = None, attrs = None):
     if color:
+        from termcolor import colored
+
         if bg and attrs:
             msg = colored(msg, color, bg, attrs=attrs)
         elif bg:
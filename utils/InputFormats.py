@@ -1,5 +1,9 @@
 from copy import copy
+import hashlib
 import re
+
+from utils.CNFIndex import CNFIndex
+
 #------------------------------------------------------------------------------#
 
 u8neg = u"\u00AC"
@@ -28,8 +32,13 @@ class Expression:
     def get_no_variables(self):
         return len(self.var2desc)
 
+    def get_no_literals(self):
+        return sum([len(x) for x in self.clauses])
+
 class CNF(Expression):
 
+    index = None
+
     def __str__(self):
         out = []
 
@@ -57,14 +66,82 @@ class CNF(Expression):
     def get_stub(self):
         return "cnf"
 
+    def digest(self):
+        """MD5 of the clauses in their current order."""
+        return hashlib.md5(str(self.clauses).encode("utf-8")).hexdigest()
+
+    def get_index(self):
+        """The CNFIndex of the clauses, built once and again only if the clauses were replaced (e.g., reordered)."""
+
+        if self.index is None or self.index.clauses is not self.clauses:
+            self.index = CNFIndex(self.clauses, self.get_no_variables())
+
+        return self.index
+
+    def last_occurrences(self, variables = None):
+        """Maps every (one-based) variable, or only those in variables, to the index of the last clause it occurs in."""
+
+        index = self.get_index()
+
+        if variables is None:
+            variables = range(1, index.no_variables + 1)
+
+        out = {x: index.last_occurrence(x) for x in variables if 0 < x <= index.no_variables}
+
+        return {k: v for k, v in out.items() if v >= 0}
+
+def merge(cnfs, name):
+    """Aligns the variables of the CNFs by their names (unnamed ones by their ids).
+
+    Returns the CNF of all clauses, named name, for ordering, and the CNFs
+    renumbered to the shared variables.
+    """
+
+    desc2var = {}
+    var2desc = {}
+
+    out = []
+
+    for cnf in cnfs:
+        no_variables = max([cnf.get_no_variables()] + [abs(x) for clause in cnf.clauses for x in clause])
+
+        mapping = {}
+
+        for x in range(1, no_variables + 1):
+            desc = cnf.var2desc.get(x, str(x)).strip()
+
+            if desc not in desc2var:
+                desc2var[desc] = len(desc2var) + 1
+                var2desc[desc2var[desc]] = desc
+
+            mapping[x] = desc2var[desc]
+
+        clauses = [[mapping[x] if x > 0 else -mapping[-x] for x in clause] for clause in cnf.clauses]
+        out.append(CNF(clauses, var2desc, dict(cnf.meta)))
+
+    meta = {
+        "input-name": name,
+        "input-hash": ",".join([x.meta["input-hash"] for x in cnfs]),
+        "n_vars": len(var2desc)
+    }
+
+    return CNF([clause for cnf in out for clause in cnf.clauses], var2desc, meta), out
+
 class DNF(Expression):
     pass
 
 class AST(Expression):
-    
+    """Conjunction of formulas, every formula an AST (op, [childs]) with op in not, and, or, impl, iff, xor and (negated) variables as leafs."""
+
+    def __str__(self):
+        return f"{len(self.var2desc)} variables, {len(self.clauses)} formulas"
+
     def get_stub(self):
         return "ast"
 
+    def get_no_literals(self):
+        return sum([len(support(x)) for x in self.clauses])
+
 def support(ast):
 
     supp = set()
@@ -78,6 +155,39 @@ def support(ast):
 
     return supp
 
+commutative_ops = ["and", "or", "iff", "xor"]
+
+class Subformulas:
+    """Hash-consing of ASTs, structurally identical subformulas (up to the order of commutative operands) share one id.
+
+    nodes[id] is either a literal or a tuple (op, child ids).
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.nodes = []
+
+    def intern(self, ast):
+
+        if isinstance(ast, int):
+            node = ast
+        else:
+            op, childs = ast
+            childs = [self.intern(x) for x in childs]
+
+            if op in commutative_ops:
+                childs.sort()
+
+            node = (op, tuple(childs))
+
+        if node not in self.ids:
+            self.ids[node] = len(self.nodes)
+            self.nodes.append(node)
+
+        return self.ids[node]
+
+    def __len__(self):
+        return len(self.nodes)
 
 class FM(Expression):
     """Contains expressions representing the feature diagram and the cross-tree constraints"""
@@ -91,6 +201,12 @@ class FM(Expression):
         self.var2desc = var2desc
         self.meta = meta
 
+    def __str__(self):
+        return f"{len(self.var2desc)} features, {len(self.expr_ctcs)} cross-tree constraints"
+
+    def get_no_literals(self):
+        return len(self.var2desc) + sum([len(support(x)) for x in self.expr_ctcs])
+
     def computer_erc(self):
         supp = set()
 
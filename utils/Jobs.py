@@ -0,0 +1,132 @@
+from datetime import datetime
+
+import multiprocessing
+from multiprocessing.connection import wait
+
+import resource
+
+from utils.IO import format_runtime
+
+#------------------------------------------------------------------------------#
+
+# Every job runs in its own forked process: BuDDy keeps its state in globals,
+# and a crashing, hanging, or exhausted library takes only its job down.
+
+#------------------------------------------------------------------------------#
+
+def execute(target, args, conn, memory_limit):
+
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    try:
+        out = target(*args)
+        out.setdefault("status", "ok")
+    except MemoryError:
+        out = {"status": "memory-limit"}
+    # Logging.error exits on failure
+    except (Exception, SystemExit) as e:
+        out = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    conn.send(out)
+    conn.close()
+
+class Job:
+    """Runs target(*args) in a separate process, target has to return a dict."""
+
+    def __init__(self, target, args, timeout = None, memory_limit = None, info = None):
+        self.target = target
+        self.args = args
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.info = info if info else {}
+
+        self.process = None
+        self.conn = None
+        self.result = None
+
+    def start(self):
+        ctx = multiprocessing.get_context("fork")
+        self.conn, conn_child = ctx.Pipe(duplex = False)
+
+        self.process = ctx.Process(target = execute, args = (self.target, self.args, conn_child, self.memory_limit), daemon = True)
+
+        self.time_start = datetime.now()
+        self.process.start()
+
+        conn_child.close()
+
+    def elapsed(self):
+        return (datetime.now() - self.time_start).total_seconds()
+
+    def poll(self):
+        """Returns the result once the job is done (finished, crashed, or timed out), None otherwise."""
+
+        if self.result is not None:
+            return self.result
+
+        result = None
+
+        if self.conn.poll():
+            try:
+                result = self.conn.recv()
+            except EOFError:
+                pass
+
+            self.process.join()
+        elif not self.process.is_alive():
+            self.process.join()
+        elif self.timeout and self.elapsed() > self.timeout:
+            self.process.kill()
+            self.process.join()
+            result = {"status": "timeout"}
+        else:
+            return None
+
+        if result is None:
+            result = {"status": "crashed", "error": f"exit code {self.process.exitcode}"}
+
+        self.finish(result)
+
+        return self.result
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+
+        self.process.join()
+
+        if self.result is None:
+            self.finish({"status": "killed"})
+
+    def finish(self, result):
+        result["runtime-wallclock"] = format_runtime(datetime.now() - self.time_start)
+        self.result = dict(self.info, **result)
+        self.conn.close()
+
+def wait_any(jobs, timeout = 0.1):
+    """Blocks until one of the jobs produced output, terminated, or timeout seconds passed."""
+    wait([x.conn for x in jobs] + [x.process.sentinel for x in jobs], timeout)
+
+def run_all(jobs, n_parallel, on_done = None):
+    """Runs the jobs with at most n_parallel concurrent processes, returns the results in order of jobs."""
+
+    pending = list(reversed(jobs))
+    running = []
+
+    while pending or running:
+
+        while pending and len(running) < n_parallel:
+            job = pending.pop()
+            job.start()
+            running.append(job)
+
+        wait_any(running)
+
+        for job in [x for x in running if x.poll() is not None]:
+            running.remove(job)
+
+            if on_done:
+                on_done(job)
+
+    return [x.result for x in jobs]
@@ -1,5 +1,7 @@
 from datetime import datetime
+import json
 import os
+import sys
 import config
 from .IO import format, bulk_format, timestamp
 
@@ -11,8 +13,13 @@ LL_WARNING = 2
 LL_ERROR = 1
 LL_OFF = 0
 
-def init(ll_vol, ll_per):
-    Logger(ll_vol, ll_per)
+def init(ll_vol, ll_per, machine = False):
+    Logger(ll_vol, ll_per, machine)
+
+def is_enabled(level):
+    """True if messages of the given level are printed or written, allows to skip formatting them."""
+    current = get_logger()
+    return current.ll_vol >= level or current.ll_per >= level
 
 def highlight(x):
     return f"$${x}$$"
@@ -39,17 +46,15 @@ def vspace():
     get_logger().vspace()
 
 class Logger:
-    def __init__(self, ll_vol=config.LL_VOLATILE_DEFAULT, ll_per=config.LL_PERSISTENT_DEFAULT):
+    def __init__(self, ll_vol=config.LL_VOLATILE_DEFAULT, ll_per=config.LL_PERSISTENT_DEFAULT, machine = False):
         global logger
         logger = self
 
-        if ll_vol > 0:
-            logfile = f"{config.LOG_DIR}/log-{timestamp('-', '-')}.log"
-            
-            with open(logfile, "w+") as file:
-                pass
+        # stdout carries JSON lines only (see --machine), errors go to stderr as JSON
+        self.machine = machine
 
-            self.logfile = logfile
+        # created on first write
+        self.logfile = None
 
         self.ll_vol = ll_vol
         self.ll_per = ll_per
@@ -83,9 +88,12 @@ class Logger:
         if self.ll_per >= LL_ERROR and logger:
             self.write_log_to_file(timestamp(), "[W]", bulk_format(*msgs))
 
-        print()
-        print(format("ERROR", color = "red", bg = "on_white", attrs = ["bold"]), bulk_format(*msgs, color = "red"))
-        print()
+        if self.machine:
+            print(json.dumps({"status": "error", "error": bulk_format(*msgs), "error-code": error_code}), file = sys.stderr)
+        else:
+            print()
+            print(format("ERROR", color = "red", bg = "on_white", attrs = ["bold"]), bulk_format(*msgs, color = "red"))
+            print()
 
         # TODO: What calls are resilient?
         if not resilient:
@@ -96,6 +104,9 @@ class Logger:
             print()
 
     def write_log_to_file(self, *msgs):
+        if self.logfile is None:
+            self.logfile = f"{config.LOG_DIR}/log-{timestamp('-', '-')}.log"
+
         with open(self.logfile, "a") as file:
             if len(msgs) == 1:
                 file.write(msgs[0])
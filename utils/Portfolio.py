@@ -0,0 +1,121 @@
+from datetime import datetime
+
+import re
+
+import utils.Caching as Caching
+import utils.Logging as Logging
+from utils.IO import hash_hex
+from utils.Jobs import Job, wait_any
+
+#------------------------------------------------------------------------------#
+
+# Portfolio racing: the same input is compiled with several configurations
+# (lib:preorder:dynorder) in parallel processes. Either the first configuration
+# to finish wins, or, given a deadline, the one with the smallest BDD among
+# those finished by then. The winner is cached per input.
+
+#------------------------------------------------------------------------------#
+
+def parse_configuration(stub):
+    lib, preorder, dynorder = re.split(r":", stub.lower())
+    return {"lib": lib, "preorder": preorder, "dynorder": dynorder}
+
+def format_configuration(configuration):
+    return ":".join([configuration["lib"], configuration["preorder"], configuration["dynorder"]])
+
+def race(input_file, configurations, deadline = None):
+    """Returns the result of the winning configuration, None if no configuration succeeded."""
+
+    # imported here, ddueruem imports this module
+    from ddueruem import quiet_compile_job, parsing, get_order
+
+    # every preorder is computed (and cached) once, the jobs then read the cache
+    for preorder in sorted(set([x["preorder"] for x in configurations])):
+        get_order(parsing(input_file), input_file, preorder)
+
+    jobs = []
+    for configuration in configurations:
+        args = (input_file, configuration["lib"], configuration["preorder"], configuration["dynorder"])
+        jobs.append(Job(quiet_compile_job, args, info = configuration))
+
+    time_start = datetime.now()
+
+    for job in jobs:
+        job.start()
+
+    finished = []
+    running = list(jobs)
+
+    while running:
+        wait_any(running)
+
+        for job in [x for x in running if x.poll() is not None]:
+            running.remove(job)
+
+            Logging.info("Finished:", Logging.highlight(format_configuration(job.info)), job.result["status"], job.result["runtime-wallclock"])
+
+            if job.result["status"] == "ok":
+                finished.append(job.result)
+
+        if finished and deadline is None:
+            break
+
+        if deadline is not None and (datetime.now() - time_start).total_seconds() > deadline:
+            break
+
+    for job in running:
+        job.kill()
+        Logging.info("Killed:", Logging.highlight(format_configuration(job.info)))
+
+    if not finished:
+        return None
+
+    if deadline is None:
+        return finished[0]
+
+    # results without node count (e.g., aborted) rank last
+    return min(finished, key = lambda x: (0, int(x["n_nodes"])) if "n_nodes" in x else (1, 0))
+
+def run(input_file, configurations, deadline = None, use_cache = True):
+
+    if use_cache:
+        winner = read_cache(input_file)
+
+        if winner:
+            from ddueruem import compile_job
+
+            Logging.info("Using cached portfolio winner:", Logging.highlight(format_configuration(winner)))
+            return dict(winner, **compile_job(input_file, winner["lib"], winner["preorder"], winner["dynorder"]))
+
+    result = race(input_file, configurations, deadline)
+
+    if result:
+        write_cache(input_file, result)
+
+    return result
+
+#---- Cache -------------------------------------------------------------------#
+
+def write_cache(input_file, result):
+
+    content = []
+    content.append(f"input-name:{input_file}")
+    content.append(f"input-hash:{hash_hex(input_file)}")
+    content.append(f"winner:{format_configuration(result)}")
+    content.append(f"runtime-wallclock:{result['runtime-wallclock']}")
+
+    Caching.write_atomic(Caching.get_portfolio_cache(input_file), "\n".join(content))
+
+def read_cache(input_file):
+    """Returns the cached winning configuration, None if there is none or the input changed."""
+
+    if not Caching.portfolio_cache_exists(input_file):
+        return None
+
+    with open(Caching.get_portfolio_cache(input_file)) as file:
+        entries = dict([re.split(r":", line.strip(), 1) for line in file.readlines() if ":" in line])
+
+    if entries.get("input-hash") != hash_hex(input_file):
+        return None
+
+    return parse_configuration(entries["winner"])
@@ -0,0 +1,176 @@
+from datetime import datetime
+
+import math
+import os
+import random
+
+import config
+import utils.Caching as Caching
+import utils.Logging as Logging
+from utils.IO import format_runtime
+from utils.Jobs import Job, run_all
+
+from svo import SVOutils as SVO
+from svo.FORCE import force
+
+#------------------------------------------------------------------------------#
+
+# Order racing: static metrics (see svo.Metrics) often disagree with the actual
+# BDD size, hence candidate orders are ranked by compiling them. Every round,
+# all remaining candidates compile the CNF in parallel processes under a node
+# and time budget, the better half (see progress) survives and the budgets
+# grow by a factor, until one candidate is left (successive halving).
+#
+# Candidates are the order at hand, the FORCE orders from several random
+# seeds, the reverse Cuthill-McKee order of the primal graph, and all cached
+# orders of the input. The winner is cached as preorder "race" (see --preorder).
+
+#------------------------------------------------------------------------------#
+
+def candidates(expr, order, n_seeds = config.RACE_SEEDS_DEFAULT, seed = None):
+    """Returns the candidate orders as list of (name, order), duplicates removed."""
+
+    out = [("given", order), ("off", SVO.compute_default_order(expr))]
+
+    rng = random.Random(seed)
+
+    for i in range(0, n_seeds):
+        start = SVO.compute_default_order(expr)
+        rng.shuffle(start)
+        out.append((f"force-seed{i}", SVO.complete_order(force(expr, order = start)[0], expr.get_no_variables())))
+
+    out.append(("rcm", SVO.compute_cuthill_mckee_order(expr)))
+
+    input_file = expr.meta["input-name"]
+
+    for stub in config.PREORDER_CHOICES:
+        if Caching.order_cache_exists(input_file, stub):
+            cached = Caching.read_order_cache(input_file, stub)
+
+            if cached:
+                out.append((f"cached-{stub}", cached))
+
+    seen = set()
+    unique = []
+
+    for name, x in out:
+        # cached orders of an older version of the input
+        if sorted(x) != SVO.compute_default_order(expr) or tuple(x) in seen:
+            continue
+
+        seen.add(tuple(x))
+        unique.append((name, x))
+
+    return unique
+
+def race_job(expr, order, lib_stub, mode, dvo, max_nodes, time_limit):
+    """Compiles expr with order under the budget, returns how far the compilation got."""
+
+    from adapters import Adapters
+    from adapters.Adapter_Generic import BudgetExceeded
+
+    Logging.init(Logging.LL_OFF, Logging.LL_OFF, Logging.get_logger().machine)
+
+    t, lib = Adapters.get_lib(lib_stub, mode)
+
+    with t(lib) as bdd:
+        bdd.set_dvo(dvo)
+        bdd.set_budget(max_nodes = max_nodes, time_limit = time_limit)
+
+        try:
+            bdd.buildFrom(expr, order)
+        except BudgetExceeded:
+            pass
+
+        if bdd.is_aborted():
+            # the live nodes include garbage, the best estimate left
+            size = bdd.mgr.live_nodes_()
+        elif mode == "zdd":
+            size = bdd.mgr.zdd_size_(bdd.bdd)
+        else:
+            size = bdd.mgr.size_(bdd.bdd)
+
+        return {
+            "aborted": bdd.meta.get("aborted"),
+            "n_clauses_conjoined": bdd.meta.get("n_clauses_conjoined", len(expr.clauses)),
+            "size": size
+        }
+
+def progress(result):
+    """Sort key of a race result, smaller is better: most clauses conjoined, then the smallest BDD (live nodes if aborted)."""
+
+    if result["status"] != "ok":
+        return (1, 0, 0)
+
+    return (0, -result["n_clauses_conjoined"], result["size"])
+
+def race(expr, orders, lib_stub, mode = config.MODE_DEFAULT, dvo = config.DVO_DEFAULT, max_nodes = config.RACE_NODES_DEFAULT, time_limit = config.RACE_TIME_DEFAULT, growth = 2, n_parallel = None):
+    """Races the candidate orders (list of (name, order)), returns the winning (name, order) and the number of rounds."""
+
+    if n_parallel is None:
+        n_parallel = os.cpu_count()
+
+    remaining = list(orders)
+    n_rounds = 0
+
+    while len(remaining) > 1:
+        n_rounds += 1
+
+        jobs = []
+
+        for name, order in remaining:
+            jobs.append(Job(race_job, (expr, order, lib_stub, mode, dvo, max_nodes, time_limit), info = {"name": name}))
+
+        results = run_all(jobs, n_parallel)
+
+        for result in sorted(results, key = progress):
+            Logging.info(f"Round {n_rounds}:", Logging.highlight(result["name"]), result["status"], result.get("n_clauses_conjoined", "-"), "clauses", result.get("size", "-"), "nodes")
+
+        ranked = sorted(range(0, len(remaining)), key = lambda i: progress(results[i]))
+
+        if all([x["status"] != "ok" for x in results]):
+            Logging.warning("No candidate order compiled, keeping", Logging.highlight(orders[0][0]))
+            return orders[0], n_rounds
+
+        # all finished within the budget, the sizes decide
+        if all([results[i]["status"] == "ok" and not results[i]["aborted"] for i in ranked]):
+            remaining = [remaining[ranked[0]]]
+            break
+
+        remaining = [remaining[i] for i in ranked[:math.ceil(len(remaining) / 2)]]
+
+        max_nodes = max_nodes * growth
+        time_limit = time_limit * growth
+
+    return remaining[0], n_rounds
+
+def run(expr, order, lib_stub, mode = config.MODE_DEFAULT, dvo = config.DVO_DEFAULT, max_nodes = config.RACE_NODES_DEFAULT, n_seeds = config.RACE_SEEDS_DEFAULT, seed = None):
+    """Races the candidates for expr (a CNF), caches and returns the winning order, records the race in expr.meta."""
+
+    time_start = datetime.now()
+
+    orders = candidates(expr, order, n_seeds, seed)
+    Logging.info("Racing orders:", Logging.highlight(", ".join([x for x, _ in orders])))
+
+    (name, order), n_rounds = race(expr, orders, lib_stub, mode, dvo, max_nodes)
+
+    time_stop = datetime.now()
+
+    expr.meta["race-winner"] = name
+    expr.meta["race-rounds"] = n_rounds
+    expr.meta["runtime-racing"] = format_runtime(time_stop - time_start)
+
+    write_cache(expr, order)
+
+    return order
+
+#---- Cache -------------------------------------------------------------------#
+
+def write_cache(expr, order):
+
+    content = []
+    content.append(f"input-name:{expr.meta['input-name']}")
+    content.append(f"input-hash:{expr.meta['input-hash']}")
+    content.append(f"order:{','.join([str(x) for x in order])}")
+
+    Caching.write_atomic(Caching.get_order_cache(expr.meta["input-name"], "race"), os.linesep.join(content))
\ No newline at end of file